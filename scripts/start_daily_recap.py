@@ -11,6 +11,8 @@ from src.services.post_to_x_service import PostToXService
 from src.services.post_to_telegram_service import PostToTelegramService
 from src.services.post_to_discord_service import PostToDiscordService
 from src.services.post_to_sheets_service import PostToGoogleSheetsService
+from src.services.fanout_publisher_service import FanoutPublisher, format_report
+from src.services.outbox_service import OUTBOX_ENABLED, Outbox
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -23,6 +25,21 @@ class DailyRecapService:
         self.post_to_telegram_service = PostToTelegramService()
         self.post_to_discord_service = PostToDiscordService()
         self.post_to_sheets_service = PostToGoogleSheetsService()
+        self.publisher = FanoutPublisher({
+            "x": self.post_to_x_service.post_daily_recap,
+            "telegram": self.post_to_telegram_service.post_daily_recap,
+            "discord": self.post_to_discord_service.post_daily_recap,
+        })
+        self.outbox = Outbox() if OUTBOX_ENABLED else None
+        self.daily_news_file = "data/daily_generate_news.txt"
+
+    def load_daily_recap(self):
+        """Load the generated Daily Recap, or "" when there is none."""
+        if not os.path.exists(self.daily_news_file):
+            logging.warning(f"[⚠️] File {self.daily_news_file} not found!")
+            return ""
+        with open(self.daily_news_file, "r", encoding="utf-8") as f:
+            return f.read().strip()
 
     def run_daily_recap(self):
         """Run the daily news recap"""
@@ -31,17 +48,15 @@ class DailyRecapService:
             self.news_generation_service.run_daily_recap()
             logging.info("✅ Daily Recap generated.")
 
-            logging.info("🔄 Posting Daily Recap to X...")
-            self.post_to_x_service.post_daily_recap()
-            logging.info("✅ Daily Recap posted to X.")
-
-            logging.info("🔄 Posting Daily Recap to Telegram...")
-            self.post_to_telegram_service.post_daily_recap()
-            logging.info("✅ Daily Recap posted to Telegram.")
+            if self.outbox:
+                content = self.load_daily_recap()
+                if content and self.outbox.enqueue("daily_recap", content):
+                    logging.info("✅ Daily Recap queued for delivery.")
+                return
 
-            logging.info("🔄 Posting Daily Recap to Discord...")
-            self.post_to_discord_service.post_daily_recap()
-            logging.info("✅ Daily Recap posted to Discord.")
+            logging.info("🔄 Publishing Daily Recap to X, Telegram and Discord...")
+            report = self.publisher.publish()
+            logging.info(f"✅ Daily Recap published: {format_report(report)}")
 
         except Exception as e:
             logging.error(f"[❌] Error in daily_recap: {e}")
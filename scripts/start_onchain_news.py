@@ -3,7 +3,6 @@ import os
 import time
 import logging
 import schedule
-import json
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -11,8 +10,9 @@ from src.services.data_onchain_service import OnchainDataService
 from src.services.post_to_social_service import PostToSocialServices
 
 # Configuration for schedule intervals (easily adjustable)
-FETCH_DATA_INTERVAL_MINUTES = 5  # Fetch data every 5 minutes
-GENERATE_NEWS_INTERVAL_HOURS = 12  # Generate news every 8 hours
+FETCH_DATA_INTERVAL_MINUTES = 1  # Check every minute; each metric is only refetched once its TTL expires
+GENERATE_NEWS_INTERVAL_HOURS = 12  # Generate news every 12 hours
+GOV_POLL_INTERVAL_MINUTES = 5  # Check for new proposals and status changes
 
 # Configure logger
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -27,16 +27,19 @@ class OnchainNewsJob:
         self.generate_interval_hours = GENERATE_NEWS_INTERVAL_HOURS
 
     def run(self):
-        """Run the job on a schedule: fetch data every 5 minutes, generate news every 8 hours."""
+        """Run the job on a schedule: refresh expired metrics every minute, generate news every 12 hours."""
         logging.info("Starting the On-Chain news fetching & social media posting service...")
         
         # Run once immediately on startup (both fetch and generate)
         self.fetch_and_post_news()
 
-        # Schedule data fetching every 5 minutes
+        # Schedule metric refresh checks (see onchain_metrics.py for per-field TTLs)
         schedule.every(self.fetch_interval_minutes).minutes.do(self.fetch_data)
 
-        # Schedule news generation every 8 hours
+        # Track governance proposals incrementally
+        schedule.every(GOV_POLL_INTERVAL_MINUTES).minutes.do(self.onchain_service.track_governance)
+
+        # Schedule news generation every 12 hours
         schedule.every(self.generate_interval_hours).hours.do(self.generate_and_post_news)
 
         while True:
@@ -45,15 +48,10 @@ class OnchainNewsJob:
             time.sleep(60)  # Avoid excessive CPU usage
 
     def fetch_data(self):
-        """Fetch on-chain data from all sources and save it."""
+        """Refresh expired on-chain metrics and save the snapshot."""
         try:
             logging.info("Fetching on-chain data...")
-            onchain_data = {
-                **self.onchain_service.fetch_injective_data(),
-                **self.onchain_service.fetch_gov_params(),
-                **self.onchain_service.fetch_supply_and_staking(),
-                **self.onchain_service.fetch_web_data()  # Thêm fetch_web_data để lấy dữ liệu từ injscan.com
-            }
+            onchain_data = self.onchain_service.collect_onchain_data()
             self.onchain_service.save_onchain_data(onchain_data)
             logging.info("On-chain data updated successfully.")
         except Exception as e:
@@ -63,15 +61,22 @@ class OnchainNewsJob:
         """Generate news from on-chain data and post to social media."""
         try:
             logging.info("Generating on-chain news...")
-            # Assume data is saved from the latest fetch
-            with open("data/onchain_data.json", "r", encoding="utf-8") as f:
-                onchain_data = json.load(f)  # Use json.load to read JSON file
+            # Assume data is saved from the latest fetch (typed snapshot, formatted at prompt time)
+            onchain_data = self.onchain_service.load_onchain_data()
+
+            changes = self.onchain_service.detect_changes()
+            gov_events = self.onchain_service.gov_tracker.pending_events()
+            if changes == {} and not gov_events:
+                logging.info("No significant on-chain changes or governance events, skipping news generation.")
+                return
 
-            news_content = self.onchain_service.generate_news(onchain_data)
+            # Before enough history exists (changes is None) fall back to a full snapshot prompt
+            news_content = self.onchain_service.generate_news(onchain_data, changes, gov_events)
 
             if news_content:
                 logging.info("News generated successfully, preparing to post to social media...")
                 self.post_service.post_all(news_content)
+                self.onchain_service.gov_tracker.ack_events(len(gov_events))
                 logging.info("News posted to X, Telegram, and Discord.")
             else:
                 logging.warning("[WARNING] No news to post!")
@@ -83,6 +88,7 @@ class OnchainNewsJob:
         """Run the full process: fetch data, generate news, and post."""
         try:
             self.fetch_data()  # Fetch data first
+            self.onchain_service.track_governance()
             self.generate_and_post_news()  # Generate news and post afterward
         except Exception as e:
             logging.error(f"[ERROR] Error in fetch_and_post_news: {e}")
@@ -0,0 +1,46 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.services.post_to_x_service import PostToXService
+from src.services.post_to_telegram_service import PostToTelegramService
+from src.services.post_to_discord_service import PostToDiscordService
+from src.services.post_to_sheets_service import PostToGoogleSheetsService
+from src.services.post_to_social_service import PostToSocialServices
+from src.services.outbox_service import Outbox, OutboxWorker
+
+
+def build_deliverers():
+    """Destinations for each kind of outbox job: kind -> {destination: callable(content, progress)}.
+
+    Single-write destinations ignore `progress`; the worker records them as a whole.
+    """
+    x = PostToXService()
+    telegram = PostToTelegramService()
+    discord = PostToDiscordService()
+    sheets = PostToGoogleSheetsService()
+    social = PostToSocialServices()
+    return {
+        "news": {
+            "sheets": lambda content, progress: sheets.save_news_to_google_sheet(content),
+            "x": x.post_news,
+            "telegram": telegram.post_news,
+            "discord": discord.post_news,
+        },
+        "daily_recap": {
+            "x": x.post_daily_recap,
+            "telegram": telegram.post_daily_recap,
+            "discord": discord.post_daily_recap,
+        },
+        "social": {
+            "x": social.post_to_x,
+            "telegram": social.post_to_telegram,
+            "discord": social.post_to_discord,
+        },
+    }
+
+
+if __name__ == "__main__":
+    # Run more replicas of this script to deliver in parallel; the consumer group splits the jobs
+    OutboxWorker(Outbox(), build_deliverers()).run()
@@ -5,18 +5,33 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.services.dapps_tracker_service import DappActivityTracker
+from src.services.dapp_trending_service import DappTrendingService
 
-def run_tracker():
-    print("[INFO] Running DappActivityTracker...")
-    tracker = DappActivityTracker()
+EXPORT_INTERVAL_MINUTES = 10  # Counters are live in Redis; this only refreshes the JSON exports
+
+def run_tracker(tracker):
+    print("[INFO] Exporting dapps activity...")
     tracker.run()
-    print("[INFO] DappActivityTracker execution completed.")
+    print("[INFO] DappActivityTracker export completed.")
 
-# Schedule to run daily at 23:59
-schedule.every().day.at("23:59").do(run_tracker)
+def run_trending(trending):
+    try:
+        trending.update()
+    except Exception as e:
+        print(f"[ERROR] Trending dapps update failed: {e}")
 
 if __name__ == "__main__":
-    print("[INFO] DappActivityTracker scheduled to run daily at 23:59")
+    tracker = DappActivityTracker()
+    tracker.seed_counters()
+    run_tracker(tracker)
+
+    trending = DappTrendingService()
+    run_trending(trending)
+
+    schedule.every(EXPORT_INTERVAL_MINUTES).minutes.do(run_tracker, tracker)
+    # Score each hour once it has closed
+    schedule.every().hour.at(":01").do(run_trending, trending)
+    print(f"[INFO] DappActivityTracker exporting every {EXPORT_INTERVAL_MINUTES} minutes")
     while True:
         schedule.run_pending()
-        time.sleep(60)  # Check every minute to run the task
\ No newline at end of file
+        time.sleep(60)  # Check every minute to run the task
@@ -11,6 +11,8 @@ from src.services.post_to_x_service import PostToXService
 from src.services.post_to_telegram_service import PostToTelegramService
 from src.services.post_to_discord_service import PostToDiscordService
 from src.services.post_to_sheets_service import PostToGoogleSheetsService
+from src.services.fanout_publisher_service import FanoutPublisher, format_report
+from src.services.outbox_service import OUTBOX_ENABLED, Outbox
 from src.utils.config_loader import CONFIG
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -26,6 +28,13 @@ class UpdateNewsService:
         self.post_to_sheets_service = PostToGoogleSheetsService()
         self.fetch_interval = CONFIG.get("TWEETS_FETCH_INTERVAL", 3600)
         self.generated_news_file = "data/generated_news.txt"
+        self.publisher = FanoutPublisher({
+            "sheets": self.post_to_sheets_service.save_news_to_google_sheet,
+            "x": self.post_to_x_service.post_news,
+            "telegram": self.post_to_telegram_service.post_news,
+            "discord": self.post_to_discord_service.post_news,
+        })
+        self.outbox = Outbox() if OUTBOX_ENABLED else None
 
     def load_generated_news(self):
         """Load content from generated_news.txt and check if it's empty."""
@@ -58,22 +67,16 @@ class UpdateNewsService:
                 news_content = self.load_generated_news()
                 if not news_content:
                     logging.info("[INFO] No news content to post. Skipping posting steps.")
+                elif self.outbox:
+                    # Delivery (with retries) is left to the outbox workers
+                    if self.outbox.enqueue("news", news_content):
+                        logging.info("✅ News queued for delivery.")
+                    else:
+                        logging.info("[INFO] Same news already queued. Skipping posting steps.")
                 else:
-                    logging.info("🔄 Saving news to Google Sheets...")
-                    self.post_to_sheets_service.save_news_to_google_sheet()
-                    logging.info("✅ News saved.")
-
-                    logging.info("🔄 Posting news to X...")
-                    self.post_to_x_service.post_news()
-                    logging.info("✅ News posted to X.")
-
-                    logging.info("🔄 Posting news to Telegram...")
-                    self.post_to_telegram_service.post_news()
-                    logging.info("✅ News posted to Telegram.")
-
-                    logging.info("🔄 Posting news to Discord...")
-                    self.post_to_discord_service.post_news()
-                    logging.info("✅ News posted to Discord.")
+                    logging.info("🔄 Publishing news to Google Sheets, X, Telegram and Discord...")
+                    report = self.publisher.publish()
+                    logging.info(f"✅ News published: {format_report(report)}")
 
             except Exception as e:
                 logging.error(f"[❌] Error in update_news: {e}")
@@ -1,14 +1,22 @@
 import os
+import sys
 import logging
 import json
-import requests
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from flask import Flask, jsonify, render_template_string, send_from_directory, abort, request
 from flask_cors import CORS
 from functools import wraps
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
 # Import CONFIG từ utils.config_loader
 from utils.config_loader import CONFIG
+from src.services.chat_engine_service import BackgroundLoop, ChatEngine, REPLY_TIMEOUT
+from src.services.dapps_tracker_service import DappActivityCounter, TOP_WINDOWS
+from src.utils.timeseries import lttb
 
 # Configure logger
 logger = logging.getLogger("FlaskBotService")
@@ -37,72 +45,16 @@ PROMPT_FILE = "config/web_app_prompt.json"  # Default prompt file
 CONFIG_DIR = "config"  # Thư mục chứa các file prompt
 
 class FlaskBotService:
+    """Web chat front-end: runs the shared async chat engine on a background event loop."""
+
     def __init__(self):
-        """Initialize Flask bot with OpenAI"""
-        self.api_key = OPENAI_API_KEY
-        self.prompt_data = self.load_prompt(PROMPT_FILE)
-
-        # Create list of trigger keywords
-        self.trigger_keywords = set(self.prompt_data.get("special_handling", {}).get("trigger_keywords", []))
-        self.banned_keywords = set(self.prompt_data.get("special_handling", {}).get("banned_keywords", []))
-
-    def load_prompt(self, prompt_file: str) -> dict:
-        """Load prompt from JSON file"""
-        if hasattr(self, "_cached_prompt"):  # If already cached, reuse it
-            return self._cached_prompt
-        try:
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                self._cached_prompt = json.load(f)  # Cache the data
-                logger.info(f"Successfully loaded prompt from {prompt_file}")
-                return self._cached_prompt
-        except FileNotFoundError:
-            logger.error(f"Prompt file {prompt_file} not found!")
-            return {}
-
-    def generate_response(self, user_message: str, mention_special: bool) -> str:
-        """Generate response from OpenAI based on context"""
-        messages = [
-            {
-                "role": "system",
-                "content": f"{self.prompt_data.get('role', '')}\n\n{self.prompt_data.get('context', '')}"
-            }
-        ]
+        """Initialize the chat engine for the web prompt"""
+        self.engine = ChatEngine(PROMPT_FILE, handling_key="special_handling")
+        self.loop = BackgroundLoop()
 
-        # Add example conversations from prompt
-        for example in self.prompt_data.get("example_conversations", []):
-            messages.append({"role": "user", "content": example["User:"]})
-            messages.append({"role": "assistant", "content": example["Assistant:"]})
-
-        # If user mentions staking/BGT/BERA, add specific prompt
-        if mention_special:
-            strategy = self.prompt_data.get("special_handling", {}).get("response_strategy", [])
-            messages.append({"role": "system", "content": " ".join(strategy)})
-
-        messages.append({"role": "user", "content": user_message})
-
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            payload = {
-                "model": "gpt-4",
-                "messages": messages,
-                "max_tokens": 300,
-                "temperature": 0.9  # Increase creativity
-            }
-            response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-            response_data = response.json()
-
-            if "error" in response_data:
-                logger.error(f"OpenAI API error: {response_data['error']}")
-                return "Got a little lag, try asking again! 😏"
-
-            return response_data["choices"][0]["message"]["content"].strip()
-
-        except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}", exc_info=True)
-            return "Got a little lag, try asking again! 😏"
+    def reply(self, user_message: str, session_id: str = None) -> str:
+        conversation = f"web:{session_id}" if session_id else None
+        return self.loop.run(self.engine.reply(user_message, conversation), timeout=REPLY_TIMEOUT)
 
 bot_service = FlaskBotService()
 
@@ -235,12 +187,127 @@ def serve_assets_files(filename):
         logging.error(f"[ERROR] Could not serve file {filename}: {e}")
         abort(500, description="Internal Server Error")
 
+# Dapp activity leaderboards, served from the Redis rollups
+activity_counter = DappActivityCounter()
+
+@app.route("/api/dapps/top", methods=["GET"])
+def top_dapps():
+    """Top K dapps by activity over a window: ?window=hour|24h|day|7d|30d|week|all&k=10"""
+    window = request.args.get("window", "all")
+    if window not in TOP_WINDOWS:
+        return jsonify({"error": f"window must be one of {', '.join(TOP_WINDOWS)}"}), 400
+    k = min(max(request.args.get("k", 10, type=int), 1), 100)
+
+    try:
+        top = activity_counter.top(window, k)
+        return jsonify({"window": window, "dapps": [{"name": name, "activity": count} for name, count in top]}), 200
+    except Exception as e:
+        logger.error(f"Error reading dapp leaderboard: {str(e)}")
+        return jsonify({"error": "Failed to load dapp activity"}), 500
+
+@app.route("/api/dapps/activity", methods=["GET"])
+def dapps_activity_range():
+    """Total dapp activity per day: ?start=YYYY-MM-DD&end=YYYY-MM-DD, or ?days=N ending today"""
+    today = datetime.now(timezone.utc).date()
+    try:
+        end = request.args.get("end") or today.isoformat()
+        start = request.args.get("start") or (
+            datetime.strptime(end, "%Y-%m-%d").date() - timedelta(days=request.args.get("days", 30, type=int) - 1)
+        ).isoformat()
+        datetime.strptime(start, "%Y-%m-%d")
+        datetime.strptime(end, "%Y-%m-%d")
+    except (ValueError, OverflowError):
+        # OverflowError: a ?days= large enough to take the start date out of range
+        return jsonify({"error": "Dates must be formatted as YYYY-MM-DD and days must be in range"}), 400
+
+    try:
+        days = activity_counter.daily_range(start, end)
+        return jsonify({"start": start, "end": end, "days": [{"date": date, "activity": count} for date, count in days]}), 200
+    except Exception as e:
+        logger.error(f"Error reading dapp activity range: {str(e)}")
+        return jsonify({"error": "Failed to load dapp activity"}), 500
+
+# Downsampled series for dashboard charts, cached per (series, resolution, range, points)
+TIMESERIES_MAX_POINTS = 1000
+TIMESERIES_MAX_HOURS = 90 * 24  # Hourly series are capped at 90 days
+TIMESERIES_CACHE_TTL = 300
+TIMESERIES_CACHE_SIZE = 256
+timeseries_cache = OrderedDict()
+timeseries_lock = threading.Lock()
+
+def cached_timeseries(key, build):
+    """Return the cached payload for key, or build and cache it (LRU-bounded, TTL-expired)."""
+    now = time.monotonic()
+    with timeseries_lock:
+        entry = timeseries_cache.get(key)
+        if entry and entry[0] > now:
+            timeseries_cache.move_to_end(key)
+            return entry[1]
+    payload = build()
+    with timeseries_lock:
+        timeseries_cache[key] = (now + TIMESERIES_CACHE_TTL, payload)
+        timeseries_cache.move_to_end(key)
+        while len(timeseries_cache) > TIMESERIES_CACHE_SIZE:
+            timeseries_cache.popitem(last=False)
+    return payload
+
+@app.route("/api/timeseries/dapps", methods=["GET"])
+def dapps_timeseries():
+    """Total dapp activity as a bounded series: ?resolution=day|hour&start=&end=&points=200
+
+    Dates are YYYY-MM-DD for daily and YYYY-MM-DDTHH for hourly resolution (UTC). The series is
+    downsampled with LTTB to at most `points` points, whatever the length of the range.
+    """
+    resolution = request.args.get("resolution", "day")
+    if resolution not in ("day", "hour"):
+        return jsonify({"error": "resolution must be 'day' or 'hour'"}), 400
+    points = min(max(request.args.get("points", 200, type=int), 3), TIMESERIES_MAX_POINTS)
+    fmt = "%Y-%m-%d" if resolution == "day" else "%Y-%m-%dT%H"
+    step = timedelta(days=1) if resolution == "day" else timedelta(hours=1)
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    try:
+        end = datetime.strptime(request.args["end"], fmt) if request.args.get("end") else now
+        start = datetime.strptime(request.args["start"], fmt) if request.args.get("start") else end - 30 * step
+    except ValueError:
+        return jsonify({"error": f"Dates must be formatted as {fmt.replace('%', '')}"}), 400
+    if resolution == "hour":
+        start = max(start, end - timedelta(hours=TIMESERIES_MAX_HOURS))
+
+    def build():
+        if resolution == "day":
+            series = activity_counter.daily_series(start.strftime(fmt), end.strftime(fmt))
+        else:
+            series = activity_counter.hourly_series(start, end)
+        # Periods are UTC; naive datetimes would be read as server-local time and shift the buckets
+        numeric = [
+            (datetime.strptime(period, fmt).replace(tzinfo=timezone.utc).timestamp(), count) for period, count in series
+        ]
+        sampled = lttb(numeric, points)
+        return {
+            "resolution": resolution,
+            "start": start.strftime(fmt),
+            "end": end.strftime(fmt),
+            "total_points": len(series),
+            "points": [
+                {"t": datetime.fromtimestamp(ts, timezone.utc).strftime(fmt), "v": count} for ts, count in sampled
+            ],
+        }
+
+    try:
+        payload = cached_timeseries((resolution, start.strftime(fmt), end.strftime(fmt), points), build)
+        return jsonify(payload), 200
+    except Exception as e:
+        logger.error(f"Error building dapp activity series: {str(e)}")
+        return jsonify({"error": "Failed to load dapp activity series"}), 500
+
 @app.route("/status", methods=["GET"])
 def status():
     """API to check system status"""
     return jsonify({
         "status": "running",
         "uptime": f"{datetime.now()}",
+        "chat": bot_service.engine.stats(),
     })
 
 @app.route("/chat", methods=["POST"])
@@ -256,13 +323,7 @@ def chat():
         return jsonify({"error": "No message provided"}), 400
 
     try:
-        contains_trigger = any(keyword.lower() in user_message.lower() for keyword in bot_service.trigger_keywords)
-        contains_banned = any(keyword.lower() in user_message.lower() for keyword in bot_service.banned_keywords)
-
-        if contains_banned:
-            return jsonify({"response": "Oh dear, such unrefined language! I'm a classy bot, let's keep it fun and drama-free. 😤"})
-
-        response = bot_service.generate_response(user_message, contains_trigger)
+        response = bot_service.reply(user_message, data.get("session_id"))
         return jsonify({"response": response})
 
     except Exception as e:
@@ -0,0 +1,178 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from src.utils.config_loader import CONFIG
+
+FAQ_CACHE_ENABLED = CONFIG.get("FAQ_CACHE_ENABLED", True)
+FAQ_CACHE_TTL = CONFIG.get("FAQ_CACHE_TTL", 6 * 3600)  # Seconds an answer is reused
+FAQ_CACHE_SIZE = CONFIG.get("FAQ_CACHE_SIZE", 1000)  # Entries kept, least recently used evicted first
+FAQ_CACHE_SIMILARITY = CONFIG.get("FAQ_CACHE_SIMILARITY", 0.8)  # Trigram Jaccard needed for a near match
+STANDALONE_MAX_WORDS = CONFIG.get("FAQ_STANDALONE_MAX_WORDS", 15)  # Longer messages are treated as conversation
+MIN_FUZZY_LENGTH = 12  # Shorter questions ("hi", "gm") only match exactly
+
+MENTION_PATTERN = re.compile(r"<[@#][!&]?\d+>|@\w+")  # Discord <@123>/<#123> and @username
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+DIGITS_PATTERN = re.compile(r"\d+")
+
+
+def normalise_question(text):
+    """Canonical form of a question: no mentions, punctuation or case, single spaces."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = MENTION_PATTERN.sub(" ", text)
+    text = PUNCTUATION_PATTERN.sub(" ", text)
+    return " ".join(text.split())
+
+
+# Words that point back into the conversation ("what about that one?"), so the message needs its history
+REFERENCE_WORDS = {
+    "it", "its", "that", "this", "these", "those", "they", "them", "their", "he", "she", "him", "her",
+    "above", "again", "also", "else", "more", "other", "same", "then", "there", "one", "ones",
+}
+
+
+def is_standalone_question(text):
+    """True for a short message that makes sense on its own, like an FAQ, rather than a follow-up."""
+    words = normalise_question(text).split()
+    return 0 < len(words) <= STANDALONE_MAX_WORDS and not REFERENCE_WORDS.intersection(words)
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by at most one inserted, deleted or substituted character."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+# Short words that do not change what a question asks; any other differing word must be a typo
+FILLER_WORDS = {
+    "a", "an", "the", "i", "im", "me", "my", "you", "u", "your", "it", "its", "to", "do", "does", "is",
+    "are", "of", "for", "in", "on", "at", "and", "so", "just", "pls", "please", "hi", "hey", "hello",
+    "gm", "bro", "guys", "ok", "okay", "um", "uh",
+}
+# Negations ("don't" and "can't" normalise to "don t" and "can t") flip the meaning, never a typo
+NEGATION_WORDS = {
+    "not", "no", "never", "nor", "t", "don", "can", "cannot", "won", "isn", "aren", "doesn", "didn",
+    "shouldn", "wouldn", "couldn", "wasn", "weren", "haven", "hasn",
+}
+
+
+def same_meaning_words(a, b):
+    """Guard for near matches: every word only one question has must be filler or a typo of a word in the other.
+
+    Trigram similarity alone would match "how do I stake" with "how do I unstake" or "should I
+    not stake"; this lets typos and dropped filler words through but not different words.
+    Negations always count as different, short words only match exactly, and numbers must match.
+    """
+    if DIGITS_PATTERN.findall(a) != DIGITS_PATTERN.findall(b):
+        return False
+    words_a, words_b = set(a.split()), set(b.split())
+    for word, others in [(w, words_b) for w in words_a - words_b] + [(w, words_a) for w in words_b - words_a]:
+        if word in FILLER_WORDS:
+            continue
+        if word in NEGATION_WORDS or len(word) <= 3:
+            return False
+        if not any(_within_one_edit(word, other) for other in others):
+            return False
+    return True
+
+
+class AnswerCache:
+    """In-memory cache of chatbot answers keyed by normalised question.
+
+    Exact hits are a dict lookup. Otherwise the questions sharing character trigrams with the
+    new one are scored by Jaccard similarity through an inverted index, and the best one at or
+    above the threshold is reused if its words differ only by typos or filler. Entries expire after
+    a TTL, the least recently used are evicted beyond the size limit, and `clear()` drops
+    everything when the prompt behind the answers changes.
+    """
+
+    def __init__(self, ttl=FAQ_CACHE_TTL, max_entries=FAQ_CACHE_SIZE, similarity=FAQ_CACHE_SIMILARITY):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.entries = OrderedDict()  # question -> (answer, expires_at, trigrams)
+        self.index = {}  # trigram -> questions containing it
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, question):
+        _, _, grams = self.entries.pop(question)
+        for gram in grams:
+            questions = self.index.get(gram)
+            if questions is not None:
+                questions.discard(question)
+                if not questions:
+                    del self.index[gram]
+
+    def _nearest(self, question, grams):
+        overlaps = {}
+        for gram in grams:
+            for candidate in self.index.get(gram, ()):
+                overlaps[candidate] = overlaps.get(candidate, 0) + 1
+        best, best_score = None, self.similarity
+        for candidate, overlap in overlaps.items():
+            score = overlap / (len(grams) + len(self.entries[candidate][2]) - overlap)
+            if score >= best_score and same_meaning_words(question, candidate):
+                best, best_score = candidate, score
+        return best
+
+    def get(self, text, now=None):
+        """Cached answer for a question (or a near duplicate of it), or None."""
+        question = normalise_question(text)
+        if not question:
+            return None
+        now = now or time.time()
+        with self._lock:
+            match = question if question in self.entries else None
+            if match is None and len(question) >= MIN_FUZZY_LENGTH:
+                match = self._nearest(question, trigrams(question))
+            if match is not None:
+                answer, expires_at, _ = self.entries[match]
+                if expires_at > now:
+                    self.entries.move_to_end(match)
+                    if match == question:
+                        self.hits += 1
+                    else:
+                        self.near_hits += 1
+                    return answer
+                self._remove(match)
+            self.misses += 1
+            return None
+
+    def put(self, text, answer, now=None):
+        question = normalise_question(text)
+        if not question:
+            return
+        grams = trigrams(question)
+        with self._lock:
+            if question in self.entries:
+                self._remove(question)
+            self.entries[question] = (answer, (now or time.time()) + self.ttl, grams)
+            for gram in grams:
+                self.index.setdefault(gram, set()).add(question)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.index.clear()
+
+    def stats(self):
+        return {"entries": len(self.entries), "hits": self.hits, "near_hits": self.near_hits, "misses": self.misses}
@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import deque
+import grpc
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+from src.services.cosmos_grpc_service import CosmosGrpcClient
+
+logger = setup_logger("BlockIngestService")
+
+BLOCK_WINDOW_SIZE = 100  # Blocks used for TPS and block time; fixed, as TPS is published as "TPS (Last 100 Blocks)"
+BLOCK_POLL_INTERVAL = CONFIG.get("ONCHAIN_BLOCK_POLL_INTERVAL", 1.0)  # Seconds between latest-block polls
+BLOCK_COUNT_WINDOW = 24 * 3600
+
+
+class BlockWindow:
+    """Ring buffer of the most recent blocks with running sums, so every metric updates in O(1) per block.
+
+    TPS and block time are exact over the last `size` blocks. The 24h block count is exact once the
+    window has seen a full, gapless day of blocks; until then it is None.
+    """
+
+    def __init__(self, size=BLOCK_WINDOW_SIZE, count_window=BLOCK_COUNT_WINDOW):
+        self.size = size
+        self.count_window = count_window
+        self.heights = [0] * size
+        self.times = [0.0] * size
+        self.txs = [0] * size
+        self.start = 0  # Index of the oldest block
+        self.length = 0
+        self.tx_sum = 0  # Transactions of every block in the ring
+        self.day = deque()  # Block times within the count window
+        self.covered_since = None  # Time of the first block after which nothing was skipped
+        self._lock = threading.Lock()
+
+    @property
+    def latest_height(self):
+        if not self.length:
+            return None
+        return self.heights[(self.start + self.length - 1) % self.size]
+
+    def reset(self):
+        """Forget everything, e.g. after a gap too large to backfill."""
+        with self._lock:
+            self.start = self.length = self.tx_sum = 0
+            self.day.clear()
+            self.covered_since = None
+
+    def push(self, height, timestamp, num_txs):
+        """Add the next block. Blocks must arrive in height order; older or duplicate heights are ignored."""
+        with self._lock:
+            latest = self.latest_height
+            if latest is not None and height <= latest:
+                return False
+            if latest is not None and height != latest + 1:
+                # A skipped block makes the 24h count inexact until a full window has passed again
+                self.day.clear()
+                self.covered_since = timestamp
+            if self.covered_since is None:
+                self.covered_since = timestamp
+
+            if self.length == self.size:
+                self.tx_sum -= self.txs[self.start]
+                self.start = (self.start + 1) % self.size
+                self.length -= 1
+            index = (self.start + self.length) % self.size
+            self.heights[index] = height
+            self.times[index] = timestamp
+            self.txs[index] = num_txs
+            self.length += 1
+            self.tx_sum += num_txs
+
+            self.day.append(timestamp)
+            cutoff = timestamp - self.count_window
+            while self.day and self.day[0] <= cutoff:
+                self.day.popleft()
+            return True
+
+    def metrics(self):
+        """Block height, average block time, TPS and 24h block count for the current window."""
+        with self._lock:
+            if not self.length:
+                return {}
+            oldest = self.start
+            newest = (self.start + self.length - 1) % self.size
+            metrics = {"Block Height": self.heights[newest]}
+
+            span = self.times[newest] - self.times[oldest]
+            if self.length > 1 and span > 0:
+                # Transactions after the oldest block happened within the span
+                metrics["TPS (Last 100 Blocks)"] = (self.tx_sum - self.txs[oldest]) / span
+                metrics["Block Time"] = span / (self.length - 1)
+            if self.times[newest] - self.covered_since >= self.count_window:
+                metrics["Block Count (Last 24h)"] = len(self.day)
+            return metrics
+
+
+def _block_record(block):
+    header = block.header
+    timestamp = header.time.seconds + header.time.nanos / 1e9
+    return header.height, timestamp, len(block.data.txs)
+
+
+class BlockIngestor:
+    """Follow the chain head over the Tendermint gRPC service and feed every block into a BlockWindow.
+
+    Polls the latest block on a background thread and fetches any heights in between, so no block
+    is skipped unless the gap is larger than the ring.
+    """
+
+    def __init__(self, client=None, window=None, poll_interval=BLOCK_POLL_INTERVAL):
+        self.client = client or CosmosGrpcClient()
+        self.window = window or BlockWindow()
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="block-ingest", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except grpc.RpcError as e:
+                logger.error(f"❌ Error fetching blocks over gRPC: {e.code()}")
+            except Exception as e:
+                logger.error(f"❌ Unexpected error in block ingest: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def poll(self):
+        """Ingest every block between the last one seen and the current head. Returns the number added."""
+        latest = self.client.latest_block()
+        head = latest.header.height
+        last = self.window.latest_height
+        if last is not None and head <= last:
+            return 0
+
+        if last is None or head - last > self.window.size:
+            if last is not None:
+                logger.warning(f"[⚠️] Fell {head - last} blocks behind, restarting the block window")
+                self.window.reset()
+            first = max(1, head - self.window.size + 1)
+        else:
+            first = last + 1
+
+        added = 0
+        for height in range(first, head):
+            if self._stop.is_set():
+                return added
+            added += self.window.push(*_block_record(self.client.block_by_height(height)))
+        added += self.window.push(*_block_record(latest))
+        return added
+
+    def metrics(self):
+        return self.window.metrics()
+
+
+if __name__ == "__main__":
+    ingestor = BlockIngestor()
+    ingestor.poll()
+    print(ingestor.metrics())
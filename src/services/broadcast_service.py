@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("BroadcastService")
+
+BROADCAST_WORKERS = CONFIG.get("BROADCAST_WORKERS", 16)
+
+
+def destination_list(list_key, single_key):
+    """Destinations configured as a list under `list_key`, falling back to the single `single_key` value."""
+    destinations = CONFIG.get(list_key)
+    if destinations:
+        return list(destinations) if isinstance(destinations, (list, tuple)) else [destinations]
+    return [CONFIG[single_key]] if CONFIG.get(single_key) else []
+
+
+def broadcast_succeeded(report):
+    """True if every destination got every message, False otherwise, None when there was nothing to send."""
+    if not report:
+        return None
+    return all(entry["status"] == "ok" for entry in report.values())
+
+
+class Broadcaster:
+    """Send the same messages to many destinations of one platform concurrently.
+
+    Destinations are worked on in parallel, while the messages to one destination go out in
+    order. Every send first waits on the destination's own rate limit, then on the platform-wide
+    one, so a 50-chat broadcast runs at the platform's global rate instead of one
+    request after another. `send(destination, message, **options)` raises on failure.
+
+    With an outbox `progress` (see outbox_service.DeliveryProgress), every message that reaches
+    a destination is recorded as "<destination>:<index>", and a retry of the same broadcast only
+    sends what each destination is still missing, so one failed chat does not resend to the rest.
+    """
+
+    def __init__(self, name, send, global_limiter, destination_limiter, max_workers=BROADCAST_WORKERS):
+        self.name = name
+        self.send = send
+        self.global_limiter = global_limiter
+        self.destination_limiter = destination_limiter
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"broadcast-{name}")
+
+    def _deliver(self, destination, messages, options, progress):
+        started = time.monotonic()
+        sent = 0
+        try:
+            for index, message in enumerate(messages):
+                step = f"{destination}:{index}"
+                if progress and progress.done(step):
+                    sent += 1
+                    continue
+                self.destination_limiter.acquire(destination)
+                self.global_limiter.acquire()
+                self.send(destination, message, **options)
+                if progress:
+                    progress.mark(step)
+                sent += 1
+            return {"status": "ok", "sent": sent, "duration": round(time.monotonic() - started, 3)}
+        except Exception as e:
+            logger.error(f"[❌] {self.name} delivery to {destination} failed after {sent}/{len(messages)} messages: {e}")
+            return {"status": "failed", "sent": sent, "error": str(e), "duration": round(time.monotonic() - started, 3)}
+
+    def broadcast(self, destinations, messages, progress=None, **options):
+        """Send `messages` to every destination (passing `options` to `send`), skipping those `progress` has seen.
+
+        Returns {destination: {"status": "ok"|"failed", "sent": n, "duration": s, "error": str}}.
+        """
+        if not destinations or not messages:
+            return {}
+        start = time.monotonic()
+        futures = {destination: self.executor.submit(self._deliver, destination, messages, options, progress) for destination in destinations}
+        report = {destination: future.result() for destination, future in futures.items()}
+        failed = [str(destination) for destination, entry in report.items() if entry["status"] != "ok"]
+        logger.info(
+            f"[📣] {self.name}: {len(messages)} messages to {len(destinations)} destinations in "
+            f"{time.monotonic() - start:.2f}s ({len(destinations) - len(failed)} ok"
+            + (f", failed: {', '.join(failed)})" if failed else ")")
+        )
+        return report
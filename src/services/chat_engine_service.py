@@ -0,0 +1,323 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from openai import AsyncOpenAI
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+from src.services.answer_cache_service import FAQ_CACHE_ENABLED, AnswerCache, is_standalone_question, normalise_question
+from src.services.conversation_memory_service import CHAT_MEMORY_ENABLED, ConversationMemory
+
+logger = setup_logger("ChatEngineService")
+
+CHAT_MODEL = CONFIG.get("CHAT_MODEL", "gpt-4")
+CHAT_MAX_TOKENS = CONFIG.get("CHAT_MAX_TOKENS", 300)
+CHAT_TIMEOUT = CONFIG.get("CHAT_TIMEOUT", 60)  # Seconds per OpenAI request
+CHAT_MAX_RETRIES = CONFIG.get("CHAT_MAX_RETRIES", 2)  # OpenAI client retries per call (its own default)
+CHAT_MAX_CONCURRENCY = CONFIG.get("CHAT_MAX_CONCURRENCY", 4)  # OpenAI calls in flight per process
+CHAT_QUEUE_TIMEOUT = CONFIG.get("CHAT_QUEUE_TIMEOUT", 30)  # Seconds a message may wait for a free slot
+# Longest a reply can take: the queue wait plus every attempt of the OpenAI call, with a little slack
+REPLY_TIMEOUT = CHAT_QUEUE_TIMEOUT + CHAT_TIMEOUT * (CHAT_MAX_RETRIES + 1) + 5
+
+BANNED_REPLY = "Oh dear, such unrefined language! I'm a classy bot, let's keep it fun and drama-free. 😤"
+ERROR_REPLY = "Got a little lag, try asking again! 😏"
+SUMMARY_PROMPT = (
+    "Summarise this chat between a user and an assistant in at most three sentences. Keep what the "
+    "user told about themselves, what they asked and anything left unanswered. Reply with the summary only."
+)
+SUMMARY_MAX_TOKENS = 150
+
+
+def _keyword_pattern(keywords):
+    """One case-insensitive regex matching any of the keywords as a substring, or None when there are none."""
+    keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+
+
+class CompletionLimiter:
+    """Bound concurrent model calls with a semaphore and merge identical calls in flight (single-flight).
+
+    A call whose key matches one already running awaits that call's result instead of going
+    upstream again, and a call is cancelled once every caller awaiting it has been cancelled.
+    The rest wait for one of `limit` slots, giving up after `queue_timeout` seconds so a burst
+    degrades into quick error replies rather than ever-longer waits.
+    """
+
+    def __init__(self, limit=CHAT_MAX_CONCURRENCY, queue_timeout=CHAT_QUEUE_TIMEOUT):
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.semaphore = asyncio.Semaphore(limit)
+        self.pending = {}  # key -> future of the call in flight
+        self.waiters = {}  # future in flight -> callers awaiting it
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.calls = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+
+    async def _call(self, factory):
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise
+        finally:
+            self.waiting -= 1
+            self.total_wait += time.monotonic() - started
+        self.in_flight += 1
+        self.calls += 1
+        try:
+            return await factory()
+        finally:
+            self.in_flight -= 1
+            self.semaphore.release()
+
+    async def run(self, key, factory):
+        """Result of `factory()` (a coroutine function), shared with any identical call already running."""
+        future = self.pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.ensure_future(self._call(factory))
+            self.pending[key] = future
+            future.add_done_callback(lambda _: self.pending.pop(key, None))
+        self.waiters[future] = self.waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self.waiters[future] -= 1
+            if not self.waiters[future]:
+                del self.waiters[future]
+                if not future.done():
+                    future.cancel()  # Every caller gave up (e.g. a timed-out web request), free the slot
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "avg_wait": round(self.total_wait / max(self.calls + self.rejected, 1), 3),
+        }
+
+
+class ChatEngine:
+    """Prompt handling, keyword routing and the OpenAI call shared by the Telegram, Discord and web chatbots.
+
+    The system message and example turns are built once per prompt file (and again only when
+    the file changes), so answering a message only appends the routed strategy and the user's
+    text to a precomputed prefix. Front-ends call `reply()` and send back whatever it returns.
+
+    Answers are kept in an AnswerCache (unless FAQ_CACHE_ENABLED is off), so repeated and
+    near-identical questions skip the model; the cache is cleared whenever the prompt changes.
+    Model calls go through a CompletionLimiter, so bursts are bounded and identical questions
+    asked at the same time share one call.
+
+    When the front-end passes a conversation ID, the user's recent turns (and a summary of older
+    ones) from ConversationMemory are sent along, and those replies bypass the answer cache.
+    The exception is a short standalone question (see `is_standalone_question`): it is looked up
+    in the cache before any history is loaded and, on a miss, answered without history, so it can
+    hit the cache and share in-flight calls with everyone else asking it. The trade-off is that
+    the model does not see the conversation for such questions; the exchange is still remembered.
+    """
+
+    def __init__(self, prompt_file, handling_key="specific_mention_handling", temperature=0.9,
+                 banned_reply=BANNED_REPLY, error_reply=ERROR_REPLY, default_role="", openai_client=None,
+                 cache=None, memory=None):
+        self.prompt_file = prompt_file
+        self.handling_key = handling_key
+        self.temperature = temperature
+        self.banned_reply = banned_reply
+        self.error_reply = error_reply
+        self.default_role = default_role
+        self.client = openai_client or AsyncOpenAI(
+            api_key=CONFIG.get("OPENAI_API_KEY"), timeout=CHAT_TIMEOUT, max_retries=CHAT_MAX_RETRIES
+        )
+        self.cache = cache if cache is not None else (AnswerCache() if FAQ_CACHE_ENABLED else None)
+        self.memory = memory if memory is not None else (ConversationMemory() if CHAT_MEMORY_ENABLED else None)
+        self.limiter = CompletionLimiter()
+        self.background = set()  # Summaries being written, referenced until they finish
+        self.prompt_mtime = None
+        self.load_prompt()
+
+    def load_prompt(self):
+        """Read the prompt file and precompute the message prefix and keyword matchers."""
+        try:
+            self.prompt_mtime = os.path.getmtime(self.prompt_file)
+            with open(self.prompt_file, "r", encoding="utf-8") as f:
+                prompt_data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            logger.error(f"[❌] Could not load prompt {self.prompt_file}: {e}")
+            prompt_data = {}
+
+        prefix = [{
+            "role": "system",
+            "content": f"{prompt_data.get('role', self.default_role)}\n\n{prompt_data.get('context', '')}",
+        }]
+        for example in prompt_data.get("example_conversations", []):
+            prefix.append({"role": "user", "content": example["User:"]})
+            prefix.append({"role": "assistant", "content": example["Assistant:"]})
+
+        handling = prompt_data.get(self.handling_key, {})
+        self.prefix = tuple(prefix)
+        self.strategy_message = {"role": "system", "content": " ".join(handling.get("response_strategy", []))}
+        self.trigger_pattern = _keyword_pattern(handling.get("trigger_keywords", []))
+        self.banned_pattern = _keyword_pattern(handling.get("banned_keywords", []))
+        self.prompt_data = prompt_data
+
+    def reload_if_changed(self):
+        """Reload the prompt if its file was edited (e.g. from the CMS). Returns True when it was."""
+        try:
+            mtime = os.path.getmtime(self.prompt_file)
+        except OSError:
+            return False
+        if mtime == self.prompt_mtime:
+            return False
+        self.load_prompt()
+        if self.cache:
+            self.cache.clear()  # Answers given under the old prompt may no longer hold
+        logger.info(f"[🔄] Reloaded prompt {self.prompt_file}")
+        return True
+
+    def route(self, user_message):
+        """"banned", "specific" (a trigger keyword is mentioned) or "default"."""
+        if self.banned_pattern and self.banned_pattern.search(user_message):
+            return "banned"
+        if self.trigger_pattern and self.trigger_pattern.search(user_message):
+            return "specific"
+        return "default"
+
+    def build_messages(self, user_message, route="default", history=()):
+        messages = list(self.prefix)
+        messages.extend(history)
+        if route == "specific":
+            messages.append(self.strategy_message)
+        messages.append({"role": "user", "content": user_message})
+        return messages
+
+    async def complete(self, messages, max_tokens=CHAT_MAX_TOKENS, temperature=None):
+        """One chat completion. Raises on API errors."""
+        response = await self.client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=self.temperature if temperature is None else temperature,
+        )
+        return response.choices[0].message.content.strip()
+
+    def flight_key(self, messages):
+        """Identity of a call for single-flight: everything after the shared prefix, with the question normalised."""
+        tail = messages[len(self.prefix):-1] + [normalise_question(messages[-1]["content"])]
+        return hashlib.sha1(json.dumps(tail, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    async def reply(self, user_message, conversation=None):
+        """The bot's answer to a message: a canned reply for banned language or errors, otherwise the model's.
+
+        `conversation` identifies who is talking where (e.g. "telegram:<chat>:<user>"); without
+        it the message is answered on its own.
+        """
+        self.reload_if_changed()
+        route = self.route(user_message)
+        if route == "banned":
+            return self.banned_reply
+
+        remember = bool(self.memory and conversation)
+        standalone = not remember or is_standalone_question(user_message)
+        answer = self.cache.get(user_message) if self.cache and standalone else None
+        if answer is None:
+            # Standalone questions are answered without history, so their answers are reusable
+            history = [] if standalone else await self.memory.history(conversation)
+            use_cache = bool(self.cache) and not history
+            if use_cache and not standalone:
+                answer = self.cache.get(user_message)  # A conversation's first message has no history yet
+        if answer is None:
+            answer = await self._answer(user_message, route, history)
+            if answer is None:
+                return self.error_reply
+            if use_cache:
+                self.cache.put(user_message, answer)
+
+        if remember:
+            overflow = await self.memory.append(conversation, user_message, answer)
+            if overflow:
+                task = asyncio.ensure_future(self.summarise(conversation, overflow))
+                self.background.add(task)
+                task.add_done_callback(self.background.discard)
+        return answer
+
+    async def _answer(self, user_message, route, history):
+        """The model's answer, or None if it could not be had."""
+        messages = self.build_messages(user_message, route, history)
+        try:
+            answer = await self.limiter.run(self.flight_key(messages), lambda: self.complete(messages))
+        except asyncio.TimeoutError:
+            logger.warning(f"[⏳] No free OpenAI slot within {self.limiter.queue_timeout}s, {self.limiter.in_flight} calls in flight")
+            return None
+        except Exception as e:
+            logger.error(f"[❌] OpenAI API error: {e}", exc_info=True)
+            return None
+        return answer
+
+    async def summarise(self, conversation, messages):
+        """Fold messages that fell out of the conversation memory into its running summary."""
+        previous = await self.memory.summary(conversation)
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        prompt = [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": f"Summary so far: {previous or 'none'}\n\nNew messages:\n{transcript}"},
+        ]
+        key = hashlib.sha1(f"summary\n{conversation}\n{transcript}".encode("utf-8")).hexdigest()
+        try:
+            summary = await self.limiter.run(key, lambda: self.complete(prompt, SUMMARY_MAX_TOKENS, temperature=0.3))
+        except Exception as e:
+            logger.error(f"[❌] Could not summarise conversation {conversation}: {e}")
+            return
+        await self.memory.set_summary(conversation, summary)
+
+    def stats(self):
+        """Queue and cache metrics."""
+        return {"llm": self.limiter.stats(), "cache": self.cache.stats() if self.cache else None}
+
+
+class BackgroundLoop:
+    """An asyncio event loop on a daemon thread, so synchronous code (Flask views) can await the engine.
+
+    The thread is started on first use in each process, which keeps it working under forking
+    servers like Gunicorn.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_running(self):
+        with self._lock:
+            if self.loop is None or self.pid != os.getpid():
+                self.loop = asyncio.new_event_loop()
+                self.pid = os.getpid()
+                threading.Thread(target=self.loop.run_forever, daemon=True, name="chat-engine-loop").start()
+        return self.loop
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and wait for its result. On timeout the coroutine is cancelled."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_running())
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()  # Frees its queue or model slot instead of running on unobserved
+            raise
@@ -0,0 +1,102 @@
+import json
+import redis
+import redis.asyncio
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("ConversationMemoryService")
+
+CHAT_MEMORY_ENABLED = CONFIG.get("CHAT_MEMORY_ENABLED", True)
+MEMORY_MAX_MESSAGES = CONFIG.get("CHAT_MEMORY_MAX_MESSAGES", 20)  # Kept per conversation before summarising
+MEMORY_TTL = CONFIG.get("CHAT_MEMORY_TTL", 24 * 3600)  # A conversation idle this long is forgotten
+MEMORY_TOKEN_BUDGET = CONFIG.get("CHAT_MEMORY_TOKEN_BUDGET", 1000)  # History tokens sent with each message
+
+TURNS_KEY = "chat:memory:{conversation}"  # List of JSON {"role", "content"}, oldest first
+SUMMARY_KEY = "chat:summary:{conversation}"  # Running summary of the turns that fell out of the list
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token plus per-message overhead)."""
+    return len(text) // 4 + 4
+
+
+class ConversationMemory:
+    """Per-user, per-chat conversation history in Redis.
+
+    Each conversation is a list capped at MEMORY_MAX_MESSAGES and expiring after MEMORY_TTL of
+    inactivity. Messages pushed past the cap are handed back to the caller to be folded into
+    a running summary, so long conversations keep their gist without the prompt growing.
+    `history()` returns the summary plus the newest messages that fit the token budget.
+    Redis errors are logged and treated as an empty history, so the bots keep answering.
+    The client is redis.asyncio, so a slow or unreachable Redis never blocks the event loop.
+    """
+
+    def __init__(self, redis_client=None, max_messages=MEMORY_MAX_MESSAGES, ttl=MEMORY_TTL,
+                 token_budget=MEMORY_TOKEN_BUDGET):
+        # Short timeouts: a message should not wait long on a Redis that is down
+        self.redis = redis_client or redis.asyncio.Redis(host='redis', port=6379, db=0, decode_responses=True,
+                                                         socket_timeout=1, socket_connect_timeout=1)
+        self.max_messages = max_messages
+        self.ttl = ttl
+        self.token_budget = token_budget
+
+    async def history(self, conversation):
+        """Messages to put between the prompt and the new question: [summary] + recent turns within budget."""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.get(SUMMARY_KEY.format(conversation=conversation))
+            pipe.lrange(TURNS_KEY.format(conversation=conversation), 0, -1)
+            summary, turns = await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"[❌] Could not load conversation {conversation}: {e}")
+            return []
+
+        budget = self.token_budget
+        messages = []
+        if summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation: {summary}"})
+            budget -= estimate_tokens(messages[0]["content"])
+
+        recent = []
+        for raw in reversed(turns):
+            message = json.loads(raw)
+            budget -= estimate_tokens(message["content"])
+            if budget < 0:
+                break
+            recent.append(message)
+        recent.reverse()
+        while recent and recent[0]["role"] == "assistant":  # Start on a question, not a dangling answer
+            recent.pop(0)
+        return messages + recent
+
+    async def append(self, conversation, user_message, answer):
+        """Record one exchange. Returns the messages pushed out of the buffer (to be summarised), oldest first."""
+        key = TURNS_KEY.format(conversation=conversation)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.rpush(key, json.dumps({"role": "user", "content": user_message}, ensure_ascii=False),
+                       json.dumps({"role": "assistant", "content": answer}, ensure_ascii=False))
+            pipe.lrange(key, 0, -self.max_messages - 1)  # What the trim below drops
+            pipe.ltrim(key, -self.max_messages, -1)
+            pipe.expire(key, self.ttl)
+            pipe.expire(SUMMARY_KEY.format(conversation=conversation), self.ttl)
+            _, overflow, *_ = await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"[❌] Could not save conversation {conversation}: {e}")
+            return []
+        return [json.loads(raw) for raw in overflow]
+
+    async def summary(self, conversation):
+        try:
+            return await self.redis.get(SUMMARY_KEY.format(conversation=conversation))
+        except redis.RedisError:
+            return None
+
+    async def set_summary(self, conversation, summary):
+        try:
+            await self.redis.set(SUMMARY_KEY.format(conversation=conversation), summary, ex=self.ttl)
+        except redis.RedisError as e:
+            logger.error(f"[❌] Could not save summary of {conversation}: {e}")
+
+    async def clear(self, conversation):
+        await self.redis.delete(TURNS_KEY.format(conversation=conversation), SUMMARY_KEY.format(conversation=conversation))
@@ -0,0 +1,281 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import grpc
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("CosmosGrpcService")
+
+GRPC_ENDPOINT = CONFIG.get("ONCHAIN_GRPC_ENDPOINT", "injective-grpc.polkachu.com:14390")
+GRPC_TIMEOUT = CONFIG.get("ONCHAIN_GRPC_TIMEOUT", 10)  # Deadline per call (seconds)
+
+_F = descriptor_pb2.FieldDescriptorProto
+
+# Minimal subset of the Cosmos SDK protos, only the fields we read.
+# Unknown fields on the wire are skipped by the decoder, so upstream additions are harmless.
+PROTO_MESSAGES = {
+    "google.protobuf": {
+        "Duration": [("seconds", 1, _F.TYPE_INT64), ("nanos", 2, _F.TYPE_INT32)],
+        "Timestamp": [("seconds", 1, _F.TYPE_INT64), ("nanos", 2, _F.TYPE_INT32)],
+    },
+    "cosmos.base.v1beta1": {
+        "Coin": [("denom", 1, _F.TYPE_STRING), ("amount", 2, _F.TYPE_STRING)],
+    },
+    "cosmos.base.query.v1beta1": {
+        "PageRequest": [
+            ("key", 1, _F.TYPE_BYTES),
+            ("offset", 2, _F.TYPE_UINT64),
+            ("limit", 3, _F.TYPE_UINT64),
+            ("count_total", 4, _F.TYPE_BOOL),
+            ("reverse", 5, _F.TYPE_BOOL),
+        ],
+        "PageResponse": [("next_key", 1, _F.TYPE_BYTES), ("total", 2, _F.TYPE_UINT64)],
+    },
+    "cosmos.bank.v1beta1": {
+        "QuerySupplyOfRequest": [("denom", 1, _F.TYPE_STRING)],
+        "QuerySupplyOfResponse": [("amount", 1, ".cosmos.base.v1beta1.Coin")],
+    },
+    "cosmos.staking.v1beta1": {
+        "Pool": [("not_bonded_tokens", 1, _F.TYPE_STRING), ("bonded_tokens", 2, _F.TYPE_STRING)],
+        "QueryPoolRequest": [],
+        "QueryPoolResponse": [("pool", 1, ".cosmos.staking.v1beta1.Pool")],
+    },
+    "cosmos.gov.v1": {
+        "Params": [
+            ("min_deposit", 1, ".cosmos.base.v1beta1.Coin", _F.LABEL_REPEATED),
+            ("max_deposit_period", 2, ".google.protobuf.Duration"),
+            ("voting_period", 3, ".google.protobuf.Duration"),
+            ("quorum", 4, _F.TYPE_STRING),
+            ("threshold", 5, _F.TYPE_STRING),
+            ("veto_threshold", 6, _F.TYPE_STRING),
+        ],
+        "QueryParamsRequest": [("params_type", 1, _F.TYPE_STRING)],
+        "QueryParamsResponse": [("params", 4, ".cosmos.gov.v1.Params")],
+        "TallyResult": [
+            ("yes_count", 1, _F.TYPE_STRING),
+            ("abstain_count", 2, _F.TYPE_STRING),
+            ("no_count", 3, _F.TYPE_STRING),
+            ("no_with_veto_count", 4, _F.TYPE_STRING),
+        ],
+        # status is the ProposalStatus enum, read as its integer value (see gov_tracker_service)
+        "Proposal": [
+            ("id", 1, _F.TYPE_UINT64),
+            ("status", 3, _F.TYPE_INT32),
+            ("final_tally_result", 4, ".cosmos.gov.v1.TallyResult"),
+            ("submit_time", 5, ".google.protobuf.Timestamp"),
+            ("deposit_end_time", 6, ".google.protobuf.Timestamp"),
+            ("total_deposit", 7, ".cosmos.base.v1beta1.Coin", _F.LABEL_REPEATED),
+            ("voting_start_time", 8, ".google.protobuf.Timestamp"),
+            ("voting_end_time", 9, ".google.protobuf.Timestamp"),
+            ("title", 11, _F.TYPE_STRING),
+            ("summary", 12, _F.TYPE_STRING),
+        ],
+        "QueryProposalRequest": [("proposal_id", 1, _F.TYPE_UINT64)],
+        "QueryProposalResponse": [("proposal", 1, ".cosmos.gov.v1.Proposal")],
+        "QueryProposalsRequest": [
+            ("proposal_status", 1, _F.TYPE_INT32),
+            ("pagination", 4, ".cosmos.base.query.v1beta1.PageRequest"),
+        ],
+        "QueryProposalsResponse": [
+            ("proposals", 1, ".cosmos.gov.v1.Proposal", _F.LABEL_REPEATED),
+            ("pagination", 2, ".cosmos.base.query.v1beta1.PageResponse"),
+        ],
+    },
+    "tendermint.types": {
+        "Header": [("chain_id", 2, _F.TYPE_STRING), ("height", 3, _F.TYPE_INT64), ("time", 4, ".google.protobuf.Timestamp")],
+        "Data": [("txs", 1, _F.TYPE_BYTES, _F.LABEL_REPEATED)],
+        "Block": [("header", 1, ".tendermint.types.Header"), ("data", 2, ".tendermint.types.Data")],
+    },
+    "cosmos.base.tendermint.v1beta1": {
+        "GetLatestBlockRequest": [],
+        "GetLatestBlockResponse": [("block", 2, ".tendermint.types.Block")],
+        "GetBlockByHeightRequest": [("height", 1, _F.TYPE_INT64)],
+        "GetBlockByHeightResponse": [("block", 2, ".tendermint.types.Block")],
+    },
+}
+
+# gRPC method path -> (request type, response type)
+QUERY_METHODS = {
+    "/cosmos.bank.v1beta1.Query/SupplyOf": ("cosmos.bank.v1beta1.QuerySupplyOfRequest", "cosmos.bank.v1beta1.QuerySupplyOfResponse"),
+    "/cosmos.staking.v1beta1.Query/Pool": ("cosmos.staking.v1beta1.QueryPoolRequest", "cosmos.staking.v1beta1.QueryPoolResponse"),
+    "/cosmos.gov.v1.Query/Params": ("cosmos.gov.v1.QueryParamsRequest", "cosmos.gov.v1.QueryParamsResponse"),
+    "/cosmos.gov.v1.Query/Proposal": ("cosmos.gov.v1.QueryProposalRequest", "cosmos.gov.v1.QueryProposalResponse"),
+    "/cosmos.gov.v1.Query/Proposals": ("cosmos.gov.v1.QueryProposalsRequest", "cosmos.gov.v1.QueryProposalsResponse"),
+    "/cosmos.base.tendermint.v1beta1.Service/GetLatestBlock": (
+        "cosmos.base.tendermint.v1beta1.GetLatestBlockRequest", "cosmos.base.tendermint.v1beta1.GetLatestBlockResponse"),
+    "/cosmos.base.tendermint.v1beta1.Service/GetBlockByHeight": (
+        "cosmos.base.tendermint.v1beta1.GetBlockByHeightRequest", "cosmos.base.tendermint.v1beta1.GetBlockByHeightResponse"),
+}
+
+
+def _build_message_classes():
+    """Build protobuf message classes from PROTO_MESSAGES in a private descriptor pool."""
+    pool = descriptor_pool.DescriptorPool()
+    for package, messages in PROTO_MESSAGES.items():
+        file_proto = descriptor_pb2.FileDescriptorProto(
+            name=f"socoai/{package.replace('.', '/')}.proto", package=package, syntax="proto3"
+        )
+        for message_name, fields in messages.items():
+            message_proto = file_proto.message_type.add(name=message_name)
+            for name, number, field_type, *label in fields:
+                field = message_proto.field.add(
+                    name=name, number=number, label=label[0] if label else _F.LABEL_OPTIONAL
+                )
+                if isinstance(field_type, str):
+                    field.type = _F.TYPE_MESSAGE
+                    field.type_name = field_type
+                else:
+                    field.type = field_type
+        # Packages are declared in dependency order, so every referenced file is already in the pool
+        file_proto.dependency.extend(
+            f"socoai/{dep.replace('.', '/')}.proto" for dep in _referenced_packages(messages) if dep != package
+        )
+        pool.Add(file_proto)
+
+    classes = {}
+    for package, messages in PROTO_MESSAGES.items():
+        for message_name in messages:
+            full_name = f"{package}.{message_name}"
+            descriptor = pool.FindMessageTypeByName(full_name)
+            if hasattr(message_factory, "GetMessageClass"):
+                classes[full_name] = message_factory.GetMessageClass(descriptor)
+            else:  # protobuf < 4.21
+                classes[full_name] = message_factory.MessageFactory(pool).GetPrototype(descriptor)
+    return classes
+
+
+def _referenced_packages(messages):
+    """Packages of the message types referenced by a package's fields."""
+    return sorted({
+        field_type[1:].rsplit(".", 1)[0]
+        for fields in messages.values()
+        for _, _, field_type, *_ in fields
+        if isinstance(field_type, str)
+    })
+
+
+MESSAGES = _build_message_classes()
+
+
+class CosmosGrpcClient:
+    """Long-lived gRPC channel with reusable stubs for the Cosmos bank, staking, gov and Tendermint queries."""
+
+    def __init__(self, target=GRPC_ENDPOINT, timeout=GRPC_TIMEOUT, channel=None):
+        self.target = target
+        self.timeout = timeout
+        self.channel = channel or grpc.insecure_channel(
+            target,
+            options=[
+                ("grpc.keepalive_time_ms", 60000),
+                ("grpc.keepalive_timeout_ms", 10000),
+                ("grpc.max_receive_message_length", 32 * 1024 * 1024),
+            ],
+        )
+        self._stubs = {}
+        self._lock = threading.Lock()
+
+    def _stub(self, method):
+        """Return the cached unary stub for a method path, creating it on first use."""
+        stub = self._stubs.get(method)
+        if stub is None:
+            request_type, response_type = QUERY_METHODS[method]
+            with self._lock:
+                stub = self._stubs.setdefault(method, self.channel.unary_unary(
+                    method,
+                    request_serializer=MESSAGES[request_type].SerializeToString,
+                    response_deserializer=MESSAGES[response_type].FromString,
+                ))
+        return stub
+
+    def query(self, method, timeout=None, **fields):
+        """Call a unary query. Raises grpc.RpcError on failure or when the deadline is exceeded."""
+        request = MESSAGES[QUERY_METHODS[method][0]](**fields)
+        return self._stub(method)(request, timeout=timeout or self.timeout)
+
+    def supply_of(self, denom="inj"):
+        return self.query("/cosmos.bank.v1beta1.Query/SupplyOf", denom=denom).amount
+
+    def staking_pool(self):
+        return self.query("/cosmos.staking.v1beta1.Query/Pool").pool
+
+    def gov_params(self):
+        return self.query("/cosmos.gov.v1.Query/Params", params_type="").params
+
+    def proposal(self, proposal_id):
+        return self.query("/cosmos.gov.v1.Query/Proposal", proposal_id=proposal_id).proposal
+
+    def proposals(self, limit=20, key=b"", reverse=True):
+        """One page of proposals, newest first by default. Returns (proposals, next_key)."""
+        pagination = MESSAGES["cosmos.base.query.v1beta1.PageRequest"](key=key, limit=limit, reverse=reverse)
+        response = self.query("/cosmos.gov.v1.Query/Proposals", pagination=pagination)
+        return list(response.proposals), response.pagination.next_key
+
+    def latest_block(self):
+        return self.query("/cosmos.base.tendermint.v1beta1.Service/GetLatestBlock").block
+
+    def block_by_height(self, height):
+        return self.query("/cosmos.base.tendermint.v1beta1.Service/GetBlockByHeight", height=height).block
+
+    def close(self):
+        self.channel.close()
+
+
+class FakeCosmosServer:
+    """In-process gRPC server answering the QUERY_METHODS with canned responses, for testing without a node.
+
+    `responses` maps a method path to the response fields as a dict (nested dicts and lists for
+    sub-messages), or to a callable(request, context) returning such a dict; a callable can fail
+    the call with `context.abort(grpc.StatusCode.NOT_FOUND, ...)`. Methods without a response
+    return UNIMPLEMENTED.
+
+        with FakeCosmosServer({"/cosmos.staking.v1beta1.Query/Pool": {"pool": {"bonded_tokens": "10"}}}) as server:
+            client = CosmosGrpcClient(target=server.target)
+    """
+
+    def __init__(self, responses, host="127.0.0.1", port=0):
+        self.responses = responses
+        self.server = grpc.server(ThreadPoolExecutor(max_workers=4))
+        handlers = {}
+        for method, (request_type, response_type) in QUERY_METHODS.items():
+            service, name = method[1:].split("/")
+            handlers.setdefault(service, {})[name] = grpc.unary_unary_rpc_method_handler(
+                self._handler(method, MESSAGES[response_type]),
+                request_deserializer=MESSAGES[request_type].FromString,
+                response_serializer=MESSAGES[response_type].SerializeToString,
+            )
+        self.server.add_generic_rpc_handlers(
+            [grpc.method_handlers_generic_handler(service, methods) for service, methods in handlers.items()]
+        )
+        self.port = self.server.add_insecure_port(f"{host}:{port}")
+        self.target = f"{host}:{self.port}"
+
+    def _handler(self, method, response_class):
+        def handle(request, context):
+            response = self.responses.get(method)
+            if response is None:
+                context.abort(grpc.StatusCode.UNIMPLEMENTED, f"No fake response for {method}")
+            if callable(response):
+                response = response(request, context)
+            return response_class(**response)
+        return handle
+
+    def start(self):
+        self.server.start()
+        return self
+
+    def stop(self):
+        self.server.stop(grace=None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    client = CosmosGrpcClient()
+    print(client.supply_of())
+    print(client.staking_pool())
+    print(client.gov_params())
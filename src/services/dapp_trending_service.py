@@ -0,0 +1,172 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import redis
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+from src.services.dapps_tracker_service import ROLLUP_KEY, bucket_period
+
+logger = setup_logger("DappTrendingService")
+
+TRENDING_FILE = "data/trending_dapps.json"
+
+BASELINE_HOURS = CONFIG.get("TRENDING_BASELINE_HOURS", 7 * 24)  # Must fit in the hourly rollup TTL (8 days)
+Z_THRESHOLD = CONFIG.get("TRENDING_Z_THRESHOLD", 3.0)
+MIN_POSTS = CONFIG.get("TRENDING_MIN_POSTS", 3)  # Ignore spikes made of one or two posts
+TOP_N = CONFIG.get("TRENDING_TOP_N", 10)
+STD_FLOOR = 0.5  # Keeps quiet accounts (near-zero variance) from producing huge z-scores
+
+
+class RollingBaseline:
+    """Fixed-size ring buffer of per-bucket counts for every author, vectorised in NumPy.
+
+    Rows are authors, columns are the last `size` buckets. Running sums of x and x² make the
+    mean and variance O(1) per author per bucket, so scoring a bucket is a handful of array
+    operations over all authors at once.
+    """
+
+    def __init__(self, size=BASELINE_HOURS, capacity=256):
+        self.size = size
+        self.index = {}  # author -> row
+        self.names = []
+        self.counts = np.zeros((capacity, size), dtype=np.float32)
+        self.sums = np.zeros(capacity, dtype=np.float64)
+        self.sq_sums = np.zeros(capacity, dtype=np.float64)
+        self.pos = 0  # Column the next bucket is written to
+        self.filled = 0  # Buckets in the window so far
+
+    def _rows(self, authors):
+        """Row of each author, growing the arrays (by doubling) for new ones."""
+        for author in authors:
+            if author not in self.index:
+                self.index[author] = len(self.names)
+                self.names.append(author)
+        if len(self.names) > len(self.sums):
+            capacity = max(len(self.names), 2 * len(self.sums))
+            grow = capacity - len(self.sums)
+            self.counts = np.vstack([self.counts, np.zeros((grow, self.size), dtype=np.float32)])
+            self.sums = np.concatenate([self.sums, np.zeros(grow)])
+            self.sq_sums = np.concatenate([self.sq_sums, np.zeros(grow)])
+        return np.fromiter((self.index[author] for author in authors), dtype=np.int64, count=len(authors))
+
+    def vector(self, bucket_counts):
+        """Dense count vector (one entry per tracked author) from {author: posts}."""
+        rows = self._rows(list(bucket_counts))
+        x = np.zeros(len(self.sums), dtype=np.float64)
+        x[rows] = list(bucket_counts.values())
+        return x
+
+    def score(self, x):
+        """z-score of each author's count against their baseline (NaN until the window has data)."""
+        if not self.filled:
+            return np.full(len(x), np.nan)
+        mean = self.sums / self.filled
+        variance = np.maximum(self.sq_sums / self.filled - mean ** 2, 0.0)
+        return (x - mean) / np.maximum(np.sqrt(variance), STD_FLOOR)
+
+    def push(self, x):
+        """Add a bucket, evicting the oldest once the window is full."""
+        outgoing = self.counts[:, self.pos].astype(np.float64)
+        self.sums += x - outgoing
+        self.sq_sums += x ** 2 - outgoing ** 2
+        self.counts[:, self.pos] = x
+        self.pos = (self.pos + 1) % self.size
+        self.filled = min(self.filled + 1, self.size)
+
+    def mean(self):
+        return self.sums / max(self.filled, 1)
+
+
+class DappTrendingService:
+    """Score each closed hour of dapp activity against the authors' rolling baselines and publish the spikes."""
+
+    def __init__(self, redis_client=None, baseline=None, path=TRENDING_FILE):
+        self.redis_client = redis_client or redis.Redis(host='redis', port=6379, db=0)
+        self.baseline = baseline or RollingBaseline()
+        self.path = path
+        self.last_hour = None  # Start of the last bucket pushed into the baseline
+
+    def _hour_counts(self, hour):
+        key = ROLLUP_KEY.format(bucket="hour", period=bucket_period("hour", hour))
+        return {
+            (name.decode("utf-8") if isinstance(name, bytes) else name): score
+            for name, score in self.redis_client.zrange(key, 0, -1, withscores=True)
+        }
+
+    def warm_up(self, now=None):
+        """Rebuild the baseline from the hourly rollups still in Redis."""
+        now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+        first = now - timedelta(hours=self.baseline.size)
+        for i in range(self.baseline.size):
+            hour = first + timedelta(hours=i)
+            self.baseline.push(self.baseline.vector(self._hour_counts(hour)))
+        self.last_hour = now - timedelta(hours=1)
+        logger.info(f"[📋] Trending baseline warmed up over {self.baseline.size} hours for {len(self.baseline.names)} authors")
+
+    def update(self, now=None):
+        """Score every hour closed since the last update; publishes the latest result. Returns the trending list."""
+        now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+        if self.last_hour is None:
+            self.warm_up(now - timedelta(hours=1))
+
+        trending = None
+        hour = self.last_hour + timedelta(hours=1)
+        while hour < now:
+            x = self.baseline.vector(self._hour_counts(hour))
+            z = self.baseline.score(x)
+            trending = self._trending(hour, x, z)
+            self.baseline.push(x)
+            self.last_hour = hour
+            hour += timedelta(hours=1)
+
+        if trending is not None:
+            self.save(trending)
+        return trending
+
+    def _trending(self, hour, x, z):
+        candidates = np.flatnonzero((x >= MIN_POSTS) & (z >= Z_THRESHOLD))
+        ranked = candidates[np.argsort(-z[candidates])][:TOP_N]
+        mean = self.baseline.mean()
+        return {
+            "bucket": bucket_period("hour", hour),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "baseline_hours": self.baseline.filled,
+            "trending": [
+                {
+                    "name": self.baseline.names[row],
+                    "posts": int(x[row]),
+                    "baseline_mean": round(float(mean[row]), 3),
+                    "z_score": round(float(z[row]), 2),
+                }
+                for row in ranked
+            ],
+        }
+
+    def save(self, trending):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(trending, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        if trending["trending"]:
+            logger.info(f"[🔥] Trending dapps for {trending['bucket']}: {', '.join(d['name'] for d in trending['trending'])}")
+
+
+def load_trending_dapps(path=TRENDING_FILE, max_age_hours=2):
+    """The published trending list, or [] when missing or older than max_age_hours."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        generated_at = datetime.fromisoformat(data["generated_at"])
+    except (json.JSONDecodeError, KeyError, ValueError) as e:
+        logger.error(f"[❌] Error reading {path}: {e}")
+        return []
+    if datetime.now(timezone.utc) - generated_at > timedelta(hours=max_age_hours):
+        return []
+    return data.get("trending", [])
+
+
+if __name__ == "__main__":
+    print(DappTrendingService().update())
@@ -1,18 +1,219 @@
 import json
 import os
-from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import redis
 
+ACTIVITY_KEY = "dapps:activity"  # Sorted set: @username -> total posts
+DAILY_TOTALS_KEY = "dapps:daily_totals"  # Hash: YYYY-MM-DD -> posts that day
+DAYS_KEY = "dapps:days"  # Sorted set: YYYY-MM-DD scored by epoch day, for date-range lookups
+HOURLY_TOTALS_KEY = "dapps:hourly_totals"  # Hash: YYYY-MM-DDTHH -> posts that hour
+ROLLUP_KEY = "dapps:rollup:{bucket}:{period}"  # Sorted set per hour/day/week: @username -> posts
+TOP_CACHE_KEY = "dapps:top:{window}:{period}"  # Cached union for multi-bucket windows
+SEEN_KEY = "dapps:seen:{date}"  # Set per day of tweet IDs already counted
+SEEDED_KEY = "dapps:seeded"
+
+SEEN_TTL = 8 * 24 * 3600  # Tweets are fetched from the last hour, a week of IDs is plenty
+ROLLUP_TTLS = {"hour": 8 * 24 * 3600, "day": 400 * 24 * 3600, "week": 0}  # 0 keeps the bucket
+TOP_CACHE_TTL = 300
+
+# Leaderboard windows: (bucket size, number of buckets); None is all time
+TOP_WINDOWS = {
+    "hour": ("hour", 1),
+    "24h": ("hour", 24),
+    "day": ("day", 1),
+    "7d": ("day", 7),
+    "30d": ("day", 30),
+    "week": ("week", 1),
+    "all": None,
+}
+
+# Count a tweet once: the SADD on the day's seen set decides whether the counters move
+COUNT_TWEET_SCRIPT = """
+if redis.call('SADD', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('ZINCRBY', KEYS[2], 1, ARGV[2])
+for i = 3, 5 do
+    redis.call('ZINCRBY', KEYS[i], 1, ARGV[2])
+    local ttl = tonumber(ARGV[i + 3])
+    if ttl > 0 then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+redis.call('HINCRBY', KEYS[6], ARGV[3], 1)
+redis.call('ZADD', KEYS[7], ARGV[5], ARGV[3])
+redis.call('HINCRBY', KEYS[8], ARGV[9], 1)
+return 1
+"""
+
+
+def _text(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _epoch_day(date):
+    return (datetime.strptime(date, "%Y-%m-%d").date() - datetime(1970, 1, 1).date()).days
+
+
+def bucket_period(bucket, moment):
+    """Period name of the hour/day/week bucket containing a datetime."""
+    if bucket == "hour":
+        return moment.strftime("%Y-%m-%dT%H")
+    if bucket == "day":
+        return moment.strftime("%Y-%m-%d")
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _bucket_step(bucket):
+    return {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}[bucket]
+
+
+class DappActivityCounter:
+    """Per-author post counters in Redis, updated as tweets are stored.
+
+    Besides the all-time leaderboard, every tweet lands in hourly, daily and ISO-weekly sorted
+    sets, so "top K over a window" is a ZREVRANGE on one bucket (O(log n + k)) and date ranges are
+    a ZRANGEBYSCORE on the day index. Counting is idempotent per tweet ID, so re-saving the same
+    tweets never inflates the totals.
+    """
+
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client or redis.Redis(host='redis', port=6379, db=0)
+        self.count_script = self.redis_client.register_script(COUNT_TWEET_SCRIPT)
+
+    def load_user_cache(self):
+        """Load the author_id -> username map from Redis."""
+        try:
+            user_cache_data = self.redis_client.get('user_cache')
+            return json.loads(user_cache_data) if user_cache_data else {}
+        except (redis.RedisError, json.JSONDecodeError) as e:
+            print(f"[❌] Error loading user cache from Redis: {e}")
+            return {}
+
+    def count_tweets(self, tweets):
+        """Count each tweet once under its author and its UTC hour, day and week. Returns how many were new."""
+        if not tweets:
+            return 0
+        user_cache = self.load_user_cache()
+        pipe = self.redis_client.pipeline(transaction=False)
+        for tweet in tweets:
+            moment = datetime.strptime(tweet["date"], "%Y-%m-%d %H:%M:%S")
+            date = bucket_period("day", moment)
+            username = f"@{user_cache.get(tweet['author_id'], tweet['author_id'])}"  # Fall back to author_id
+            self.count_script(
+                keys=[
+                    SEEN_KEY.format(date=date),
+                    ACTIVITY_KEY,
+                    *(ROLLUP_KEY.format(bucket=bucket, period=bucket_period(bucket, moment)) for bucket in ("hour", "day", "week")),
+                    DAILY_TOTALS_KEY,
+                    DAYS_KEY,
+                    HOURLY_TOTALS_KEY,
+                ],
+                args=[tweet["id"], username, date, SEEN_TTL, _epoch_day(date),
+                      ROLLUP_TTLS["hour"], ROLLUP_TTLS["day"], ROLLUP_TTLS["week"], bucket_period("hour", moment)],
+                client=pipe,
+            )
+        return sum(pipe.execute())
+
+    def seed_from_files(self, dapps_activity, total_activity):
+        """Carry the totals of the old JSON files over into Redis, once."""
+        if not self.redis_client.set(SEEDED_KEY, datetime.now(timezone.utc).isoformat(), nx=True):
+            return False
+        pipe = self.redis_client.pipeline()
+        for entry in dapps_activity:
+            pipe.zincrby(ACTIVITY_KEY, entry["activity"], entry["name"])
+        for entry in total_activity:
+            date = datetime.strptime(entry["date"], "%d-%m-%Y").strftime("%Y-%m-%d")
+            pipe.hincrby(DAILY_TOTALS_KEY, date, entry["activity"])
+            pipe.zadd(DAYS_KEY, {date: _epoch_day(date)})
+        pipe.execute()
+        return True
+
+    def _window_key(self, window, now):
+        """Sorted set holding the counts for a window, building (and caching) a union when it spans buckets."""
+        spec = TOP_WINDOWS[window]
+        if spec is None:
+            return ACTIVITY_KEY
+        bucket, count = spec
+        keys = [
+            ROLLUP_KEY.format(bucket=bucket, period=bucket_period(bucket, now - i * _bucket_step(bucket)))
+            for i in range(count)
+        ]
+        if count == 1:
+            return keys[0]
+        cache_key = TOP_CACHE_KEY.format(window=window, period=bucket_period(bucket, now))
+        if not self.redis_client.exists(cache_key):
+            pipe = self.redis_client.pipeline()
+            pipe.zunionstore(cache_key, keys)
+            pipe.expire(cache_key, TOP_CACHE_TTL)
+            pipe.execute()
+        return cache_key
+
+    def top(self, window="all", k=10, now=None):
+        """Top K authors by posts over a window (see TOP_WINDOWS), as [(username, posts)]."""
+        if window not in TOP_WINDOWS:
+            raise ValueError(f"Unknown window '{window}', expected one of {', '.join(TOP_WINDOWS)}")
+        now = now or datetime.now(timezone.utc)
+        key = self._window_key(window, now)
+        return [(_text(name), int(score)) for name, score in self.redis_client.zrevrange(key, 0, k - 1, withscores=True)]
+
+    def author_totals(self):
+        """[(username, posts)] sorted by posts, highest first."""
+        return [(_text(name), int(score)) for name, score in self.redis_client.zrevrange(ACTIVITY_KEY, 0, -1, withscores=True)]
+
+    def daily_range(self, start, end):
+        """[(YYYY-MM-DD, posts)] for the days between start and end (inclusive) that had activity."""
+        dates = [_text(date) for date in self.redis_client.zrangebyscore(DAYS_KEY, _epoch_day(start), _epoch_day(end))]
+        if not dates:
+            return []
+        counts = self.redis_client.hmget(DAILY_TOTALS_KEY, dates)
+        return [(date, int(count or 0)) for date, count in zip(dates, counts)]
+
+    def daily_series(self, start, end):
+        """Zero-filled [(YYYY-MM-DD, posts)] from start to end, clamped to the first recorded day."""
+        first = self.redis_client.zrange(DAYS_KEY, 0, 0)
+        if not first:
+            return []
+        day = max(datetime.strptime(start, "%Y-%m-%d"), datetime.strptime(_text(first[0]), "%Y-%m-%d"))
+        counts = dict(self.daily_range(day.strftime("%Y-%m-%d"), end))
+        series = []
+        last = datetime.strptime(end, "%Y-%m-%d")
+        while day <= last:
+            date = day.strftime("%Y-%m-%d")
+            series.append((date, counts.get(date, 0)))
+            day += timedelta(days=1)
+        return series
+
+    def hourly_series(self, start, end):
+        """Zero-filled [(YYYY-MM-DDTHH, posts)] for every hour from start to end (datetimes)."""
+        hours = []
+        hour = start.replace(minute=0, second=0, microsecond=0)
+        while hour <= end:
+            hours.append(bucket_period("hour", hour))
+            hour += timedelta(hours=1)
+        if not hours:
+            return []
+        counts = self.redis_client.hmget(HOURLY_TOTALS_KEY, hours)
+        return [(period, int(count or 0)) for period, count in zip(hours, counts)]
+
+    def daily_totals(self):
+        """{YYYY-MM-DD: posts}."""
+        return {_text(date): int(count) for date, count in self.redis_client.hgetall(DAILY_TOTALS_KEY).items()}
+
+
 class DappActivityTracker:
+    """Export the live Redis activity counters to the JSON files served by the dashboard."""
+
     def __init__(self, data_dir="data"):
         """Initialize the class with paths to data files and Redis connection."""
-        self.daily_tweets_file = os.path.join(data_dir, "daily_tweets.json")
         self.dapps_activity_file = os.path.join(data_dir, "dapps_activity.json")
         self.total_dapps_activity_file = os.path.join(data_dir, "total_dapps_activity.json")
-        
+
         # Kết nối Redis
         self.redis_client = redis.Redis(host='redis', port=6379, db=0)
+        self.counter = DappActivityCounter(self.redis_client)
 
         # Kiểm tra kết nối Redis
         try:
@@ -23,11 +224,6 @@ class DappActivityTracker:
         except redis.ConnectionError as e:
             print(f"[❌] Redis connection error: {e}")
 
-        # Load data from files
-        self.daily_tweets = self.load_json(self.daily_tweets_file, {"tweets": []})
-        self.dapps_activity = self.load_json(self.dapps_activity_file, [])
-        self.total_activity = self.load_json(self.total_dapps_activity_file, [])
-
     def load_json(self, file_path, default=None):
         """Load JSON from file or return default value if file does not exist."""
         if default is None:
@@ -38,78 +234,44 @@ class DappActivityTracker:
         return default
 
     def save_json(self, file_path, data):
-        """Save JSON data to file."""
-        with open(file_path, "w", encoding="utf-8") as file:
+        """Save JSON data to file, replacing it atomically so readers never see a partial export."""
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
             json.dump(data, file, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, file_path)
 
-    def load_user_cache_from_redis(self):
-        """Load user cache from Redis."""
-        try:
-            user_cache_data = self.redis_client.get('user_cache')
-            if not user_cache_data:
-                print("[⚠️] No user cache found in Redis!")
-                return {}
-            
-            user_cache = json.loads(user_cache_data.decode('utf-8'))
-            if not user_cache:
-                print("[⚠️] Redis user cache is empty!")
-                return {}
-            
-            print(f"[📋] Loaded user cache with {len(user_cache)} users from Redis")
-            return user_cache
-        except redis.RedisError as e:
-            print(f"[❌] Error loading user cache from Redis: {e}")
-            return {}
-        except json.JSONDecodeError as e:
-            print(f"[❌] Error decoding user cache from Redis: {e}")
-            return {}
+    def seed_counters(self):
+        """Import the totals accumulated by the old nightly recount, on the first run only."""
+        if self.counter.seed_from_files(
+            self.load_json(self.dapps_activity_file, []),
+            self.load_json(self.total_dapps_activity_file, []),
+        ):
+            print("✅ Seeded Redis activity counters from the existing JSON files.")
 
     def update_dapps_activity(self):
-        """Update post counts per user and save to dapps_activity.json."""
-        activity_map = {entry["name"]: entry["activity"] for entry in self.dapps_activity}
-        user_cache = self.load_user_cache_from_redis()  # Lấy user cache từ Redis
-
-        # Count posts per user
-        author_activity = defaultdict(int)
-        for tweet in self.daily_tweets.get("tweets", []):
-            author_id = tweet["author_id"]
-            username = f"@{user_cache.get(author_id, author_id)}"  # Nếu không tìm thấy, dùng author_id
-            author_activity[username] += 1
-
-        # Update activity_map
-        for username, count in author_activity.items():
-            activity_map[username] = activity_map.get(username, 0) + count
-
-        # Convert to list for saving
-        self.dapps_activity = [{"name": name, "activity": count} for name, count in activity_map.items()]
-        self.save_json(self.dapps_activity_file, self.dapps_activity)
-        print("✅ Dapps activity updated successfully.")
+        """Export post counts per user to dapps_activity.json."""
+        activity = [{"name": name, "activity": count} for name, count in self.counter.author_totals()]
+        self.save_json(self.dapps_activity_file, activity)
+        print(f"✅ Exported activity for {len(activity)} dapps.")
 
     def update_total_activity(self):
-        """Update total post count by date and save to total_dapps_activity.json."""
-        date_str = self.daily_tweets.get("date", "")
-        if not date_str:
-            print("⚠️ No date found in daily_tweets.json")
-            return
-
-        formatted_date = datetime.strptime(date_str, "%Y-%m-%d").strftime("%d-%m-%Y")
-        tweet_count = len(self.daily_tweets.get("tweets", []))
-
-        # Check if this date already has data; if so, add to it, otherwise create new entry
-        existing_entry = next((entry for entry in self.total_activity if entry["date"] == formatted_date), None)
-        if existing_entry:
-            existing_entry["activity"] += tweet_count
-        else:
-            self.total_activity.append({"date": formatted_date, "activity": tweet_count})
-
-        self.save_json(self.total_dapps_activity_file, self.total_activity)
-        print("✅ Total dapps activity updated successfully.")
+        """Export total post count by date to total_dapps_activity.json."""
+        totals = [
+            {"date": datetime.strptime(date, "%Y-%m-%d").strftime("%d-%m-%Y"), "activity": count}
+            for date, count in sorted(self.counter.daily_totals().items())
+        ]
+        self.save_json(self.total_dapps_activity_file, totals)
+        print(f"✅ Exported total dapps activity for {len(totals)} days.")
 
     def run(self):
-        """Run all updates."""
-        self.update_dapps_activity()
-        self.update_total_activity()
+        """Run all exports."""
+        try:
+            self.update_dapps_activity()
+            self.update_total_activity()
+        except redis.RedisError as e:
+            print(f"[❌] Error exporting dapps activity from Redis: {e}")
 
 if __name__ == "__main__":
     tracker = DappActivityTracker()
-    tracker.run()
\ No newline at end of file
+    tracker.seed_counters()
+    tracker.run()
@@ -1,30 +1,37 @@
 import requests
-import subprocess
+import grpc
 import json
 import os
 import openai
 import logging
 import sys
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import time
+from datetime import datetime
 
 # Ensure src is loaded correctly regardless of execution location
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from utils.config_loader import CONFIG  # Retrieve API key from CONFIG
+from src.utils.http_client import get_http_client
+from src.services.cosmos_grpc_service import CosmosGrpcClient
+from src.services.block_ingest_service import BlockIngestor
+from src.services.gov_tracker_service import GovProposalTracker
+from src.services.onchain_collector_service import OnchainCollector
+from src.services.injscan_collector_service import InjscanCollector
+from src.services.onchain_metrics import ONCHAIN_METRICS, format_snapshot, format_value, format_change
+from src.services.onchain_history_service import OnchainHistoryStore
 
 # Paths to files
 DATA_DIR = "data"
 CONFIG_DIR = "config"
 
-ONCHAIN_DATA_FILE = os.path.join(DATA_DIR, "onchain_data.json")
+ONCHAIN_DATA_FILE = os.path.join(DATA_DIR, "onchain_data.json")  # Display values for the dashboard
+ONCHAIN_SNAPSHOT_FILE = os.path.join(DATA_DIR, "onchain_snapshot.json")  # Typed raw values
 ONCHAIN_NEWS_PROMPT_FILE = os.path.join(CONFIG_DIR, "onchain_news_prompt.json")
 GENERATED_NEWS_FILE = os.path.join(DATA_DIR, "generated_onchain_news.txt")
 
+BLOCK_COUNT_FIELD = "Block Count (Last 24h)"
+
 # Ensure directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
@@ -38,153 +45,192 @@ if not OPENAI_API_KEY:
     logger.error("❌ Error: OpenAI API Key not set in CONFIG!")
     exit(1)  # Stop the program if API key is missing
 
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _present(data):
+    """Drop metrics the upstream did not return."""
+    return {key: value for key, value in data.items() if value is not None}
+
+
 class OnchainDataService:
-    def __init__(self):
-        """Initialize Onchain Data Service"""
+    def __init__(self, grpc_client=None):
+        """Initialize Onchain Data Service
+
+        `grpc_client` replaces the default CosmosGrpcClient, e.g. one pointed at a FakeCosmosServer.
+        """
         self.api_url = "https://s.directory/injective"
+        self.http = get_http_client()
+        self.grpc_client = grpc_client or CosmosGrpcClient()  # One channel reused across fetches
         self.openai_client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        # Configure Selenium WebDriver
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
-        self.driver = webdriver.Chrome(options=options)
+        self.injscan = InjscanCollector()  # Explorer JSON API; Selenium only as an optional fallback
+        sources = {
+            "injective": self.fetch_injective_data,
+            "gov": self.fetch_gov_params,
+            "supply": self.fetch_supply_and_staking,
+            "explorer_stats": self.injscan.fetch_stats,
+            "explorer_contracts": self.injscan.fetch_contracts,
+        }
+        if CONFIG.get("ONCHAIN_BLOCK_INGEST", True):
+            # Block metrics computed locally from the block stream, replacing the explorer's
+            # explorer_activity and explorer_blocks sources so no field has two sources
+            self.block_ingestor = BlockIngestor(client=self.grpc_client).start()
+            sources["blocks"] = self.fetch_block_metrics
+        else:
+            self.block_ingestor = None
+            sources["explorer_activity"] = self.injscan.fetch_activity
+            sources["explorer_blocks"] = self.injscan.fetch_blocks
+        self.collector = OnchainCollector(sources, catalogue=ONCHAIN_METRICS)
+        self.collector.seed(self.load_onchain_data())
+        # Bridges the 24h block count until the block window covers a day: (value, fetched_at)
+        seeded = self.collector.last_good.get("blocks", ({}, 0))[0].get(BLOCK_COUNT_FIELD)
+        self.block_count_fallback = (seeded, 0)
+        self.history = OnchainHistoryStore()
+        self.gov_tracker = GovProposalTracker(client=self.grpc_client)
+
+    def collect_onchain_data(self):
+        """Refresh sources with expired metrics concurrently and serve the rest from cache."""
+        return self.collector.collect()
 
     def fetch_injective_data(self):
         """Fetch Injective network information from API"""
         try:
-            response = requests.get(self.api_url)
+            response = self.http.get(self.api_url, conditional=True)
             response.raise_for_status()
             data = response.json()
 
             chain = data.get("chain", {})
             params = chain.get("params", {})
-            prices = chain.get("prices", {}).get("coingecko", {}).get("INJ", {}).get("usd", "N/A")
+            price = chain.get("prices", {}).get("coingecko", {}).get("INJ", {}).get("usd")
+            inflation_max = params.get("mint", {}).get("inflation_max")
 
-            return {
+            return _present({
                 "Pretty Name": chain.get("pretty_name", "Injective"),
                 "Chain ID": chain.get("chain_id", "injective-1"),
                 "Status": chain.get("status", "Live"),
                 "Symbol": chain.get("symbol", "INJ"),
-                "Base Inflation": f"{params.get('base_inflation', 0) * 100:.3f}%" if "base_inflation" in params else "N/A",
-                "Inflation Max": f"{float(params.get('mint', {}).get('inflation_max', 0)) * 100:.3f}%" if "mint" in params else "N/A",
-                "Community Tax": f"{float(params.get('community_tax', 0)) * 100:.1f}%" if "community_tax" in params else "N/A",
-                "Prices": f"${prices}",
-            }
+                "Base Inflation": _to_float(params.get("base_inflation")),
+                "Inflation Max": _to_float(inflation_max),
+                "Community Tax": _to_float(params.get("community_tax")),
+                "Prices": _to_float(price),
+            })
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Error calling API: {e}")
             return {}
 
+    def fetch_block_metrics(self):
+        """Block metrics from the local block window.
+
+        The window only reports the 24h block count once it has seen a full, gapless day of blocks,
+        i.e. a day after a restart or a stall. Until then the explorer's count is used, refreshed on
+        the field's TTL, or failing that the last known value.
+        """
+        metrics = self.block_ingestor.metrics()
+        if not metrics or BLOCK_COUNT_FIELD in metrics:
+            return metrics
+
+        value, fetched_at = self.block_count_fallback
+        if time.time() - fetched_at >= ONCHAIN_METRICS[BLOCK_COUNT_FIELD]["ttl"]:
+            try:
+                count = self.injscan.api.fetch_activity().get(BLOCK_COUNT_FIELD)
+                if count is not None:
+                    value, fetched_at = count, time.time()
+                    self.block_count_fallback = (value, fetched_at)
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                logger.error(f"❌ Error fetching the 24h block count from the explorer: {e}")
+        if value is not None:
+            metrics[BLOCK_COUNT_FIELD] = value
+        return metrics
+
     def fetch_gov_params(self):
         """Fetch governance parameters from Injective using gRPC"""
         try:
-            result = subprocess.run(
-                ["grpcurl", "-plaintext", "-d", "{}", "injective-grpc.polkachu.com:14390", "cosmos.gov.v1.Query/Params"],
-                capture_output=True, text=True, check=True
-            )
-            params = json.loads(result.stdout).get("params", {})
+            params = self.grpc_client.gov_params()
+            min_deposit = params.min_deposit[0].amount if params.min_deposit else 0  # Base units
 
             return {
-                "Min Deposit": f"{float(params.get('minDeposit', [{}])[0].get('amount', 0)) / 1e18:.2f} INJ",
-                "Voting Period": f"{int(params.get('votingPeriod', '0s').replace('s', '')) // 3600} hours",
-                "Quorum": f"{float(params.get('quorum', 0)) * 100:.2f}%",
-                "Threshold": f"{float(params.get('threshold', 0)) * 100:.2f}%",
+                "Min Deposit": int(min_deposit or 0),
+                "Voting Period": params.voting_period.seconds,
+                "Quorum": float(params.quorum or 0),
+                "Threshold": float(params.threshold or 0),
             }
-        except subprocess.CalledProcessError as e:
+        except grpc.RpcError as e:
             logger.error(f"❌ Error calling gRPC: {e}")
             return {}
+        except ValueError as e:
+            logger.error(f"❌ Invalid gov params in gRPC response: {e}")
+            return {}
 
     def fetch_supply_and_staking(self):
         """Fetch total INJ supply and staking amounts"""
         try:
-            supply_data = json.loads(subprocess.run(
-                ["grpcurl", "-plaintext", "-d", '{"denom": "inj"}', "injective-grpc.polkachu.com:14390", "cosmos.bank.v1beta1.Query/SupplyOf"],
-                capture_output=True, text=True, check=True
-            ).stdout)
-
-            staking_data = json.loads(subprocess.run(
-                ["grpcurl", "-plaintext", "-d", "{}", "injective-grpc.polkachu.com:14390", "cosmos.staking.v1beta1.Query/Pool"],
-                capture_output=True, text=True, check=True
-            ).stdout)
+            supply = self.grpc_client.supply_of("inj")
+            pool = self.grpc_client.staking_pool()
 
             return {
-                "Supply Data": f"{float(supply_data['amount']['amount']) / 1e18:,.2f} INJ",
-                "BondedTokens": f"{float(staking_data['pool']['bondedTokens']) / 1e18:,.2f} INJ",
-                "NotBondedTokens": f"{float(staking_data['pool']['notBondedTokens']) / 1e18:,.2f} INJ"
+                "Supply Data": int(supply.amount),
+                "BondedTokens": int(pool.bonded_tokens),
+                "NotBondedTokens": int(pool.not_bonded_tokens)
             }
-        except subprocess.CalledProcessError as e:
+        except grpc.RpcError as e:
             logger.error(f"❌ Error calling gRPC: {e}")
             return {}
+        except ValueError as e:
+            logger.error(f"❌ Invalid supply or staking amount in gRPC response: {e}")
+            return {}
 
     def fetch_web_data(self):
-        """Fetch data from injscan.com using Selenium"""
-        def get_value(xpath, timeout=15):
-            try:
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((By.XPATH, xpath))
-                )
-                return element.text.strip().replace("\n", " ")
-            except:
-                return "Not found"
-
-        web_data = {}
-        
-        # 1. Homepage
-        self.driver.get("https://injscan.com/")
-        time.sleep(5)
-        web_data.update({
-            "Circulating Supply": get_value("//span[contains(text(), ',') and ancestor::div[contains(@class, 'inline-flex')]]"),
-            "Market Cap": get_value("//div[contains(text(), 'Market Cap')]/following-sibling::div"),
-            "Number of Assets": get_value("//div[contains(text(), 'Number of Assets')]/following-sibling::div"),
-            "Number of Wallets": get_value("//div[contains(text(), 'Number of Wallets')]/following-sibling::div"),
-            "Total Staked": get_value("//div[contains(text(), 'Total Staked')]/following-sibling::div"),
-            "Staking APR": get_value("//div[contains(text(), 'Staking APR')]/following-sibling::div"),
-            "INJ Burned": get_value("//div[contains(text(), 'INJ Burned')]/following-sibling::div"),
-        })
-
-        # 2. Transactions page
-        self.driver.get("https://injscan.com/transactions/")
-        time.sleep(7)
-        web_data.update({
-            "Total Transactions": get_value("//div[@class='text-2xl font-medium text-uiPrimary-100 leading-8']"),
-            "Transactions (Last 24h)": get_value("//div[contains(., 'Transactions (Last 24h)')]/following-sibling::div//span"),
-            "Transactions (30d)": get_value("//div[contains(., 'Transactions (30d)')]/following-sibling::div//div[@class='flex items-end gap-1 text-uiGray-200']"),
-            "TPS (Last 100 Blocks)": get_value("//div[contains(., 'TPS (Last 100 Blocks)')]/following-sibling::div//span"),
-        })
-
-        # 3. Blocks page
-        self.driver.get("https://injscan.com/blocks/")
-        time.sleep(7)
-        web_data.update({
-            "Block Height": get_value("//div[contains(., 'Block Height')]/following-sibling::div"),
-            "Block Count (Last 24h)": get_value("//div[contains(., 'Block Count (Last 24h)')]/following-sibling::div"),
-            "Block Time": get_value("//div[contains(., 'Block Time')]/following-sibling::div"),
-        })
-
-        # 4. Assets page
-        self.driver.get("https://injscan.com/assets/")
-        time.sleep(7)
-        web_data.update({
-            "Total Asset Value": f"${get_value('//*[@id=\"__nuxt\"]/main/div[2]/div/main/div/div[1]/div[1]/div/div[2]/div/div/span/span')}",
-            "Staked Asset Value (INJ)": f"${get_value('//*[@id=\"__nuxt\"]/main/div[2]/div/main/div/div[1]/div[2]/div/div[2]/span/div/span/span')}",
-            "Total On-Chain Assets": get_value('//*[@id=\"__nuxt\"]/main/div[2]/div/main/div/div[1]/div[3]/div/div[2]/span'),
-            "Smart Contracts": get_value('//*[@id=\"__nuxt\"]/main/div[2]/div/main/div/div[1]/div[4]/div/div[2]/span'),
-        })
+        """Fetch injscan.com metrics from the explorer API (or Selenium when configured)"""
+        return self.injscan.fetch()
 
-        return web_data
+    def load_onchain_data(self):
+        """Load the last saved typed on-chain snapshot, or an empty dict."""
+        if not os.path.exists(ONCHAIN_SNAPSHOT_FILE):
+            return {}
+        try:
+            with open(ONCHAIN_SNAPSHOT_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"❌ Error reading on-chain data: {e}")
+            return {}
 
     def save_onchain_data(self, data):
-        """Save on-chain data to JSON file"""
+        """Save the typed snapshot, its display rendering for the dashboard, and its history entry"""
         try:
+            with open(ONCHAIN_SNAPSHOT_FILE, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
             with open(ONCHAIN_DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            logger.info(f"✅ Data saved to {ONCHAIN_DATA_FILE}")
+                json.dump(format_snapshot(data), f, indent=4, ensure_ascii=False)
+            logger.info(f"✅ Data saved to {ONCHAIN_SNAPSHOT_FILE} and {ONCHAIN_DATA_FILE}")
         except Exception as e:
             logger.error(f"❌ Error saving on-chain data: {e}")
 
-    def generate_news(self, onchain_data):
-        """Generate news from on-chain data using OpenAI GPT"""
+        try:
+            self.history.append(data)
+        except OSError as e:
+            logger.error(f"❌ Error saving on-chain history: {e}")
+
+    def detect_changes(self):
+        """Significant metric moves since the start of each delta window.
+
+        Returns None while the history is too short to compare against, {} when nothing moved.
+        """
+        return self.history.significant_changes()
+
+    def track_governance(self):
+        """Poll the governance tracker for new proposals and status changes."""
+        return self.gov_tracker.track()
+
+    def generate_news(self, onchain_data, changes=None, gov_events=None):
+        """Generate news from a typed on-chain snapshot using OpenAI GPT.
+
+        When `changes` is given, only the changed metrics and their deltas are sent.
+        `gov_events` (from the governance tracker) are added as a separate section.
+        """
         if not os.path.exists(ONCHAIN_NEWS_PROMPT_FILE):
             logger.warning("⚠️ Prompt file not found!")
             return None
@@ -201,7 +247,15 @@ class OnchainDataService:
             "goals": " ".join(prompt_template["goals"]),
             "formatting_requirements": " ".join(prompt_template["formatting_requirements"]),
             "example_output": prompt_template["example_output"][0],
-            "onchain_data": onchain_data
+            "onchain_data": {
+                key: format_value(key, value) for key, value in onchain_data.items()
+                if not key.startswith("_") and (changes is None or key in changes)
+            },
+            **({"changes": {
+                key: {window: format_change(key, delta) for window, delta in change["deltas"].items()}
+                for key, change in changes.items()
+            }} if changes is not None else {}),
+            **({"governance_events": gov_events} if gov_events else {})
         })
 
         try:
@@ -224,18 +278,16 @@ class OnchainDataService:
             return None
 
     def __del__(self):
-        """Close the browser when the object is destroyed"""
-        self.driver.quit()
+        """Stop collector workers and close the gRPC channel when the object is destroyed"""
+        self.collector.shutdown()
+        if self.block_ingestor:
+            self.block_ingestor.stop()
+        self.grpc_client.close()
 
 if __name__ == "__main__":
     service = OnchainDataService()
-    # Fetch data from various sources
-    onchain_data = {
-        **service.fetch_injective_data(),
-        **service.fetch_gov_params(),
-        **service.fetch_supply_and_staking(),
-        **service.fetch_web_data()
-    }
+    # Fetch data from various sources concurrently
+    onchain_data = service.collect_onchain_data()
     
     # Save on-chain data to file
     service.save_onchain_data(onchain_data)
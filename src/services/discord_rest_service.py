@@ -0,0 +1,92 @@
+import time
+import threading
+from src.utils.config_loader import CONFIG
+from src.utils.http_client import get_http_client
+from src.utils.logger import setup_logger
+
+logger = setup_logger("DiscordRestService")
+
+DISCORD_API_URL = "https://discord.com/api/v10"
+DISCORD_WEBHOOK_URL = CONFIG.get("DISCORD_WEBHOOK_URL")  # Optional; used instead of the bot token when set
+SUPPRESS_EMBEDS = 1 << 2  # Message flag: no link previews
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class DiscordRestClient:
+    """Deliver messages to Discord over plain HTTPS, without a gateway connection.
+
+    Uses the shared pooled HTTP session, so after the first request each message is a single
+    POST on a kept-alive connection. Sends through the bot token by default, or through a
+    webhook when one is configured. Channel lookups are cached, and 429 responses are retried
+    after the `retry_after` Discord asks for.
+    """
+
+    def __init__(self, token=None, webhook_url=DISCORD_WEBHOOK_URL):
+        self.token = token or CONFIG.get("DISCORD_BOT_TOKEN")
+        self.webhook_url = webhook_url
+        self.http = get_http_client()
+        self.headers = {"Authorization": f"Bot {self.token}"} if self.token else {}
+        self._channels = {}  # channel_id -> channel object
+        self._lock = threading.Lock()
+
+    def _request(self, method, url, **kwargs):
+        """Send a request, honouring Discord's rate limits. Raises requests.HTTPError on failure."""
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            response = self.http.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            try:
+                retry_after = float(response.json().get("retry_after", 1))
+            except ValueError:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            logger.warning(f"[⏳] Discord rate limit hit, retrying in {retry_after:.2f}s")
+            time.sleep(retry_after)
+        response.raise_for_status()
+        return response.json() if response.content else None
+
+    def get_channel(self, channel_id):
+        """Channel object for an ID, fetched once and cached. Raises requests.HTTPError if it does not exist."""
+        channel_id = str(channel_id)
+        with self._lock:
+            channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._request("GET", f"{DISCORD_API_URL}/channels/{channel_id}", headers=self.headers)
+            with self._lock:
+                self._channels[channel_id] = channel
+        return channel
+
+    def send_message(self, channel_id, content, suppress_embeds=True):
+        """Send one message (at most 2000 characters). Returns the created message object."""
+        payload = {"content": content, "flags": SUPPRESS_EMBEDS if suppress_embeds else 0}
+        if self.webhook_url:
+            return self._request("POST", self.webhook_url, params={"wait": "true"}, json=payload)
+        self.get_channel(channel_id)
+        return self._request("POST", f"{DISCORD_API_URL}/channels/{channel_id}/messages",
+                             headers=self.headers, json=payload)
+
+    def send_messages(self, channel_id, messages, suppress_embeds=True):
+        """Send messages in order. Returns True if all were sent, False if any failed."""
+        success = True
+        for message in messages:
+            try:
+                logger.info(f"[🚀] Sending to Discord: {message[:50]}...")
+                self.send_message(channel_id, message, suppress_embeds)
+                logger.info("[✅] Successfully sent!")
+            except Exception as e:
+                logger.error(f"[❌] Error sending to Discord: {e}")
+                success = False
+        return success
+
+
+_discord_client = None
+_discord_client_lock = threading.Lock()
+
+
+def get_discord_client():
+    """Process-wide Discord REST client."""
+    global _discord_client
+    if _discord_client is None:
+        with _discord_client_lock:
+            if _discord_client is None:
+                _discord_client = DiscordRestClient()
+    return _discord_client
@@ -0,0 +1,86 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("FanoutPublisherService")
+
+DEFAULT_PUBLISH_TIMEOUT = CONFIG.get("PUBLISH_TIMEOUT", 60)  # Seconds per destination
+PUBLISH_TIMEOUTS = CONFIG.get("PUBLISH_TIMEOUTS", {})  # Per-destination overrides, e.g. {"sheets": 120}
+
+
+def format_report(report):
+    """One-line summary of a publish report, e.g. "x=ok, telegram=timeout"."""
+    return ", ".join(f"{name}={entry['status']}" for name, entry in report.items())
+
+
+class FanoutPublisher:
+    """Publish one content item to several destinations concurrently.
+
+    Each destination is a callable run on its own worker under its own timeout, so end-to-end
+    latency is that of the slowest destination rather than the sum. A failure or timeout in one
+    destination never blocks or cancels the others. Destination callables report their outcome
+    by return value: True (or any truthy value) is "ok", False is "failed" and None is "skipped"
+    (nothing to post); an exception is "failed".
+
+    A destination still running from a previous publish (after timing out) is not started
+    again until it finishes, so a hung platform never piles up threads.
+    """
+
+    def __init__(self, destinations, timeouts=None, default_timeout=DEFAULT_PUBLISH_TIMEOUT):
+        self.destinations = destinations  # name -> callable
+        self.timeouts = {**PUBLISH_TIMEOUTS, **(timeouts or {})}
+        self.default_timeout = default_timeout
+        # Two workers per destination leaves room for one abandoned call per destination
+        self.executor = ThreadPoolExecutor(max_workers=2 * len(destinations), thread_name_prefix="publish")
+        self.in_flight = {}  # name -> future
+        self._lock = threading.Lock()
+
+    def _run(self, name, args, kwargs):
+        started = time.monotonic()
+        result = self.destinations[name](*args, **kwargs)
+        return result, round(time.monotonic() - started, 3)
+
+    def publish(self, *args, names=None, **kwargs):
+        """Call every destination (or only `names`) with the same arguments and wait for all of them.
+
+        Returns {name: {"status": "ok"|"failed"|"skipped"|"timeout"|"busy", "duration": s, "error": str}}.
+        """
+        names = list(names) if names is not None else list(self.destinations)
+        start = time.monotonic()
+        futures = {}
+        with self._lock:
+            for name in names:
+                previous = self.in_flight.get(name)
+                if previous is not None and not previous.done():
+                    continue
+                futures[name] = self.in_flight[name] = self.executor.submit(self._run, name, args, kwargs)
+
+        report = {}
+        for name in sorted(names, key=lambda n: self.timeouts.get(n, self.default_timeout)):
+            timeout = self.timeouts.get(name, self.default_timeout)
+            future = futures.get(name)
+            if future is None:
+                report[name] = {"status": "busy", "error": "previous publish still running"}
+                continue
+            try:
+                result, duration = future.result(timeout=max(0.0, start + timeout - time.monotonic()))
+                if result is None:
+                    report[name] = {"status": "skipped", "duration": duration}
+                else:
+                    report[name] = {"status": "ok" if result else "failed", "duration": duration}
+            except FutureTimeoutError:
+                report[name] = {"status": "timeout", "error": f"timeout of {timeout}s exceeded"}
+            except Exception as e:
+                report[name] = {"status": "failed", "error": str(e)}
+        report = {name: report[name] for name in names}
+
+        logger.info(f"[📣] Published to {len(names)} destinations in {time.monotonic() - start:.2f}s ({format_report(report)})")
+        for name, entry in report.items():
+            if entry["status"] in ("failed", "timeout", "busy"):
+                logger.error(f"[❌] Publishing to {name} {entry['status']}: {entry.get('error', 'see service log')}")
+        return report
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
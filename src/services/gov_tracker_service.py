@@ -0,0 +1,181 @@
+import json
+import time
+import grpc
+import redis
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+from src.services.cosmos_grpc_service import CosmosGrpcClient
+
+logger = setup_logger("GovTrackerService")
+
+# cosmos.gov.v1.ProposalStatus
+PROPOSAL_STATUS = {
+    0: "unspecified",
+    1: "deposit_period",
+    2: "voting_period",
+    3: "passed",
+    4: "rejected",
+    5: "failed",
+}
+ACTIVE_STATUSES = {1, 2}
+
+PROPOSALS_PAGE_SIZE = CONFIG.get("GOV_PROPOSALS_PAGE_SIZE", 20)
+VOTING_END_NOTICE = CONFIG.get("GOV_VOTING_END_NOTICE_HOURS", 24) * 3600
+
+LAST_SEEN_KEY = "gov:last_proposal_id"
+ACTIVE_KEY = "gov:active_proposals"  # Hash: proposal id -> JSON status record
+EVENTS_KEY = "gov:events"  # List of events not yet used in a news post
+
+
+def _epoch(timestamp):
+    return timestamp.seconds + timestamp.nanos / 1e9 if timestamp.seconds else None
+
+
+def _record(proposal):
+    return {
+        "status": proposal.status,
+        "title": proposal.title,
+        "voting_end": _epoch(proposal.voting_end_time),
+    }
+
+
+class GovProposalTracker:
+    """Follow governance proposals incrementally.
+
+    Redis remembers the highest proposal id seen and a status record for every proposal still in
+    its deposit or voting period. Each poll lists proposals newest-first only until it reaches an
+    id it already knows, then re-queries just the active ones, so the cost does not grow with the
+    chain's proposal history. Detected changes are queued as events until a news post uses them.
+    """
+
+    def __init__(self, client=None, redis_client=None):
+        self.client = client or CosmosGrpcClient()
+        self.redis = redis_client or redis.Redis(host='redis', port=6379, db=0, decode_responses=True)
+
+    def _new_proposals(self, last_seen):
+        """Proposals with an id above last_seen, walking pages newest-first."""
+        found = []
+        key = b""
+        while True:
+            proposals, key = self.client.proposals(limit=PROPOSALS_PAGE_SIZE, key=key)
+            for proposal in proposals:
+                if proposal.id <= last_seen:
+                    return found
+                found.append(proposal)
+            if not key:
+                return found
+
+    def _event(self, kind, proposal_id, record, now, **extra):
+        return {
+            "type": kind,
+            "proposal_id": proposal_id,
+            "title": record["title"],
+            "status": PROPOSAL_STATUS.get(record["status"], str(record["status"])),
+            "at": now,
+            **extra,
+        }
+
+    def poll(self, now=None):
+        """Detect new proposals, status transitions and voting periods about to end.
+
+        Returns the new events, which are also appended to the pending event queue.
+        """
+        now = now or time.time()
+        events = []
+        last_seen = self.redis.get(LAST_SEEN_KEY)
+        active = {int(pid): json.loads(value) for pid, value in self.redis.hgetall(ACTIVE_KEY).items()}
+
+        new = self._new_proposals(int(last_seen) if last_seen is not None else 0)
+        bootstrap = last_seen is None
+        for proposal in new:
+            record = _record(proposal)
+            if proposal.status in ACTIVE_STATUSES:
+                active[proposal.id] = record
+            if not bootstrap:
+                # On the first run the whole backlog is "new"; only start tracking it
+                events.append(self._event("new_proposal", proposal.id, record, now))
+
+        updates, finished = {}, []
+        new_ids = {proposal.id for proposal in new}
+        for proposal_id, previous in active.items():
+            if proposal_id in new_ids:
+                record = previous
+            else:
+                try:
+                    proposal = self.client.proposal(proposal_id)
+                except grpc.RpcError as e:
+                    if e.code() != grpc.StatusCode.NOT_FOUND:
+                        raise
+                    # The chain deletes proposals whose deposit period ended without enough deposit
+                    finished.append(proposal_id)
+                    if not bootstrap:
+                        events.append(self._event("proposal_dropped", proposal_id, previous, now))
+                    continue
+                record = _record(proposal)
+                record["end_notified"] = previous.get("end_notified", False)
+                if record["status"] != previous["status"]:
+                    kind = "voting_started" if record["status"] == 2 else "status_changed"
+                    if record["status"] not in ACTIVE_STATUSES:
+                        kind = f"proposal_{PROPOSAL_STATUS.get(record['status'], 'closed')}"
+                    events.append(self._event(kind, proposal_id, record, now,
+                                              previous_status=PROPOSAL_STATUS.get(previous["status"])))
+
+            if record["status"] not in ACTIVE_STATUSES:
+                finished.append(proposal_id)
+                continue
+            if (record["status"] == 2 and record["voting_end"] and not record.get("end_notified")
+                    and 0 < record["voting_end"] - now <= VOTING_END_NOTICE):
+                record["end_notified"] = True
+                if not bootstrap:
+                    events.append(self._event("voting_ends_soon", proposal_id, record, now,
+                                              hours_left=round((record["voting_end"] - now) / 3600, 1)))
+            updates[proposal_id] = json.dumps(record)
+
+        pipe = self.redis.pipeline()
+        if new:
+            pipe.set(LAST_SEEN_KEY, max(proposal.id for proposal in new))
+        elif bootstrap:
+            pipe.set(LAST_SEEN_KEY, 0)
+        if updates:
+            pipe.hset(ACTIVE_KEY, mapping=updates)
+        if finished:
+            pipe.hdel(ACTIVE_KEY, *finished)
+        if events:
+            pipe.rpush(EVENTS_KEY, *(json.dumps(event) for event in events))
+        pipe.execute()
+
+        if events:
+            logger.info(f"[🏛️] {len(events)} governance events: {', '.join(e['type'] for e in events)}")
+        return events
+
+    def track(self):
+        """poll() with errors logged instead of raised, for use on a schedule."""
+        try:
+            return self.poll()
+        except grpc.RpcError as e:
+            logger.error(f"❌ Error querying proposals over gRPC: {e.code()}")
+        except redis.RedisError as e:
+            logger.error(f"❌ Redis error in governance tracker: {e}")
+        except Exception as e:
+            # Raising would escape schedule.run_pending() and stop the job loop
+            logger.error(f"❌ Unexpected error in governance tracker: {e}", exc_info=True)
+        return []
+
+    def pending_events(self):
+        """Events queued since the last acknowledged news post."""
+        try:
+            return [json.loads(event) for event in self.redis.lrange(EVENTS_KEY, 0, -1)]
+        except redis.RedisError as e:
+            logger.error(f"❌ Redis error reading governance events: {e}")
+            return []
+
+    def ack_events(self, count):
+        """Drop the first `count` pending events once they have been published."""
+        try:
+            self.redis.ltrim(EVENTS_KEY, count, -1)
+        except redis.RedisError as e:
+            logger.error(f"❌ Redis error trimming governance events: {e}")
+
+
+if __name__ == "__main__":
+    print(GovProposalTracker().poll())
@@ -0,0 +1,244 @@
+import time
+import threading
+import requests
+from dateutil import parser as date_parser
+from src.utils.config_loader import CONFIG
+from src.utils.http_client import get_http_client
+from src.utils.logger import setup_logger
+from src.services.onchain_metrics import fields_for_source, parse_display_value, to_base_units
+
+logger = setup_logger("InjscanCollectorService")
+
+# Injective explorer indexer (the JSON API behind injscan.com)
+EXPLORER_API_URL = CONFIG.get("INJSCAN_API_URL", "https://sentry.explorer.grpc-web.injective.network/api/explorer/v1")
+SELENIUM_FALLBACK = CONFIG.get("ONCHAIN_SELENIUM_FALLBACK", False)
+
+
+def _pick(data, *keys):
+    """Return the first present key; the gateway has served both camelCase and snake_case names."""
+    for key in keys:
+        if data.get(key) not in (None, ""):
+            return data[key]
+    return None
+
+
+def _to_int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _present(data):
+    """Drop metrics the endpoint did not return."""
+    return {key: value for key, value in data.items() if value is not None}
+
+
+class InjscanApiCollector:
+    """Read injscan metrics from the explorer's JSON endpoints, without a browser."""
+
+    def __init__(self, base_url=EXPLORER_API_URL):
+        self.base_url = base_url.rstrip("/")
+        self.http = get_http_client()
+
+    def _get(self, path, params=None):
+        response = self.http.get(f"{self.base_url}{path}", params=params, timeout=(5, 10))
+        response.raise_for_status()
+        return response.json()
+
+    def _stats(self):
+        stats = self._get("/explorer_stats")
+        return stats.get("data", stats)
+
+    def fetch_stats(self):
+        """Slow-moving chain-wide counters: supply, wallets, assets and transactions."""
+        stats = self._stats()
+        supply = _pick(stats, "injSupply", "inj_supply")  # Whole INJ
+        return _present({
+            "Circulating Supply": to_base_units(supply) if supply is not None else None,
+            "Number of Assets": _to_int(_pick(stats, "assets")),
+            "Number of Wallets": _to_int(_pick(stats, "addresses")),
+            "Total Transactions": _to_int(_pick(stats, "txsTotal", "txs_total")),
+            "Transactions (Last 24h)": _to_int(_pick(stats, "txsIn24H", "txs_in24_h", "txs_in_24h")),
+            "Transactions (30d)": _to_int(_pick(stats, "txsIn30D", "txs_in30_d", "txs_in_30d")),
+        })
+
+    def fetch_activity(self):
+        """Fast-moving block stats from the same endpoint, refreshed on their own shorter TTLs."""
+        stats = self._stats()
+        return _present({
+            "TPS (Last 100 Blocks)": _to_float(_pick(stats, "txsPs100B", "txs_ps100_b", "txs_ps_100b")),
+            "Block Count (Last 24h)": _to_int(_pick(stats, "blockCount24H", "block_count24_h", "block_count_24h")),
+        })
+
+    def fetch_blocks(self):
+        """Latest height and average block time over the most recent page of blocks."""
+        blocks = self._get("/blocks", params={"limit": 20}).get("data", [])
+        if not blocks:
+            return {}
+
+        heights = [int(block["height"]) for block in blocks]
+        # Timestamps look like "2024-03-05 10:11:12.345 +0000 UTC"
+        times = [date_parser.parse(block["timestamp"].replace(" UTC", "")).timestamp() for block in blocks]
+        span_blocks = max(heights) - min(heights)
+        block_time = (max(times) - min(times)) / span_blocks if span_blocks else None
+        return _present({
+            "Block Height": max(heights),
+            "Block Time": block_time,
+        })
+
+    def fetch_contracts(self):
+        """Total number of deployed smart contracts, from the paging total."""
+        contracts = self._get("/contracts", params={"limit": 1})
+        return _present({"Smart Contracts": _to_int(contracts.get("paging", {}).get("total"))})
+
+
+class InjscanSeleniumCollector:
+    """Scrape injscan.com display strings with headless Chrome. Only used as a fallback; the browser is closed after each run."""
+
+    ASSETS_XPATH = '//*[@id="__nuxt"]/main/div[2]/div/main/div/div[1]'
+
+    def fetch(self):
+        # Imported lazily so Selenium/Chrome stay optional
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
+        driver = webdriver.Chrome(options=options)
+
+        def get_value(xpath, timeout=15):
+            try:
+                element = WebDriverWait(driver, timeout).until(
+                    EC.presence_of_element_located((By.XPATH, xpath))
+                )
+                return element.text.strip().replace("\n", " ")
+            except Exception:
+                return "Not found"
+
+        web_data = {}
+        try:
+            # 1. Homepage
+            driver.get("https://injscan.com/")
+            time.sleep(5)
+            web_data.update({
+                "Circulating Supply": get_value("//span[contains(text(), ',') and ancestor::div[contains(@class, 'inline-flex')]]"),
+                "Market Cap": get_value("//div[contains(text(), 'Market Cap')]/following-sibling::div"),
+                "Number of Assets": get_value("//div[contains(text(), 'Number of Assets')]/following-sibling::div"),
+                "Number of Wallets": get_value("//div[contains(text(), 'Number of Wallets')]/following-sibling::div"),
+                "Total Staked": get_value("//div[contains(text(), 'Total Staked')]/following-sibling::div"),
+                "Staking APR": get_value("//div[contains(text(), 'Staking APR')]/following-sibling::div"),
+                "INJ Burned": get_value("//div[contains(text(), 'INJ Burned')]/following-sibling::div"),
+            })
+
+            # 2. Transactions page
+            driver.get("https://injscan.com/transactions/")
+            time.sleep(7)
+            web_data.update({
+                "Total Transactions": get_value("//div[@class='text-2xl font-medium text-uiPrimary-100 leading-8']"),
+                "Transactions (Last 24h)": get_value("//div[contains(., 'Transactions (Last 24h)')]/following-sibling::div//span"),
+                "Transactions (30d)": get_value("//div[contains(., 'Transactions (30d)')]/following-sibling::div//div[@class='flex items-end gap-1 text-uiGray-200']"),
+                "TPS (Last 100 Blocks)": get_value("//div[contains(., 'TPS (Last 100 Blocks)')]/following-sibling::div//span"),
+            })
+
+            # 3. Blocks page
+            driver.get("https://injscan.com/blocks/")
+            time.sleep(7)
+            web_data.update({
+                "Block Height": get_value("//div[contains(., 'Block Height')]/following-sibling::div"),
+                "Block Count (Last 24h)": get_value("//div[contains(., 'Block Count (Last 24h)')]/following-sibling::div"),
+                "Block Time": get_value("//div[contains(., 'Block Time')]/following-sibling::div"),
+            })
+
+            # 4. Assets page
+            driver.get("https://injscan.com/assets/")
+            time.sleep(7)
+            assets = self.ASSETS_XPATH
+            total_asset_value = get_value(f"{assets}/div[1]/div/div[2]/div/div/span/span")
+            staked_asset_value = get_value(f"{assets}/div[2]/div/div[2]/span/div/span/span")
+            web_data.update({
+                "Total Asset Value": f"${total_asset_value}",
+                "Staked Asset Value (INJ)": f"${staked_asset_value}",
+                "Total On-Chain Assets": get_value(f"{assets}/div[3]/div/div[2]/span"),
+                "Smart Contracts": get_value(f"{assets}/div[4]/div/div[2]/span"),
+            })
+        finally:
+            driver.quit()
+
+        return web_data
+
+
+class InjscanCollector:
+    """Explorer metrics from the JSON API, falling back to Selenium scraping when enabled.
+
+    Exposes one fetcher per explorer endpoint so each can be refreshed on its own cadence.
+    A Selenium scrape covers every endpoint at once, so its result is reused for a short while.
+    """
+
+    SCRAPE_REUSE_SECONDS = 120
+
+    def __init__(self, mode=CONFIG.get("ONCHAIN_WEB_COLLECTOR", "api"), selenium_fallback=SELENIUM_FALLBACK):
+        self.mode = mode
+        self.selenium_fallback = selenium_fallback
+        self.api = InjscanApiCollector()
+        self.selenium = InjscanSeleniumCollector()
+        self._scraped = None
+        self._scraped_at = 0
+        self._scrape_lock = threading.Lock()
+
+    def _scrape(self):
+        with self._scrape_lock:
+            if self._scraped is None or time.monotonic() - self._scraped_at > self.SCRAPE_REUSE_SECONDS:
+                self._scraped = self.selenium.fetch()
+                self._scraped_at = time.monotonic()
+            return self._scraped
+
+    def _fetch_part(self, source, api_fetch):
+        if self.mode != "selenium":
+            try:
+                data = api_fetch()
+                if data:
+                    return data
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                logger.error(f"❌ Error calling explorer API ({source}): {e}")
+            if not self.selenium_fallback:
+                return {}
+            logger.warning(f"[⚠️] Explorer API returned nothing for {source}, falling back to Selenium")
+
+        # Scraped values are display strings; type them like the API values
+        scraped = self._scrape()
+        return _present({
+            field: parse_display_value(field, scraped[field])
+            for field in fields_for_source(source) if field in scraped
+        })
+
+    def fetch_stats(self):
+        return self._fetch_part("explorer_stats", self.api.fetch_stats)
+
+    def fetch_activity(self):
+        return self._fetch_part("explorer_activity", self.api.fetch_activity)
+
+    def fetch_blocks(self):
+        return self._fetch_part("explorer_blocks", self.api.fetch_blocks)
+
+    def fetch_contracts(self):
+        return self._fetch_part("explorer_contracts", self.api.fetch_contracts)
+
+    def fetch(self):
+        return {**self.fetch_stats(), **self.fetch_activity(), **self.fetch_blocks(), **self.fetch_contracts()}
+
+
+if __name__ == "__main__":
+    print(InjscanCollector().fetch())
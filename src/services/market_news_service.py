@@ -5,6 +5,7 @@ import openai
 import requests
 from datetime import datetime
 from src.utils.config_loader import CONFIG
+from src.utils.http_client import get_http_client
 
 # Logger setup
 logger = logging.getLogger("MarketNewsService")
@@ -29,6 +30,7 @@ class MarketNewsService:
         self.coingecko_api_key = CONFIG.get("COINGECKO_API_KEY")
         self.openai_api_key = CONFIG.get("OPENAI_API_KEY")
         self.base_url = "https://pro-api.coingecko.com/api/v3"
+        self.http = get_http_client()
 
         if not self.coingecko_api_key:
             raise ValueError("❌ Missing Coingecko API Key!")
@@ -153,7 +155,7 @@ class MarketNewsService:
         headers = {"Accept": "application/json"}
         params["x_cg_pro_api_key"] = self.coingecko_api_key
         try:
-            response = requests.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
+            response = self.http.get(f"{self.base_url}{endpoint}", headers=headers, params=params, conditional=True)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
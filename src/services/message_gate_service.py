@@ -0,0 +1,86 @@
+import re
+import time
+from collections import Counter
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("MessageGateService")
+
+GATE_ALLOWED_CHANNEL_IDS = CONFIG.get("DISCORD_ALLOWED_CHANNEL_IDS", [])  # Channels where unaddressed questions are answered too
+GATE_CHANNEL_COOLDOWN = CONFIG.get("DISCORD_CHANNEL_COOLDOWN", 30)  # Seconds between answers to unaddressed messages per channel
+GATE_USER_COOLDOWN = CONFIG.get("DISCORD_USER_COOLDOWN", 3)  # Seconds between answers to one user in one channel
+GATE_LOG_EVERY = 500  # Decisions between counter summaries in the log
+MAX_TRACKED_USERS = 10000  # Cooldown entries kept before expired ones are pruned
+
+QUESTION_WORDS = {
+    "how", "what", "why", "when", "where", "which", "who", "whom", "whose", "can", "could", "should",
+    "would", "is", "are", "does", "do", "did", "will", "any", "anyone", "explain", "help",
+}
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def looks_like_question(text, keyword_pattern=None):
+    """Cheap relevance check: a question mark, a leading question word, or one of the bot's topic keywords."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < 2:
+        return False
+    if "?" in text or words[0] in QUESTION_WORDS:
+        return True
+    return bool(keyword_pattern and keyword_pattern.search(text))
+
+
+class MessageGate:
+    """Decide, before any LLM work, whether the bot should answer a chat message.
+
+    Messages addressed to the bot (DMs, mentions, replies to it) are answered, subject to a
+    short per-user cooldown. In allowlisted channels, other messages are answered only when
+    they pass the `relevance` check (by default `looks_like_question`) and the channel's
+    cooldown has passed. Everything else is dropped. Every decision is counted by reason,
+    see `stats()`.
+    """
+
+    def __init__(self, allowed_channel_ids=None, channel_cooldown=GATE_CHANNEL_COOLDOWN,
+                 user_cooldown=GATE_USER_COOLDOWN, relevance=looks_like_question):
+        ids = GATE_ALLOWED_CHANNEL_IDS if allowed_channel_ids is None else allowed_channel_ids
+        self.allowed_channel_ids = {str(channel_id) for channel_id in ids}
+        self.channel_cooldown = channel_cooldown
+        self.user_cooldown = user_cooldown
+        self.relevance = relevance
+        self.channel_last = {}  # channel_id -> time of the last unaddressed answer
+        self.user_last = {}  # (channel_id, user_id) -> time of the last answer
+        self.counters = Counter()
+
+    def _decide(self, channel_id, user_id, text, is_dm, is_mention, is_reply, now):
+        if not text:
+            return False, "empty"
+        if is_dm or is_mention or is_reply:
+            if now - self.user_last.get((channel_id, user_id), float("-inf")) < self.user_cooldown:
+                return False, "user_cooldown"
+            self.user_last[(channel_id, user_id)] = now
+            return True, "dm" if is_dm else "mention" if is_mention else "reply"
+        if channel_id not in self.allowed_channel_ids:
+            return False, "not_addressed"
+        if not self.relevance(text):
+            return False, "not_relevant"
+        if now - self.channel_last.get(channel_id, float("-inf")) < self.channel_cooldown:
+            return False, "channel_cooldown"
+        self.channel_last[channel_id] = now
+        self.user_last[(channel_id, user_id)] = now
+        return True, "allowlisted_channel"
+
+    def check(self, channel_id, user_id, text, is_dm=False, is_mention=False, is_reply=False, now=None):
+        """(accepted, reason) for one message; `text` is the message without the bot's mention."""
+        channel_id = str(channel_id)
+        accepted, reason = self._decide(channel_id, user_id, text.strip(), is_dm, is_mention, is_reply,
+                                        time.monotonic() if now is None else now)
+        self.counters[f"{'accepted' if accepted else 'rejected'}:{reason}"] += 1
+        if len(self.user_last) > MAX_TRACKED_USERS:
+            cutoff = max(self.user_last.values()) - self.user_cooldown
+            self.user_last = {key: last for key, last in self.user_last.items() if last > cutoff}
+        total = sum(self.counters.values())
+        if total % GATE_LOG_EVERY == 0:
+            logger.info(f"[🚦] Message gate after {total} messages: {dict(self.counters)}")
+        return accepted, reason
+
+    def stats(self):
+        return dict(self.counters)
@@ -4,6 +4,7 @@ import openai
 import datetime
 from src.utils.config_loader import CONFIG
 from src.utils.logger import setup_logger
+from src.services.dapp_trending_service import load_trending_dapps
 
 logger = setup_logger("NewsGenerationService")
 
@@ -67,6 +68,17 @@ class NewsGenerationService:
             lines = f.readlines()
         return "".join(lines[1:]).strip()
 
+    def format_trending_dapps(self):
+        """Section listing dapps whose posting spiked in the last closed hour, or "" when none."""
+        trending = load_trending_dapps()
+        if not trending:
+            return ""
+        lines = [
+            f"- {dapp['name']}: {dapp['posts']} posts this hour vs {dapp['baseline_mean']:.1f}/hour usual (z={dapp['z_score']})"
+            for dapp in trending
+        ]
+        return "\n\n### 🔥 Trending Dapps (unusual posting activity):\n" + "\n".join(lines)
+
     def build_prompt(self, news_data, is_daily_recap=False):
         prompt_data = self.daily_recap_prompt if is_daily_recap else self.news_prompt
         if not prompt_data:
@@ -150,7 +162,7 @@ class NewsGenerationService:
                 f.write("")  
             return
         
-        full_prompt = self.build_prompt(transformed_tweets)
+        full_prompt = self.build_prompt(transformed_tweets + self.format_trending_dapps())
         try:
             logger.info("[🔍] Sending request to OpenAI to generate news...")
             response = openai.chat.completions.create(
@@ -0,0 +1,155 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+from src.services.onchain_metrics import DEFAULT_METRIC_TTL
+
+logger = setup_logger("OnchainCollectorService")
+
+DEFAULT_SOURCE_DEADLINE = CONFIG.get("ONCHAIN_SOURCE_DEADLINE", 20)  # Seconds
+# Per-source overrides. The explorer sources can fall back to Selenium, whose page loads alone sleep 26s
+SOURCE_DEADLINES = CONFIG.get("ONCHAIN_SOURCE_DEADLINES", {
+    "explorer_stats": 60,
+    "explorer_activity": 60,
+    "explorer_blocks": 60,
+    "explorer_contracts": 60,
+})
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class OnchainCollector:
+    """Run on-chain data sources concurrently, each under its own deadline, and merge partial results.
+
+    With a metric catalogue (field -> {"source", "ttl"}), only sources that own an expired field
+    are called; every other field is served from cache. The snapshot carries a `_freshness`
+    timestamp per field and a `_sources` report per source.
+
+    A source that fails or misses its deadline is served from its last good result (marked
+    "stale") or left out (marked "missing"). A source still running from a previous cycle is
+    not started again, so a hung upstream never piles up threads.
+    """
+
+    def __init__(self, sources, catalogue=None, deadlines=None, default_deadline=DEFAULT_SOURCE_DEADLINE):
+        self.sources = sources  # name -> callable returning a dict
+        self.catalogue = catalogue or {}
+        self.deadlines = {**SOURCE_DEADLINES, **(deadlines or {})}
+        self.default_deadline = default_deadline
+        # Two workers per source leaves room for one abandoned call per source
+        self.executor = ThreadPoolExecutor(max_workers=2 * len(sources), thread_name_prefix="onchain")
+        self.last_good = {}  # name -> (values, updated_at epoch)
+        self.field_updated = {}  # field -> epoch of the last successful refresh
+        self.in_flight = {}  # name -> future
+        self._lock = threading.Lock()
+
+    def seed(self, snapshot):
+        """Seed cached values from a previously saved snapshot so restarts keep fresh fields."""
+        freshness = snapshot.get("_freshness", {})
+        for name, status in snapshot.get("_sources", {}).items():
+            values = {key: snapshot[key] for key in status.get("fields", []) if key in snapshot}
+            if name not in self.sources or not values or not status.get("updated_at"):
+                continue
+            self.last_good[name] = (values, datetime.fromisoformat(status["updated_at"]).timestamp())
+            for field in values:
+                if field in freshness:
+                    self.field_updated[field] = datetime.fromisoformat(freshness[field]).timestamp()
+
+    def _ttl(self, field):
+        return self.catalogue.get(field, {}).get("ttl", DEFAULT_METRIC_TTL)
+
+    def expired_sources(self, now=None):
+        """Sources with no cached data yet, or owning at least one field past its TTL."""
+        now = now or time.time()
+        expired = []
+        for name in self.sources:
+            if name not in self.last_good:
+                expired.append(name)
+                continue
+            # Only fields the source actually returns; catalogue entries it never serves must not pin it as expired
+            fields = self.last_good[name][0]
+            if any(now - self.field_updated.get(field, 0) >= self._ttl(field) for field in fields):
+                expired.append(name)
+        return expired
+
+    def _run(self, name):
+        started = time.monotonic()
+        values = self.sources[name]()
+        return values, round(time.monotonic() - started, 3)
+
+    def _submit(self, names):
+        started = {}
+        with self._lock:
+            for name in names:
+                previous = self.in_flight.get(name)
+                if previous is not None and not previous.done():
+                    logger.warning(f"[⏳] Source '{name}' is still running from the previous cycle, skipping")
+                    continue
+                self.in_flight[name] = self.executor.submit(self._run, name)
+                started[name] = self.in_flight[name]
+        return started
+
+    def collect(self, names=None):
+        """Refresh the given sources (by default those with expired fields) and merge them with the cache.
+
+        Returns the merged snapshot with `_sources` and `_freshness` reports.
+        """
+        names = list(names) if names is not None else self.expired_sources()
+        start = time.monotonic()
+        futures = self._submit(names)
+
+        report = {}
+        # Wait in deadline order so the shortest deadlines are checked first
+        for name in sorted(names, key=lambda n: self.deadlines.get(n, self.default_deadline)):
+            deadline = self.deadlines.get(name, self.default_deadline)
+            future = futures.get(name)
+            values, duration, error = None, None, None
+
+            if future is None:
+                error = "still running"
+            else:
+                try:
+                    values, duration = future.result(timeout=max(0.0, start + deadline - time.monotonic()))
+                    if not values:
+                        error = "empty result"
+                except FutureTimeoutError:
+                    error = f"deadline of {deadline}s exceeded"
+                except Exception as e:
+                    error = str(e)
+
+            if values:
+                updated_at = time.time()
+                self.last_good[name] = (values, updated_at)
+                for field in values:
+                    self.field_updated[field] = updated_at
+                report[name] = {"status": "ok", "updated_at": _iso(updated_at), "duration": duration, "fields": list(values)}
+            elif name in self.last_good:
+                values, updated_at = self.last_good[name]
+                report[name] = {"status": "stale", "updated_at": _iso(updated_at), "error": error, "fields": list(values)}
+                logger.warning(f"[⚠️] Source '{name}' failed ({error}), serving data from {_iso(updated_at)}")
+            else:
+                report[name] = {"status": "missing", "updated_at": None, "error": error, "fields": []}
+                logger.warning(f"[⚠️] Source '{name}' failed ({error}), no previous data available")
+
+        data = {}
+        for name in self.sources:
+            if name not in self.last_good:
+                report.setdefault(name, {"status": "missing", "updated_at": None, "fields": []})
+                continue
+            values, updated_at = self.last_good[name]
+            report.setdefault(name, {"status": "cached", "updated_at": _iso(updated_at), "fields": list(values)})
+        # Oldest first, so a field served by several sources keeps the most recently refreshed value
+        for name, (values, updated_at) in sorted(self.last_good.items(), key=lambda item: item[1][1]):
+            if name in self.sources:
+                data.update(values)
+
+        data["_sources"] = report
+        data["_freshness"] = {field: _iso(self.field_updated[field]) for field in data if field in self.field_updated}
+        logger.info(f"[✅] Refreshed {len(names)}/{len(self.sources)} sources in {time.monotonic() - start:.2f}s")
+        return data
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
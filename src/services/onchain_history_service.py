@@ -0,0 +1,147 @@
+import bisect
+import json
+import os
+import threading
+import time
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("OnchainHistoryService")
+
+DATA_DIR = "data"
+HISTORY_FILE = os.path.join(DATA_DIR, "onchain_history.jsonl")
+
+HISTORY_RETENTION_DAYS = CONFIG.get("ONCHAIN_HISTORY_RETENTION_DAYS", 35)
+HISTORY_INTERVAL = CONFIG.get("ONCHAIN_HISTORY_INTERVAL", 300)  # Minimum seconds between stored snapshots
+DELTA_WINDOWS = CONFIG.get("ONCHAIN_DELTA_WINDOWS", {"12h": 12 * 3600, "24h": 24 * 3600, "7d": 7 * 24 * 3600})
+DEFAULT_THRESHOLD_PCT = CONFIG.get("ONCHAIN_DELTA_THRESHOLD_PCT", 2.0)
+
+# Significance thresholds in percent, per field. Slow-moving totals need a smaller move to matter.
+DELTA_THRESHOLDS = {
+    "Supply Data": 0.1,
+    "Circulating Supply": 0.1,
+    "BondedTokens": 0.5,
+    "NotBondedTokens": 5.0,
+    "Number of Wallets": 0.5,
+    "Number of Assets": 1.0,
+    "Smart Contracts": 1.0,
+    "Prices": 5.0,
+    "TPS (Last 100 Blocks)": 25.0,
+    "Transactions (Last 24h)": 15.0,
+    "Block Time": 10.0,
+    **CONFIG.get("ONCHAIN_DELTA_THRESHOLDS", {}),
+}
+# Counters that only grow; their raw change is noise unless the rate moves
+IGNORED_FIELDS = {"Block Height", "Total Transactions", "Block Count (Last 24h)", "Transactions (30d)"}
+
+class OnchainHistoryStore:
+    """Append-only history of numeric on-chain snapshots (raw units) with a delta engine over time windows."""
+
+    def __init__(self, path=HISTORY_FILE, retention_days=HISTORY_RETENTION_DAYS, interval=HISTORY_INTERVAL):
+        self.path = path
+        self.retention = retention_days * 86400
+        self.interval = interval
+        self.timestamps = []
+        self.records = []
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load history from disk, skipping corrupt lines and anything past retention."""
+        if not os.path.exists(self.path):
+            return
+        cutoff = time.time() - self.retention
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("ts", 0) >= cutoff:
+                    self.timestamps.append(record["ts"])
+                    self.records.append(record["values"])
+        logger.info(f"[📋] Loaded {len(self.records)} on-chain history snapshots")
+
+    def append(self, snapshot, now=None):
+        """Store the numeric fields of a snapshot, at most once per interval."""
+        now = now or time.time()
+        # Snapshots are typed (see onchain_metrics), so numeric fields are stored as-is
+        values = {
+            field: value for field, value in snapshot.items()
+            if not field.startswith("_") and isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+        if not values:
+            return False
+
+        with self._lock:
+            if self.timestamps and now - self.timestamps[-1] < self.interval:
+                return False
+            self.timestamps.append(now)
+            self.records.append(values)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"ts": now, "values": values}) + "\n")
+            self._prune(now)
+        return True
+
+    def _prune(self, now):
+        """Drop expired snapshots; the file is rewritten at most once a day."""
+        cutoff = now - self.retention
+        if not self.timestamps or self.timestamps[0] >= cutoff - 86400:
+            return
+        index = bisect.bisect_left(self.timestamps, cutoff)
+        self.timestamps = self.timestamps[index:]
+        self.records = self.records[index:]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for ts, values in zip(self.timestamps, self.records):
+                f.write(json.dumps({"ts": ts, "values": values}) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def at(self, timestamp):
+        """Latest snapshot taken at or before the timestamp, or None."""
+        index = bisect.bisect_right(self.timestamps, timestamp) - 1
+        return self.records[index] if index >= 0 else None
+
+    def compute_changes(self, windows=None, thresholds=None, now=None):
+        """Compare the latest snapshot with the one at the start of each window.
+
+        Returns {field: {"current": v, "deltas": {window: {...}}, "significant": bool}}, or None when
+        the history does not reach back far enough for any window yet.
+        """
+        windows = windows or DELTA_WINDOWS
+        thresholds = {**DELTA_THRESHOLDS, **(thresholds or {})}
+        now = now or time.time()
+        if not self.records:
+            return None
+
+        latest = self.records[-1]
+        baselines = {name: self.at(now - seconds) for name, seconds in windows.items()}
+        if not any(baselines.values()):
+            return None
+
+        changes = {}
+        for field, current in latest.items():
+            if field in IGNORED_FIELDS:
+                continue
+            deltas = {}
+            significant = False
+            for name, baseline in baselines.items():
+                if not baseline or field not in baseline:
+                    continue
+                previous = baseline[field]
+                change = current - previous
+                change_pct = (change / previous * 100) if previous else None
+                deltas[name] = {"previous": previous, "change": change, "change_pct": change_pct}
+                threshold = thresholds.get(field, DEFAULT_THRESHOLD_PCT)
+                if change_pct is not None and abs(change_pct) >= threshold:
+                    significant = True
+            if deltas:
+                changes[field] = {"current": current, "deltas": deltas, "significant": significant}
+        return changes
+
+    def significant_changes(self, windows=None, thresholds=None, now=None):
+        """Only the fields whose move crossed their threshold in at least one window (None if no baseline)."""
+        changes = self.compute_changes(windows, thresholds, now)
+        if changes is None:
+            return None
+        return {field: change for field, change in changes.items() if change["significant"]}
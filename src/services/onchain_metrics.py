@@ -0,0 +1,163 @@
+import re
+from decimal import Decimal, InvalidOperation
+from src.utils.config_loader import CONFIG
+
+INJ_DECIMALS = 18
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+DEFAULT_METRIC_TTL = CONFIG.get("ONCHAIN_DEFAULT_METRIC_TTL", 5 * MINUTE)
+
+# Metric catalogue: field -> source that produces it, how long a value stays fresh (seconds)
+# and how its raw value is typed. A source is only called when at least one of its fields has expired.
+#
+# Raw snapshot values by kind:
+#   inj      -> int, base units (1 INJ = 10**18)
+#   ratio    -> float fraction (0.02 == 2%)
+#   usd      -> float dollars
+#   count    -> int
+#   number   -> float
+#   duration -> float seconds
+#   text     -> str
+ONCHAIN_METRICS = {
+    # s.directory chain registry
+    "Pretty Name": {"source": "injective", "ttl": DAY, "kind": "text"},
+    "Chain ID": {"source": "injective", "ttl": DAY, "kind": "text"},
+    "Status": {"source": "injective", "ttl": DAY, "kind": "text"},
+    "Symbol": {"source": "injective", "ttl": DAY, "kind": "text"},
+    "Base Inflation": {"source": "injective", "ttl": 6 * HOUR, "kind": "ratio", "decimals": 3},
+    "Inflation Max": {"source": "injective", "ttl": 6 * HOUR, "kind": "ratio", "decimals": 3},
+    "Community Tax": {"source": "injective", "ttl": 6 * HOUR, "kind": "ratio", "decimals": 1},
+    "Prices": {"source": "injective", "ttl": 5 * MINUTE, "kind": "usd", "decimals": 2},
+
+    # gRPC gov params
+    "Min Deposit": {"source": "gov", "ttl": DAY, "kind": "inj", "decimals": 2},
+    "Voting Period": {"source": "gov", "ttl": DAY, "kind": "duration", "unit": "hours"},
+    "Quorum": {"source": "gov", "ttl": DAY, "kind": "ratio", "decimals": 2},
+    "Threshold": {"source": "gov", "ttl": DAY, "kind": "ratio", "decimals": 2},
+
+    # gRPC bank supply and staking pool
+    "Supply Data": {"source": "supply", "ttl": 15 * MINUTE, "kind": "inj", "decimals": 2},
+    "BondedTokens": {"source": "supply", "ttl": 15 * MINUTE, "kind": "inj", "decimals": 2},
+    "NotBondedTokens": {"source": "supply", "ttl": 15 * MINUTE, "kind": "inj", "decimals": 2},
+
+    # Explorer stats
+    "Circulating Supply": {"source": "explorer_stats", "ttl": 15 * MINUTE, "kind": "inj", "decimals": 2},
+    "Number of Assets": {"source": "explorer_stats", "ttl": HOUR, "kind": "count"},
+    "Number of Wallets": {"source": "explorer_stats", "ttl": HOUR, "kind": "count"},
+    "Total Transactions": {"source": "explorer_stats", "ttl": 5 * MINUTE, "kind": "count"},
+    "Transactions (Last 24h)": {"source": "explorer_stats", "ttl": 5 * MINUTE, "kind": "count"},
+    "Transactions (30d)": {"source": "explorer_stats", "ttl": HOUR, "kind": "count"},
+    # Only available from the Selenium fallback
+    "Market Cap": {"source": "explorer_stats", "ttl": 15 * MINUTE, "kind": "usd", "decimals": 0},
+    "Total Staked": {"source": "explorer_stats", "ttl": 15 * MINUTE, "kind": "inj", "decimals": 0},
+    "Staking APR": {"source": "explorer_stats", "ttl": HOUR, "kind": "ratio", "decimals": 2},
+    "INJ Burned": {"source": "explorer_stats", "ttl": HOUR, "kind": "inj", "decimals": 0},
+    "Total Asset Value": {"source": "explorer_stats", "ttl": HOUR, "kind": "usd", "decimals": 0},
+    "Staked Asset Value (INJ)": {"source": "explorer_stats", "ttl": HOUR, "kind": "usd", "decimals": 0},
+    "Total On-Chain Assets": {"source": "explorer_stats", "ttl": HOUR, "kind": "count"},
+
+    # Explorer stats that move every block, kept in their own source so they do not drag the
+    # slower fields above into a refetch every minute
+    "TPS (Last 100 Blocks)": {"source": "explorer_activity", "ttl": MINUTE, "kind": "number", "decimals": 2},
+    "Block Count (Last 24h)": {"source": "explorer_activity", "ttl": 5 * MINUTE, "kind": "count"},
+
+    # Explorer blocks. With ONCHAIN_BLOCK_INGEST the "blocks" source computes these and the two
+    # explorer_activity fields from the chain's own block stream instead (see block_ingest_service)
+    "Block Height": {"source": "explorer_blocks", "ttl": MINUTE, "kind": "count"},
+    "Block Time": {"source": "explorer_blocks", "ttl": MINUTE, "kind": "duration", "unit": "s", "decimals": 2},
+
+    # Explorer contracts
+    "Smart Contracts": {"source": "explorer_contracts", "ttl": HOUR, "kind": "count"},
+}
+
+# Per-field TTL overrides from settings.json, e.g. {"Prices": 120}
+for _field, _ttl in CONFIG.get("ONCHAIN_METRIC_TTLS", {}).items():
+    if _field in ONCHAIN_METRICS:
+        ONCHAIN_METRICS[_field]["ttl"] = _ttl
+
+
+def metric_ttl(field):
+    return ONCHAIN_METRICS.get(field, {}).get("ttl", DEFAULT_METRIC_TTL)
+
+
+def fields_for_source(source):
+    return [field for field, spec in ONCHAIN_METRICS.items() if spec["source"] == source]
+
+
+def to_base_units(amount, decimals=INJ_DECIMALS):
+    """Convert a whole-token amount (str/float/Decimal) into integer base units."""
+    try:
+        return int(Decimal(str(amount)) * (10 ** decimals))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def format_value(field, value):
+    """Render a raw typed value for prompts and the dashboard."""
+    if value is None:
+        return "N/A"
+    spec = ONCHAIN_METRICS.get(field, {})
+    kind = spec.get("kind", "text")
+    decimals = spec.get("decimals", 0)
+
+    if kind == "inj":
+        return f"{Decimal(value) / (10 ** INJ_DECIMALS):,.{decimals}f} INJ"
+    if kind == "ratio":
+        return f"{value * 100:.{decimals}f}%"
+    if kind == "usd":
+        return f"${value:,.{decimals}f}"
+    if kind == "count":
+        return f"{int(value):,}"
+    if kind == "number":
+        return f"{value:,.{decimals}f}"
+    if kind == "duration":
+        if spec.get("unit") == "hours":
+            return f"{int(value // 3600)} hours"
+        return f"{value:.{decimals}f}s"
+    return str(value)
+
+
+def format_snapshot(snapshot):
+    """Display copy of a raw snapshot; metadata keys (prefixed with _) are passed through."""
+    return {
+        field: value if field.startswith("_") else format_value(field, value)
+        for field, value in snapshot.items()
+    }
+
+
+def format_change(field, change):
+    """Render one delta entry ({"previous", "change", "change_pct"}) in display units."""
+    spec = ONCHAIN_METRICS.get(field, {})
+    rendered = {"previous": format_value(field, change["previous"])}
+    if spec.get("kind") in ("inj", "count"):
+        delta = int(change["change"])
+    else:
+        delta = change["change"]
+    sign = "-" if delta < 0 else "+"
+    rendered["change"] = sign + format_value(field, abs(delta))
+    if change.get("change_pct") is not None:
+        rendered["change_pct"] = f"{change['change_pct']:+.2f}%"
+    return rendered
+
+
+_DISPLAY_NUMBER_RE = re.compile(r"^\s*\$?\s*(-?\d[\d,]*(?:\.\d+)?)\s*(%|[A-Za-z]*)\s*$")
+
+
+def parse_display_value(field, text):
+    """Parse a scraped display string (Selenium fallback) into the field's raw type, or None."""
+    kind = ONCHAIN_METRICS.get(field, {}).get("kind", "text")
+    if kind == "text":
+        return text
+    match = _DISPLAY_NUMBER_RE.match(text or "")
+    if not match:
+        return None
+    number = match.group(1).replace(",", "")
+    if kind == "inj":
+        return to_base_units(number)
+    if kind == "count":
+        return int(Decimal(number))
+    if kind == "ratio":
+        return float(number) / 100 if match.group(2) == "%" else float(number)
+    return float(number)
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import random
+import socket
+import time
+import redis
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("OutboxService")
+
+OUTBOX_ENABLED = CONFIG.get("OUTBOX_ENABLED", False)
+STREAM_KEY = "outbox:posts"
+DEAD_LETTER_KEY = "outbox:dead"
+RETRY_KEY = "outbox:retry"  # Sorted set: job JSON scored by the time it is due again
+JOB_KEY = "outbox:job:{key}"  # Marker per idempotency key, set when a job is first enqueued
+DELIVERED_KEY = "outbox:delivered:{key}"  # Hash: destination, or "destination:step" per message -> delivery time
+GROUP = "delivery"
+
+MAX_ATTEMPTS = CONFIG.get("OUTBOX_MAX_ATTEMPTS", 5)
+BACKOFF_BASE = CONFIG.get("OUTBOX_BACKOFF_BASE", 30)  # Seconds, doubled on each attempt
+BACKOFF_MAX = CONFIG.get("OUTBOX_BACKOFF_MAX", 1800)
+CLAIM_IDLE_MS = CONFIG.get("OUTBOX_CLAIM_IDLE_SECONDS", 600) * 1000  # Jobs left by a dead worker are taken over after this
+DEDUPE_TTL = 7 * 24 * 3600
+
+
+def idempotency_key(kind, content):
+    """Stable key for a post: the same content for the same kind is only ever enqueued once."""
+    return hashlib.sha256(f"{kind}\n{content}".encode("utf-8")).hexdigest()
+
+
+class Outbox:
+    """Durable queue of post jobs on a Redis stream.
+
+    Producers enqueue (kind, content) with a content-hash idempotency key; delivery workers in
+    the "delivery" consumer group read jobs, and every destination a job reaches is recorded so
+    retries only go to the destinations that are still missing. Within a destination, every
+    message sent is recorded too (see DeliveryProgress), so a post that failed halfway resumes
+    after the last message that went out.
+    """
+
+    def __init__(self, redis_client=None):
+        self.redis = redis_client or redis.Redis(host='redis', port=6379, db=0, decode_responses=True)
+
+    def ensure_group(self):
+        try:
+            self.redis.xgroup_create(STREAM_KEY, GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def enqueue(self, kind, content, destinations=None):
+        """Queue content for delivery. Returns the idempotency key, or None if it was already queued."""
+        key = idempotency_key(kind, content)
+        if not self.redis.set(JOB_KEY.format(key=key), int(time.time()), nx=True, ex=DEDUPE_TTL):
+            logger.info(f"[📭] Outbox already has {kind} job {key[:12]}, not enqueuing again")
+            return None
+        job = {"key": key, "kind": kind, "content": content, "attempt": 0}
+        if destinations:
+            job["destinations"] = json.dumps(list(destinations))
+        self.redis.xadd(STREAM_KEY, job)
+        logger.info(f"[📬] Enqueued {kind} job {key[:12]}")
+        return key
+
+    def delivered(self, key):
+        return set(self.redis.hkeys(DELIVERED_KEY.format(key=key)))
+
+    def mark_delivered(self, key, destination):
+        pipe = self.redis.pipeline()
+        pipe.hset(DELIVERED_KEY.format(key=key), destination, int(time.time()))
+        pipe.expire(DELIVERED_KEY.format(key=key), DEDUPE_TTL)
+        pipe.execute()
+
+    def schedule_retry(self, job, delay):
+        self.redis.zadd(RETRY_KEY, {json.dumps(job): time.time() + delay})
+
+    def requeue_due(self, now=None):
+        """Move retries whose backoff has elapsed back onto the stream. Returns how many moved."""
+        now = now or time.time()
+        moved = 0
+        for payload in self.redis.zrangebyscore(RETRY_KEY, 0, now, start=0, num=100):
+            # ZREM decides which worker owns the retry when several run this concurrently
+            if self.redis.zrem(RETRY_KEY, payload):
+                self.redis.xadd(STREAM_KEY, json.loads(payload))
+                moved += 1
+        return moved
+
+    def dead_letter(self, job, error):
+        self.redis.xadd(DEAD_LETTER_KEY, {**job, "error": error, "failed_at": int(time.time())})
+        logger.error(f"[☠️] Outbox job {job['key'][:12]} ({job['kind']}) dead-lettered: {error}")
+
+
+class DeliveryProgress:
+    """The messages of one job one destination has already received, so retries skip them.
+
+    Deliverers call `done(step)` before sending a message and `mark(step)` once it went out.
+    A step is any string stable across retries of the same content, e.g. the message's index.
+    """
+
+    def __init__(self, outbox, key, destination, delivered=()):
+        self.outbox = outbox
+        self.key = key
+        self.destination = destination
+        prefix = f"{destination}:"
+        self.sent = {entry[len(prefix):] for entry in delivered if entry.startswith(prefix)}
+
+    def done(self, step):
+        return str(step) in self.sent
+
+    def mark(self, step):
+        self.outbox.mark_delivered(self.key, f"{self.destination}:{step}")
+        self.sent.add(str(step))
+
+
+class OutboxWorker:
+    """Consume outbox jobs and deliver them to every destination of their kind.
+
+    `deliverers` maps kind -> {destination: callable(content, progress)}; callables return True
+    when delivered, False on failure and None when there was nothing to send (treated as done),
+    and record each message they send on `progress` (a DeliveryProgress). Jobs of a kind without
+    deliverers are dead-lettered.
+    Several workers can run side by side: the consumer group hands each job to one of them,
+    and jobs held by a worker that died are claimed by the others after CLAIM_IDLE_MS.
+    """
+
+    def __init__(self, outbox, deliverers, consumer=None, block_ms=5000):
+        self.outbox = outbox
+        self.deliverers = deliverers
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.block_ms = block_ms
+        self.outbox.ensure_group()
+
+    def _backoff(self, attempt):
+        return random.uniform(0.5, 1.0) * min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+
+    def process(self, message_id, job):
+        """Deliver one job to the destinations it has not reached yet, then ack it."""
+        key = job["key"]
+        destinations = self.deliverers.get(job["kind"])
+        if destinations is None:
+            self.outbox.dead_letter(job, f"unknown job kind {job['kind']!r}")
+            self._ack(message_id)
+            return
+        wanted = json.loads(job["destinations"]) if job.get("destinations") else list(destinations)
+        delivered = self.outbox.delivered(key)
+        pending = [name for name in wanted if name not in delivered]
+
+        errors = {}
+        for name in pending:
+            deliver = destinations.get(name)
+            if deliver is None:
+                errors[name] = "no deliverer configured"
+                continue
+            try:
+                result = deliver(job["content"], DeliveryProgress(self.outbox, key, name, delivered))
+            except Exception as e:
+                result, errors[name] = False, str(e)
+            if result is False:
+                errors.setdefault(name, "delivery failed")
+            else:
+                self.outbox.mark_delivered(key, name)
+
+        attempt = int(job.get("attempt", 0)) + 1
+        if errors:
+            summary = "; ".join(f"{name}: {error}" for name, error in errors.items())
+            if attempt >= MAX_ATTEMPTS:
+                self.outbox.dead_letter({**job, "attempt": attempt}, summary)
+            else:
+                delay = self._backoff(attempt)
+                self.outbox.schedule_retry({**job, "attempt": attempt}, delay)
+                logger.warning(f"[🔁] Job {key[:12]} attempt {attempt} failed ({summary}), retrying in {delay:.0f}s")
+        else:
+            logger.info(f"[✅] Job {key[:12]} ({job['kind']}) delivered to {', '.join(pending) or 'nothing new'}")
+        # Acked in every case: retries go through the retry set, failures through the dead-letter stream
+        self._ack(message_id)
+
+    def _ack(self, message_id):
+        self.outbox.redis.xack(STREAM_KEY, GROUP, message_id)
+        self.outbox.redis.xdel(STREAM_KEY, message_id)
+
+    def _claim_stale(self):
+        try:
+            _, claimed, *_ = self.outbox.redis.xautoclaim(STREAM_KEY, GROUP, self.consumer, CLAIM_IDLE_MS, "0-0", count=10)
+        except redis.ResponseError:
+            return []
+        return claimed
+
+    def run_once(self):
+        """Requeue due retries, take over abandoned jobs and process one batch. Returns jobs processed."""
+        self.outbox.requeue_due()
+        messages = self._claim_stale()
+        if not messages:
+            response = self.outbox.redis.xreadgroup(GROUP, self.consumer, {STREAM_KEY: ">"}, count=10, block=self.block_ms)
+            messages = response[0][1] if response else []
+        for message_id, job in messages:
+            if job:  # Entries deleted while pending come back empty
+                self.process(message_id, job)
+        return len(messages)
+
+    def run(self):
+        logger.info(f"[🚚] Outbox worker {self.consumer} started")
+        while True:
+            try:
+                self.run_once()
+            except redis.RedisError as e:
+                logger.error(f"[❌] Redis error in outbox worker: {e}")
+                time.sleep(5)
@@ -1,80 +1,79 @@
-import discord
 import os
-import asyncio
 from src.utils.config_loader import CONFIG
 from src.utils.logger import setup_logger
+from src.utils.message_packer import pack_for, split_items
+from src.utils.rate_limiter import KeyedRateLimiter, TokenBucket
+from src.services.discord_rest_service import get_discord_client
+from src.services.broadcast_service import Broadcaster, broadcast_succeeded, destination_list
 
 logger = setup_logger("PostToDiscordService")
 
 GENERATED_NEWS_FILE = "data/generated_news.txt"
 DAILY_NEWS_FILE = "data/daily_generate_news.txt"  # File for Daily Recap
 
-class PostToDiscordService:
-    """Service to post news to Discord without running a persistent bot."""
-
-    def __init__(self):
-        self.token = CONFIG["DISCORD_BOT_TOKEN"]
-        self.channel_id = int(CONFIG["DISCORD_CHANNEL_ID"])
+# Discord allows a bot 50 requests per second overall and 5 messages per 5 seconds in a channel.
+# Shared by every sender in the process; 429s that still happen are retried by the REST client.
+GLOBAL_LIMITER = TokenBucket(CONFIG.get("DISCORD_RATE_LIMIT", 50))
+CHANNEL_LIMITER = KeyedRateLimiter(CONFIG.get("DISCORD_CHANNEL_RATE_LIMIT", 1), capacity=5)
 
-    def load_news(self, file_path):
-        """Load content from news or Daily Recap file and ensure data is returned as a list of strings."""
-        if not os.path.exists(file_path):
-            logger.warning(f"[⚠️] File {file_path} not found!")
-            return []
+class PostToDiscordService:
+    """Service to post news to Discord over the REST API, without running a bot or gateway connection.
+
+    News is broadcast to every channel in DISCORD_CHANNEL_IDS concurrently, within Discord's global
+    and per-channel rate limits. With a webhook configured there is only the webhook's channel.
+    """
+
+    def __init__(self, channel_ids=None):
+        self.discord = get_discord_client()
+        channel_ids = channel_ids or destination_list("DISCORD_CHANNEL_IDS", "DISCORD_CHANNEL_ID")
+        self.channel_ids = [int(channel_id) for channel_id in channel_ids]
+        if self.discord.webhook_url:
+            self.channel_ids = self.channel_ids[:1]  # A webhook always posts to its own channel
+        self.broadcaster = Broadcaster("Discord", self.send_message, GLOBAL_LIMITER, CHANNEL_LIMITER)
+        self.last_report = {}  # Per-channel delivery status of the last broadcast
+
+    def send_message(self, channel_id, message, suppress_embeds=True):
+        self.discord.send_message(channel_id, message, suppress_embeds)
+
+    def send_messages(self, messages, suppress_embeds=True, progress=None):
+        """Broadcast messages to every channel. Returns True if all channels got all of them, False if any failed.
+
+        With an outbox `progress`, channels only get the messages an earlier attempt did not deliver.
+        """
+        self.last_report = self.broadcaster.broadcast(
+            self.channel_ids, messages, progress=progress, suppress_embeds=suppress_embeds
+        )
+        return broadcast_succeeded(self.last_report)
+
+    def load_news(self, file_path, content=None):
+        """Load content from news or Daily Recap file (or the given text) as a list of news items."""
+        if content is None:
+            if not os.path.exists(file_path):
+                logger.warning(f"[⚠️] File {file_path} not found!")
+                return []
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+
+        return split_items(content)
+
+    def post_news_to_discord(self, file_path, is_daily_recap=False, content=None, progress=None):
+        """Send news to Discord. Returns True if every message was sent, False if any failed, None when there was nothing to send."""
+        news_list = self.load_news(file_path, content)
+        if not news_list:
+            logger.warning(f"[⚠️] No news to post from {file_path}!")
+            return None
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            news_list = [line.strip() for line in f.read().strip().split("\n\n")]
+        messages = pack_for("discord", news_list)  # As few messages as fit Discord's 2000 characters, in order
+        logger.info(f"[🚀] Sending {'Daily Recap' if is_daily_recap else 'news'} to {len(self.channel_ids)} Discord channels in {len(messages)} messages")
+        return self.send_messages(messages, progress=progress)
 
-        return news_list  # Return list of strings, no additional nesting
+    def post_news(self, content=None, progress=None):
+        """Send regular news from generated_news.txt (or the given text)."""
+        return self.post_news_to_discord(GENERATED_NEWS_FILE, content=content, progress=progress)
 
-    async def post_news_async(self, file_path, is_daily_recap=False):
-        """Send news to Discord."""
-        news_list = self.load_news(file_path)
-        if not news_list:
-            logger.warning(f"[⚠️] No news to post from {file_path}!")
-            return
-
-        intents = discord.Intents.default()
-        client = discord.Client(intents=intents)
-
-        try:
-            await client.login(self.token)
-            channel = await client.fetch_channel(self.channel_id)
-
-            if channel is None:
-                logger.error(f"[❌] Channel with ID {self.channel_id} not found!")
-                return
-
-            batch_size = 10  # Each post contains up to 10 news items
-            for i in range(0, len(news_list), batch_size):
-                batch = news_list[i:i + batch_size]
-                message = "\n\n".join(batch)  # Ensure data is a string
-
-                try:
-                    logger.info(f"[🚀] Sending {'Daily Recap' if is_daily_recap else 'news'} to Discord: {message[:50]}...")
-                    await channel.send(message, suppress_embeds=True)
-                    logger.info("[✅] Successfully sent!")
-                except Exception as e:
-                    logger.error(f"[❌] Error sending news: {e}")
-
-        finally:
-            await client.close()  # Close session properly
-
-    def post_news(self):
-        """Send regular news from generated_news.txt."""
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(self.post_news_async(GENERATED_NEWS_FILE))  # Run asynchronously if loop is active
-        except RuntimeError:
-            asyncio.run(self.post_news_async(GENERATED_NEWS_FILE))  # If no loop exists, create and run
-
-    def post_daily_recap(self):
-        """Send Daily Recap from daily_generate_news.txt."""
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(self.post_news_async(DAILY_NEWS_FILE, is_daily_recap=True))  # Run asynchronously if loop is active
-        except RuntimeError:
-            asyncio.run(self.post_news_async(DAILY_NEWS_FILE, is_daily_recap=True))  # If no loop exists, create and run
+    def post_daily_recap(self, content=None, progress=None):
+        """Send Daily Recap from daily_generate_news.txt (or the given text)."""
+        return self.post_news_to_discord(DAILY_NEWS_FILE, is_daily_recap=True, content=content, progress=progress)
 
 # Run script
 if __name__ == "__main__":
@@ -84,4 +83,4 @@ if __name__ == "__main__":
     service.post_news()
 
     # Post Daily Recap
-    service.post_daily_recap()
\ No newline at end of file
+    service.post_daily_recap()
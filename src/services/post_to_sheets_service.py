@@ -1,24 +1,43 @@
 import gspread
 import os
 import datetime
+import time
+import threading
+import atexit
 from oauth2client.service_account import ServiceAccountCredentials
 from src.utils.config_loader import CONFIG  # Load config from settings.json
 
 # Retrieve information from settings.json
 GOOGLE_SHEET_CREDENTIALS = CONFIG.get("GOOGLE_SHEET_CREDENTIALS", "path/to/your/google-credentials.json")  
 SPREADSHEET_ID = CONFIG.get("SPREADSHEET_ID", None)  
+SHEETS_FLUSH_INTERVAL = CONFIG.get("SHEETS_FLUSH_INTERVAL", 0)  # Seconds; > 0 buffers rows and writes them behind
 
 # File containing generated news
 GENERATED_NEWS_FILE = "data/generated_news.txt"
+HEADER_ROW = ["Date", "Author", "Title", "Content", "Link"]
 
 if not SPREADSHEET_ID:
     raise ValueError("[❌] SPREADSHEET_ID not configured in settings.json!")
 
 class PostToGoogleSheetsService:
-    """Service to save news to Google Sheets by week."""
+    """Service to save news to Google Sheets by week.
 
-    def __init__(self):
+    The spreadsheet is opened once and the weekly worksheet handle is cached, and all rows of
+    a batch go out in a single `append_rows`, so a cycle costs one Sheets call (plus the
+    worksheet lookup on the first write of a week). With SHEETS_FLUSH_INTERVAL set, rows are
+    buffered and flushed in the background at that interval instead of on every save.
+    """
+
+    def __init__(self, flush_interval=SHEETS_FLUSH_INTERVAL):
         self.client = self.authenticate_google_sheets()
+        self.spreadsheet = None
+        self.worksheets = {}  # sheet name -> worksheet, for the current week only
+        self.buffer = []  # Rows waiting for the next flush (write-behind mode)
+        self.lock = threading.Lock()
+        self.flush_interval = flush_interval
+        if flush_interval > 0:
+            threading.Thread(target=self._flush_loop, daemon=True, name="sheets-flush").start()
+            atexit.register(self.flush)
 
     def authenticate_google_sheets(self):
         """Authenticate and connect to Google Sheets API."""
@@ -27,9 +46,9 @@ class PostToGoogleSheetsService:
         client = gspread.authorize(creds)
         return client
 
-    def get_current_week_info(self):
+    def get_current_week_info(self, today=None):
         """Calculate week number in the month based on Monday-Sunday."""
-        today = datetime.date.today()
+        today = today or datetime.date.today()
         first_day_of_month = today.replace(day=1)
         month = today.strftime("%m")  # Get current month
         year = today.strftime("%Y")  # Get current year
@@ -53,22 +72,29 @@ class PostToGoogleSheetsService:
         
         return sheet_name
 
-    def get_or_create_weekly_sheet(self):
-        """Create a new sheet if it doesn't exist, or retrieve the current week's sheet."""
-        sheet_name = self.get_current_week_info()
-        sheet = self.client.open_by_key(SPREADSHEET_ID)
+    def get_or_create_weekly_sheet(self, sheet_name=None):
+        """Create a new sheet if it doesn't exist, or retrieve the current week's sheet (cached)."""
+        sheet_name = sheet_name or self.get_current_week_info()
+        worksheet = self.worksheets.get(sheet_name)
+        if worksheet is not None:
+            return worksheet
+
+        if self.spreadsheet is None:
+            self.spreadsheet = self.client.open_by_key(SPREADSHEET_ID)
 
         try:
-            worksheet = sheet.worksheet(sheet_name)
+            worksheet = self.spreadsheet.worksheet(sheet_name)
         except gspread.exceptions.WorksheetNotFound:
-            worksheet = sheet.add_worksheet(title=sheet_name, rows="3000", cols="5")
+            worksheet = self.spreadsheet.add_worksheet(title=sheet_name, rows="3000", cols="5")
 
             # Write column headers when creating a new sheet
-            worksheet.append_row(["Date", "Author", "Title", "Content", "Link"])
+            worksheet.append_row(HEADER_ROW)
 
             # Define column widths
             self.set_column_width(worksheet)
 
+        # Handles of past weeks are never written to again
+        self.worksheets = {sheet_name: worksheet}
         return worksheet
 
     def set_column_width(self, worksheet):
@@ -85,14 +111,16 @@ class PostToGoogleSheetsService:
         worksheet.spreadsheet.batch_update(body)
         print("[✅] Column widths set successfully!")
 
-    def load_news_data(self):
-        """Read news content from generated_news.txt."""
-        if not os.path.exists(GENERATED_NEWS_FILE):
-            print("[⚠️] File generated_news.txt not found!")
-            return []
+    def load_news_data(self, content=None):
+        """Read news content from generated_news.txt (or the given text)."""
+        if content is None:
+            if not os.path.exists(GENERATED_NEWS_FILE):
+                print("[⚠️] File generated_news.txt not found!")
+                return []
+            with open(GENERATED_NEWS_FILE, "r", encoding="utf-8") as f:
+                content = f.read()
 
-        with open(GENERATED_NEWS_FILE, "r", encoding="utf-8") as f:
-            news_list = f.read().strip().split("\n\n")  # Split by news items
+        news_list = content.strip().split("\n\n")  # Split by news items
 
         parsed_news = []
         for news in news_list:
@@ -110,19 +138,61 @@ class PostToGoogleSheetsService:
 
         return parsed_news
 
-    def save_news_to_google_sheet(self):
-        """Save news to Google Sheet by week."""
-        worksheet = self.get_or_create_weekly_sheet()
-        news_data = self.load_news_data()
+    def write_rows(self, rows):
+        """Append rows to the sheet of the week they are dated in, one `append_rows` call per sheet."""
+        by_sheet = {}
+        for row in rows:
+            sheet_name = self.get_current_week_info(datetime.date.fromisoformat(row[0]))
+            by_sheet.setdefault(sheet_name, []).append(list(row))
+
+        for sheet_name, sheet_rows in by_sheet.items():
+            worksheet = self.get_or_create_weekly_sheet(sheet_name)
+            try:
+                worksheet.append_rows(sheet_rows)
+            except gspread.exceptions.APIError:
+                # The cached handle may point at a sheet that was deleted or renamed
+                self.worksheets.pop(sheet_name, None)
+                raise
+
+    def flush(self):
+        """Write out the buffered rows. Rows stay buffered if the write fails. Returns how many were written."""
+        with self.lock:
+            rows, self.buffer = self.buffer, []
+            if not rows:
+                return 0
+            try:
+                self.write_rows(rows)
+            except Exception as e:
+                self.buffer = rows + self.buffer
+                print(f"[❌] Error flushing {len(rows)} rows to Google Sheets: {e}")
+                return 0
+        print(f"[✅] Flushed {len(rows)} news items to Google Sheet!")
+        return len(rows)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def save_news_to_google_sheet(self, content=None):
+        """Save news to Google Sheet by week. Returns True once saved (or buffered), None when there was nothing to save."""
+        news_data = self.load_news_data(content)
 
         if not news_data:
             print("[⚠️] No news to save to Google Sheets.")
-            return
+            return None
+
+        if self.flush_interval > 0:
+            with self.lock:
+                self.buffer.extend(news_data)
+            print(f"[📝] Buffered {len(news_data)} news items for Google Sheet.")
+            return True
 
-        for row in news_data:
-            worksheet.append_row(row)
+        with self.lock:
+            self.write_rows(news_data)
 
         print(f"[✅] Saved {len(news_data)} news items to Google Sheet!")
+        return True
 
 # Run script
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
 import os
 import logging
-import asyncio
-import requests
 import tweepy
-import discord
 from src.utils.config_loader import CONFIG
+from src.utils.message_packer import pack_for, split_items
+from src.services.post_to_telegram_service import PostToTelegramService
+from src.services.post_to_discord_service import PostToDiscordService
+from src.services.fanout_publisher_service import FanoutPublisher
+from src.services.outbox_service import OUTBOX_ENABLED, Outbox
 
 # Configure logger
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -25,14 +27,18 @@ class PostToSocialServices:
             access_token_secret=CONFIG["X_ACCESS_TOKEN_SECRET"]
         )
 
-        # Telegram API (sử dụng HTTP API thay vì Application)
-        self.telegram_bot_token = CONFIG["TELEGRAM_BOT_TOKEN"]
-        self.telegram_chat_id = CONFIG["TELEGRAM_CHAT_ID"]
-        self.telegram_api_url = f"https://api.telegram.org/bot{self.telegram_bot_token}/sendMessage"
+        # Telegram (HTTP API) and Discord (REST API), broadcast to every configured chat/channel
+        self.telegram = PostToTelegramService()
+        self.discord = PostToDiscordService()
 
-        # Discord API
-        self.discord_bot_token = CONFIG["DISCORD_BOT_TOKEN"]
-        self.discord_channel_id = int(CONFIG["DISCORD_CHANNEL_ID"])
+        # One content item goes to every platform concurrently
+        self.publisher = FanoutPublisher({
+            "x": self.post_to_x,
+            "telegram": self.post_to_telegram,
+            "discord": self.post_to_discord,
+        })
+        # With the outbox on, posts are queued and delivered by scripts/start_outbox_worker.py
+        self.outbox = Outbox() if OUTBOX_ENABLED else None
 
     def load_news_content(self, news_file=GENERATED_NEWS_FILE):
         """Load content from news file."""
@@ -49,75 +55,65 @@ class PostToSocialServices:
 
         return content
 
-    def post_to_x(self, news_content):
-        """Post news to X (Twitter)."""
+    def post_to_x(self, news_content, progress=None):
+        """Post news to X (Twitter), skipping posts an earlier outbox attempt already sent."""
         if not news_content:
             logging.warning("[⚠️] No news to post to X!")
-            return
-
-        try:
-            logging.info(f"[🚀] Posting news to X: {news_content[:50]}...")
-            self.twitter_client.create_tweet(text=news_content)
-            logging.info("[✅] Successfully posted news to X!")
-        except Exception as e:
-            logging.error(f"[❌] Error posting to X: {e}")
+            return None
 
-    def post_to_telegram(self, news_content):
+        success = True
+        for index, post in enumerate(pack_for("x", split_items(news_content))):
+            if progress and progress.done(index):
+                continue
+            try:
+                logging.info(f"[🚀] Posting news to X: {post[:50]}...")
+                self.twitter_client.create_tweet(text=post)
+                if progress:
+                    progress.mark(index)
+                logging.info("[✅] Successfully posted news to X!")
+            except Exception as e:
+                logging.error(f"[❌] Error posting to X: {e}")
+                success = False
+        return success
+
+    def post_to_telegram(self, news_content, progress=None):
         """Post news to Telegram using HTTP API."""
         if not news_content:
             logging.warning("[⚠️] No news to post to Telegram!")
-            return
-
-        try:
-            logging.info(f"[🚀] Posting news to Telegram: {news_content[:50]}...")
-            payload = {
-                "chat_id": self.telegram_chat_id,
-                "text": news_content
-            }
-            response = requests.post(self.telegram_api_url, data=payload)
-            response.raise_for_status()  # Raise exception nếu HTTP request thất bại
+            return None
+
+        logging.info(f"[🚀] Posting news to Telegram: {news_content[:50]}...")
+        success = self.telegram.send_messages(pack_for("telegram", split_items(news_content)), disable_web_page_preview=False, progress=progress)
+        if success:
             logging.info("[✅] Successfully posted news to Telegram!")
-        except Exception as e:
-            logging.error(f"[❌] Error posting to Telegram: {e}")
+        return success
 
-    async def post_to_discord(self, news_content):
+    def post_to_discord(self, news_content, progress=None):
         """Post news to Discord."""
         if not news_content:
             logging.warning("[⚠️] No news to post to Discord!")
-            return
-
-        intents = discord.Intents.default()
-        client = discord.Client(intents=intents)
-
-        try:
-            await client.login(self.discord_bot_token)
-            channel = await client.fetch_channel(self.discord_channel_id)
-            if channel:
-                logging.info(f"[🚀] Sending news to Discord: {news_content[:50]}...")
-                await channel.send(news_content)
-                logging.info("[✅] Successfully sent news to Discord!")
-        except Exception as e:
-            logging.error(f"[❌] Error posting to Discord: {e}")
-        finally:
-            await client.close()
+            return None
+
+        return self.discord.send_messages(pack_for("discord", split_items(news_content)), suppress_embeds=False, progress=progress)
 
     def post_all(self, news_content=None):
-        """Post news to all platforms."""
+        """Post news to all platforms concurrently, or queue it in the outbox when that is enabled.
+
+        Returns the per-platform report (see FanoutPublisher); queued posts report "queued", or
+        "skipped" when the same content was already queued.
+        """
         if not news_content:
             news_content = self.load_news_content()
 
         if not news_content:
             logging.warning("[⚠️] No news to post to all platforms!")
-            return
-
-        # Post to X (Twitter)
-        self.post_to_x(news_content)
+            return {}
 
-        # Post to Telegram
-        self.post_to_telegram(news_content)  # Không cần asyncio.run nữa
+        if self.outbox:
+            status = "queued" if self.outbox.enqueue("social", news_content) else "skipped"
+            return {name: {"status": status} for name in self.publisher.destinations}
 
-        # Post to Discord (run asynchronously)
-        asyncio.run(self.post_to_discord(news_content))
+        return self.publisher.publish(news_content)
 
 
 # Run script
@@ -1,68 +1,101 @@
 import os
-import requests
+import time
 from src.utils.config_loader import CONFIG
+from src.utils.http_client import get_http_client
 from src.utils.logger import setup_logger
+from src.utils.message_packer import pack_for, split_items
+from src.utils.rate_limiter import KeyedRateLimiter, TokenBucket
+from src.services.broadcast_service import Broadcaster, broadcast_succeeded, destination_list
 
 logger = setup_logger("PostToTelegramService")
 
 GENERATED_NEWS_FILE = "data/generated_news.txt"
 DAILY_NEWS_FILE = "data/daily_generate_news.txt"  # File for Daily Recap
 TELEGRAM_BOT_TOKEN = CONFIG["TELEGRAM_BOT_TOKEN"]
-TELEGRAM_CHAT_ID = CONFIG["TELEGRAM_CHAT_ID"]
-TWEET_BATCH_SIZE = 10  # Each post will contain up to 10 news items
+TELEGRAM_CHAT_IDS = destination_list("TELEGRAM_CHAT_IDS", "TELEGRAM_CHAT_ID")  # Every chat news is broadcast to
 TELEGRAM_API_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Bot API limits: about 30 messages per second overall and 20 per minute in one group.
+# Shared by every sender in the process so concurrent services stay under them together.
+GLOBAL_LIMITER = TokenBucket(CONFIG.get("TELEGRAM_RATE_LIMIT", 30))
+CHAT_LIMITER = KeyedRateLimiter(CONFIG.get("TELEGRAM_CHAT_RATE_LIMIT", 20) / 60, capacity=3)
 
 class PostToTelegramService:
-    """Service to post news to Telegram with each post containing up to 10 news items using HTTP API."""
+    """Service to post news to Telegram using HTTP API, packing news items into as few 4096-character messages as possible.
+
+    News is broadcast to every chat in TELEGRAM_CHAT_IDS concurrently, within Telegram's global
+    and per-chat rate limits.
+    """
 
-    def __init__(self):
+    def __init__(self, chat_ids=None):
         """Initialize Telegram API URL."""
         self.telegram_api_url = TELEGRAM_API_URL
-        self.chat_id = TELEGRAM_CHAT_ID
+        self.chat_ids = chat_ids or TELEGRAM_CHAT_IDS
+        self.http = get_http_client()
+        self.broadcaster = Broadcaster("Telegram", self.send_message, GLOBAL_LIMITER, CHAT_LIMITER)
+        self.last_report = {}  # Per-chat delivery status of the last broadcast
+
+    def send_message(self, chat_id, text, disable_web_page_preview=True):
+        """Send one message to one chat, waiting out 429s. Raises requests.HTTPError on failure."""
+        payload = {"chat_id": chat_id, "text": text, "disable_web_page_preview": disable_web_page_preview}
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            response = self.http.post(self.telegram_api_url, data=payload)
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            try:
+                retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+            except ValueError:
+                retry_after = 1
+            logger.warning(f"[⏳] Telegram rate limit hit for {chat_id}, retrying in {retry_after}s")
+            time.sleep(retry_after)
+        response.raise_for_status()  # Raise exception nếu HTTP request thất bại
+
+    def send_messages(self, messages, disable_web_page_preview=True, progress=None):
+        """Broadcast messages to every chat. Returns True if all chats got all of them, False if any failed.
 
-    def load_news(self, file_path):
-        """Load content from file and group news items."""
-        if not os.path.exists(file_path):
-            logger.warning(f"[⚠️] File {file_path} not found!")
-            return []
+        With an outbox `progress`, chats only get the messages an earlier attempt did not deliver.
+        """
+        self.last_report = self.broadcaster.broadcast(
+            self.chat_ids, messages, progress=progress, disable_web_page_preview=disable_web_page_preview
+        )
+        return broadcast_succeeded(self.last_report)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            news_list = [line.strip() for line in f.read().strip().split("\n\n")]
+    def load_news(self, file_path, content=None):
+        """Load content from file (or the given text) and pack the news items into messages."""
+        if content is None:
+            if not os.path.exists(file_path):
+                logger.warning(f"[⚠️] File {file_path} not found!")
+                return []
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
 
-        if file_path == GENERATED_NEWS_FILE:
-            return [news_list[i:i + TWEET_BATCH_SIZE] for i in range(0, len(news_list), TWEET_BATCH_SIZE)]
+        return pack_for("telegram", split_items(content))
 
-        return [news_list]  # Daily Recap is a single post
+    def post_news_to_telegram(self, file_path, is_daily_recap=False, content=None, progress=None):
+        """Send news to every Telegram chat from file using HTTP API.
 
-    def post_news_to_telegram(self, file_path, is_daily_recap=False):
-        """Send news to Telegram from file using HTTP API."""
-        news_batches = self.load_news(file_path)
-        if not news_batches:
+        Returns True if every message reached every chat, False if any failed, None when there was
+        nothing to send. The per-chat outcome is kept in `last_report`.
+        """
+        messages = self.load_news(file_path, content)
+        if not messages:
             logger.warning(f"[⚠️] No news to post from {file_path}!")
-            return
-        
-        for batch in news_batches:
-            message_content = "\n\n".join(batch)
-            try:
-                logger.info(f"[🚀] Sending {'Daily Recap' if is_daily_recap else 'news'} to Telegram: {message_content[:50]}...")
-                payload = {
-                    "chat_id": self.chat_id,
-                    "text": message_content,
-                    "disable_web_page_preview": True
-                }
-                response = requests.post(self.telegram_api_url, data=payload)
-                response.raise_for_status()  # Raise exception nếu HTTP request thất bại
-                logger.info("[✅] Successfully sent to Telegram!")
-            except Exception as e:
-                logger.error(f"[❌] Error sending message: {e}")
-
-    def post_news(self):
-        """Send regular news from generated_news.txt."""
-        self.post_news_to_telegram(GENERATED_NEWS_FILE)
-
-    def post_daily_recap(self):
-        """Send Daily Recap from daily_generate_news.txt."""
-        self.post_news_to_telegram(DAILY_NEWS_FILE, is_daily_recap=True)
+            return None
+
+        logger.info(f"[🚀] Sending {'Daily Recap' if is_daily_recap else 'news'} to {len(self.chat_ids)} Telegram chats in {len(messages)} messages")
+        success = self.send_messages(messages, progress=progress)
+        if success:
+            logger.info("[✅] Successfully sent to Telegram!")
+        return success
+
+    def post_news(self, content=None, progress=None):
+        """Send regular news from generated_news.txt (or the given text)."""
+        return self.post_news_to_telegram(GENERATED_NEWS_FILE, content=content, progress=progress)
+
+    def post_daily_recap(self, content=None, progress=None):
+        """Send Daily Recap from daily_generate_news.txt (or the given text)."""
+        return self.post_news_to_telegram(DAILY_NEWS_FILE, is_daily_recap=True, content=content, progress=progress)
 
 if __name__ == "__main__":
     service = PostToTelegramService()
@@ -1,18 +1,16 @@
 import tweepy
 import os
-from math import ceil
 from src.utils.config_loader import CONFIG
 from src.utils.logger import setup_logger
+from src.utils.message_packer import pack_for, split_items
 
 logger = setup_logger("PostToXService")
 
 GENERATED_NEWS_FILE = "data/generated_news.txt"
 DAILY_NEWS_FILE = "data/daily_generate_news.txt"  # File for Daily Recap
-TWEET_BATCH_SIZE = 5  # Each post will contain up to 5 news items
-MAX_POSTS = 3  # Limit to a maximum of 3 posts
 
 class PostToXService:
-    """Service to post news to X (Twitter) with each post containing up to TWEET_BATCH_SIZE news items."""
+    """Service to post news to X (Twitter), packing news items into as few posts as fit X's length limit."""
 
     def __init__(self):
         self.client = tweepy.Client(
@@ -22,31 +20,16 @@ class PostToXService:
             access_token_secret=CONFIG["X_ACCESS_TOKEN_SECRET"]
         )
 
-    def load_news(self):
-        """Load content from generated_news.txt and split news into balanced batches."""
-        if not os.path.exists(GENERATED_NEWS_FILE):
-            logger.warning("[⚠️] File generated_news.txt not found!")
-            return []
+    def load_news(self, content=None):
+        """Load content from generated_news.txt (or the given text) and pack the news items into posts."""
+        if content is None:
+            if not os.path.exists(GENERATED_NEWS_FILE):
+                logger.warning("[⚠️] File generated_news.txt not found!")
+                return []
+            with open(GENERATED_NEWS_FILE, "r", encoding="utf-8") as f:
+                content = f.read()
 
-        with open(GENERATED_NEWS_FILE, "r", encoding="utf-8") as f:
-            news_list = [line.strip() for line in f.read().strip().split("\n\n")]
-
-        total_news = len(news_list)
-        if total_news == 0:
-            return []
-
-        # If news items are fewer than batch size -> create just 1 post
-        if total_news <= TWEET_BATCH_SIZE:
-            return [news_list]
-
-        # Limit the number of posts to MAX_POSTS
-        num_batches = min(MAX_POSTS, ceil(total_news / TWEET_BATCH_SIZE))
-
-        # Split news into batches with even distribution
-        avg_batch_size = ceil(total_news / num_batches)
-        news_batches = [news_list[i:i + avg_batch_size] for i in range(0, total_news, avg_batch_size)]
-
-        return news_batches
+        return pack_for("x", split_items(content))
 
     def load_daily_recap(self):
         """Load Daily Recap content from daily_generate_news.txt."""
@@ -57,39 +40,53 @@ class PostToXService:
         with open(DAILY_NEWS_FILE, "r", encoding="utf-8") as f:
             return f.read().strip()  # Retrieve entire content
 
-    def format_tweet(self, batch):
-        """Format a post from a batch of news items, using double line breaks as separators."""
-        return "\n\n".join(batch)  # Use double line breaks to separate news items
+    def post_news(self, content=None, progress=None):
+        """Post the news to X in as few posts as fit the length limit.
 
-    def post_news(self):
-        """Post tweets to X, each containing up to TWEET_BATCH_SIZE news items."""
-        news_batches = self.load_news()
-        if not news_batches:
+        With an outbox `progress`, posts already sent in an earlier attempt are skipped.
+        Returns True if every post went out, False if any failed, None when there was nothing to post.
+        """
+        posts = self.load_news(content)
+        if not posts:
             logger.warning("[⚠️] No news to post!")
-            return
+            return None
 
-        for batch in news_batches:
-            tweet_content = self.format_tweet(batch)
+        success = True
+        for index, tweet_content in enumerate(posts):
+            if progress and progress.done(index):
+                continue
             try:
                 logger.info(f"[🚀] Posting: {tweet_content[:50]}...")
                 self.client.create_tweet(text=tweet_content)
+                if progress:
+                    progress.mark(index)
                 logger.info("[✅] Successfully posted!")
             except Exception as e:
                 logger.error(f"[❌] Error posting: {e}")
+                success = False
+        return success
 
-    def post_daily_recap(self):
-        """Post the Daily Recap news summary to X."""
-        daily_recap_content = self.load_daily_recap()
+    def post_daily_recap(self, content=None, progress=None):
+        """Post the Daily Recap news summary to X, split over several posts only if it does not fit in one."""
+        daily_recap_content = content if content is not None else self.load_daily_recap()
         if not daily_recap_content:
             logger.warning("[⚠️] No Daily Recap content to post!")
-            return
+            return None
 
-        try:
-            logger.info(f"[🚀] Posting Daily Recap: {daily_recap_content[:50]}...")
-            self.client.create_tweet(text=daily_recap_content)
-            logger.info("[✅] Successfully posted Daily Recap!")
-        except Exception as e:
-            logger.error(f"[❌] Error posting Daily Recap: {e}")
+        success = True
+        for index, post in enumerate(pack_for("x", split_items(daily_recap_content))):
+            if progress and progress.done(index):
+                continue
+            try:
+                logger.info(f"[🚀] Posting Daily Recap: {post[:50]}...")
+                self.client.create_tweet(text=post)
+                if progress:
+                    progress.mark(index)
+                logger.info("[✅] Successfully posted Daily Recap!")
+            except Exception as e:
+                logger.error(f"[❌] Error posting Daily Recap: {e}")
+                success = False
+        return success
 
 if __name__ == "__main__":
     service = PostToXService()
@@ -1,17 +1,17 @@
-import json
-import os
 import re
+import asyncio
 import logging
-from openai import AsyncOpenAI
 from telegram import Update, MessageEntity, Chat
 from telegram.ext import (
     Application,
+    BaseUpdateProcessor,
     CommandHandler,
     MessageHandler,
     ContextTypes,
     filters
 )
 from src.utils.config_loader import CONFIG
+from src.services.chat_engine_service import ChatEngine
 
 # Configure logger
 logger = logging.getLogger("TelegramBotService")
@@ -23,6 +23,64 @@ logging.getLogger("telegram").setLevel(logging.WARNING)
 logging.getLogger("telegram.ext").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+TELEGRAM_MODE = CONFIG.get("TELEGRAM_MODE", "polling")  # "polling" or "webhook"
+TELEGRAM_WEBHOOK_URL = CONFIG.get("TELEGRAM_WEBHOOK_URL")  # Public HTTPS base URL of this listener (or of a proxy to it)
+TELEGRAM_WEBHOOK_PATH = CONFIG.get("TELEGRAM_WEBHOOK_PATH", "telegram")
+TELEGRAM_WEBHOOK_LISTEN = CONFIG.get("TELEGRAM_WEBHOOK_LISTEN", "0.0.0.0")
+TELEGRAM_WEBHOOK_PORT = CONFIG.get("TELEGRAM_WEBHOOK_PORT", 8443)
+TELEGRAM_WEBHOOK_SECRET = CONFIG.get("TELEGRAM_WEBHOOK_SECRET")  # Checked against X-Telegram-Bot-Api-Secret-Token
+TELEGRAM_WEBHOOK_CERT = CONFIG.get("TELEGRAM_WEBHOOK_CERT")  # PEM certificate; with the key, the listener serves HTTPS itself
+TELEGRAM_WEBHOOK_KEY = CONFIG.get("TELEGRAM_WEBHOOK_KEY")  # PEM private key for TELEGRAM_WEBHOOK_CERT
+TELEGRAM_MAX_CONCURRENT_UPDATES = CONFIG.get("TELEGRAM_MAX_CONCURRENT_UPDATES", 64)  # Updates being answered at once
+TELEGRAM_MAX_PENDING_UPDATES = CONFIG.get("TELEGRAM_MAX_PENDING_UPDATES", 1024)  # Updates admitted, incl. those queued on a chat
+
+# The bot only handles text messages (and /start), so Telegram need not send anything else
+ALLOWED_UPDATES = [Update.MESSAGE]
+
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """Process updates concurrently, but one at a time per chat and in the order they arrived.
+
+    Updates are started in arrival order and queue on their chat's lock (asyncio locks are
+    FIFO), so a slow answer in one group never holds up the others while replies within a
+    chat keep their order.
+
+    Only an update holding its chat's lock takes one of the `max_concurrent_updates` working
+    slots. The base class's own semaphore, which is held for the whole of `do_process_update`,
+    is sized to `max_pending_updates` instead, so updates queued behind a busy chat only count
+    against that larger bound and cannot starve other chats of slots.
+    """
+
+    def __init__(self, max_concurrent_updates=TELEGRAM_MAX_CONCURRENT_UPDATES,
+                 max_pending_updates=TELEGRAM_MAX_PENDING_UPDATES):
+        super().__init__(max(max_pending_updates, max_concurrent_updates))
+        self.slots = asyncio.Semaphore(max_concurrent_updates)
+        self.chat_locks = {}  # chat_id -> [lock, updates holding or waiting for it]
+
+    @staticmethod
+    def _chat_id(update):
+        chat = getattr(update, "effective_chat", None)
+        return chat.id if chat else None
+
+    async def do_process_update(self, update, coroutine):
+        chat_id = self._chat_id(update)
+        entry = self.chat_locks.setdefault(chat_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0], self.slots:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.chat_locks[chat_id]
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
 class TelegramBotService:
     def __init__(self):
         """Initialize Telegram bot with OpenAI"""
@@ -33,13 +91,13 @@ class TelegramBotService:
         if not all([self.api_key, self.telegram_token]):
             raise ValueError("Missing API Key or Telegram Token configuration")
 
-        self.openai_client = AsyncOpenAI(api_key=self.api_key)
-        self.application = Application.builder().token(self.telegram_token).build()
-        self.prompt_data = self.load_prompt("config/telegram_prompt.json")
-
-        # Create list of trigger keywords
-        self.trigger_keywords = set(self.prompt_data.get("specific_mention_handling", {}).get("trigger_keywords", []))
-        self.banned_keywords = set(self.prompt_data.get("specific_mention_handling", {}).get("banned_keywords", []))
+        self.application = (
+            Application.builder()
+            .token(self.telegram_token)
+            .concurrent_updates(PerChatUpdateProcessor())
+            .build()
+        )
+        self.engine = ChatEngine("config/telegram_prompt.json")
 
         # Register handlers
         self._register_handlers()
@@ -64,18 +122,6 @@ class TelegramBotService:
             )
         )
 
-    def load_prompt(self, prompt_file: str) -> dict:
-        """Load prompt from JSON file"""
-        if hasattr(self, "_cached_prompt"):  # If already cached, reuse it
-            return self._cached_prompt
-        try:
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                self._cached_prompt = json.load(f)  # Cache the data
-                return self._cached_prompt
-        except FileNotFoundError:
-            logger.error(f"Prompt file {prompt_file} not found!")
-            return {}
-
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /start command"""
         await update.message.reply_text("Hello! Tag me with @socoai_bot to chat!")
@@ -94,66 +140,64 @@ class TelegramBotService:
                     flags=re.IGNORECASE
                 ).strip()
 
-            # Detect keywords related to staking/Specific mentions
-            contains_trigger = any(keyword.lower() in user_message.lower() for keyword in self.trigger_keywords)
-            contains_banned = any(keyword.lower() in user_message.lower() for keyword in self.banned_keywords)
-
-            # If user uses banned keywords, respond sassily without mentioning Specific mentions
-            if contains_banned:
-                await update.message.reply_text("Oh dear, such unrefined language! I'm a classy bot, let's keep it fun and drama-free. 😤")
-                return
-
-            # Generate response from OpenAI
-            response = await self.generate_response(user_message, contains_trigger)
+            conversation = f"telegram:{update.message.chat.id}:{update.message.from_user.id}"
+            response = await self.engine.reply(user_message, conversation)
             await update.message.reply_text(response)
 
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}", exc_info=True)
             await update.message.reply_text("Oops! I encountered an error, try again later. 😢")
 
-    async def generate_response(self, user_message: str, mention_specific: bool) -> str:
-        """Generate response from OpenAI based on context"""
-        messages = [
-            {
-                "role": "system",
-                "content": f"{self.prompt_data.get('role', '')}\n\n{self.prompt_data.get('context', '')}"
-            }
-        ]
-
-        # Add example conversations from prompt
-        for example in self.prompt_data.get("example_conversations", []):
-            messages.append({"role": "user", "content": example["User:"]})
-            messages.append({"role": "assistant", "content": example["Assistant:"]})
-
-        # If user mentions staking/inj/INJ, add specific mention prompt
-        if mention_specific:
-            strategy = self.prompt_data.get("specific_mention_handling", {}).get("response_strategy", [])
-            messages.append({"role": "system", "content": " ".join(strategy)})
-
-        messages.append({"role": "user", "content": user_message})
-
-        try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=messages,
-                max_tokens=300,
-                temperature=0.9  # Increase creativity
-            )
-            return response.choices[0].message.content.strip()
+    def run_polling(self):
+        """Long-poll getUpdates: each request waits up to 30s on Telegram's side for new messages."""
+        self.application.run_polling(
+            timeout=30,
+            drop_pending_updates=True,
+            allowed_updates=ALLOWED_UPDATES
+        )
 
-        except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}", exc_info=True)
-            return "Got a little lag, try asking again! 😏"
+    def run_webhook(self):
+        """Serve the webhook: Telegram POSTs each update to TELEGRAM_WEBHOOK_URL/TELEGRAM_WEBHOOK_PATH.
+
+        Telegram only delivers to HTTPS URLs on port 443, 80, 88 or 8443, and this repo ships no
+        proxy. Either set TELEGRAM_WEBHOOK_CERT and TELEGRAM_WEBHOOK_KEY so the listener serves
+        HTTPS itself on TELEGRAM_WEBHOOK_PORT (a self-signed certificate is uploaded to Telegram
+        with the webhook; its CN must be the host of TELEGRAM_WEBHOOK_URL), e.g.
+
+            openssl req -newkey rsa:2048 -sha256 -nodes -x509 -days 365 \
+                    -keyout config/webhook.key -out config/webhook.pem -subj "/CN=bot.example.com"
+
+        or leave them unset and terminate TLS in a reverse proxy of your own that forwards the
+        path to the plain-HTTP listener. To try it locally without TLS, POST a sample update:
+
+            curl -X POST http://localhost:8443/telegram \\
+                 -H "Content-Type: application/json" \\
+                 -H "X-Telegram-Bot-Api-Secret-Token: $TELEGRAM_WEBHOOK_SECRET" \\
+                 -d '{"update_id": 1, "message": {"message_id": 1, "date": 0,
+                      "chat": {"id": 42, "type": "private"}, "from": {"id": 42, "is_bot": false,
+                      "first_name": "Test"}, "text": "how do I stake INJ?"}}'
+        """
+        if not TELEGRAM_WEBHOOK_URL:
+            raise ValueError("TELEGRAM_WEBHOOK_URL is required when TELEGRAM_MODE is 'webhook'")
+        self.application.run_webhook(
+            listen=TELEGRAM_WEBHOOK_LISTEN,
+            port=TELEGRAM_WEBHOOK_PORT,
+            url_path=TELEGRAM_WEBHOOK_PATH,
+            webhook_url=f"{TELEGRAM_WEBHOOK_URL.rstrip('/')}/{TELEGRAM_WEBHOOK_PATH}",
+            secret_token=TELEGRAM_WEBHOOK_SECRET,
+            cert=TELEGRAM_WEBHOOK_CERT,
+            key=TELEGRAM_WEBHOOK_KEY,
+            drop_pending_updates=True,
+            allowed_updates=ALLOWED_UPDATES
+        )
 
     def run(self):
         """Run the Telegram bot"""
         try:
-            logger.info("[🚀] Telegram bot is running...")
-            self.application.run_polling(
-                poll_interval=0.1,
-                timeout=10,
-                drop_pending_updates=True,
-                allowed_updates=Update.ALL_TYPES
-            )
+            logger.info(f"[🚀] Telegram bot is running ({TELEGRAM_MODE})...")
+            if TELEGRAM_MODE == "webhook":
+                self.run_webhook()
+            else:
+                self.run_polling()
         except Exception as e:
             logger.critical(f"[❌] Critical error: {str(e)}", exc_info=True)
\ No newline at end of file
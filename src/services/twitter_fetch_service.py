@@ -1,13 +1,14 @@
 import json
 import os
-import requests
 import time
 from datetime import datetime, timezone, timedelta
 import redis
 from difflib import SequenceMatcher
 from src.utils.config_loader import CONFIG
 from src.utils.logger import setup_logger
+from src.utils.http_client import get_http_client
 from src.services.twitter_transform_service import TwitterTransformService  
+from src.services.dapps_tracker_service import DappActivityCounter
 
 logger = setup_logger("TwitterFetchService")
 
@@ -77,10 +78,22 @@ class TweetStorageService:
         except Exception as e:
             logger.error(f"[ERROR] Failed to save daily tweets: {e}")
 
+        TweetStorageService.count_activity(tweets)
+
+    @staticmethod
+    def count_activity(tweets):
+        """Update the live dapp activity counters; tweets already counted are ignored."""
+        try:
+            counted = DappActivityCounter().count_tweets(tweets)
+            logger.info(f"[INFO] Counted {counted} new tweets in dapp activity")
+        except redis.RedisError as e:
+            logger.error(f"[ERROR] Failed to update dapp activity counters: {e}")
+
 class TwitterFetchService:
     def __init__(self):
         self.bearer_token = CONFIG["BEARER_TOKEN"]
         self.base_url = "https://api.x.com/2/tweets/search/recent"
+        self.http = get_http_client()
         self.batch_size = 10
         self.redis_client = redis.Redis(host='redis', port=6379, db=0)
         self.sensitive_words = SENSITIVE_WORDS
@@ -149,7 +162,7 @@ class TwitterFetchService:
 
         logger.info(f"[DEBUG] Fetching tweets for batch {user_ids} from {start_time} to {current_time}")
         try:
-            response = requests.get(self.base_url, headers=headers, params=params)
+            response = self.http.get(self.base_url, headers=headers, params=params)
             if response.status_code == 429:
                 wait_time = max(int(response.headers.get('x-rate-limit-reset', time.time() + 60)) - int(time.time()), 1)
                 logger.warning(f"Rate limit reached. Retrying after {wait_time} seconds.")
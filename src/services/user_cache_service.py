@@ -1,10 +1,10 @@
-import requests
 import json
 import time
 from datetime import datetime, timezone
 import redis
 from src.utils.config_loader import CONFIG
 from src.utils.logger import setup_logger
+from src.utils.http_client import get_http_client
 
 logger = setup_logger("CacheUserService")
 
@@ -17,6 +17,7 @@ class CacheUserService:
     def __init__(self):
         self.bearer_token = CONFIG["BEARER_TOKEN"]
         self.list_ids = CONFIG.get("LIST_IDS", [])  # Retrieve LIST_IDS from settings.json
+        self.http = get_http_client()
         self.redis_client = redis.Redis(host='redis', port=6379, db=0)  # Kết nối Redis
 
         # Kiểm tra kết nối Redis
@@ -86,7 +87,7 @@ class CacheUserService:
 
         try:
             while True:
-                response = requests.get(url, headers=headers, params=params)
+                response = self.http.get(url, headers=headers, params=params)
                 logger.info(f"[DEBUG] API Response Status: {response.status_code}")
 
                 # If rate-limited, wait and retry
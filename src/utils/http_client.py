@@ -0,0 +1,157 @@
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("HttpClient")
+
+# Defaults, overridable from settings.json
+CONNECT_TIMEOUT = CONFIG.get("HTTP_CONNECT_TIMEOUT", 5)
+READ_TIMEOUT = CONFIG.get("HTTP_READ_TIMEOUT", 30)
+MAX_RETRIES = CONFIG.get("HTTP_MAX_RETRIES", 3)
+BACKOFF_BASE = CONFIG.get("HTTP_BACKOFF_BASE", 0.5)  # Seconds, doubled on each attempt
+BACKOFF_MAX = CONFIG.get("HTTP_BACKOFF_MAX", 10)
+POOL_CONNECTIONS = CONFIG.get("HTTP_POOL_CONNECTIONS", 10)  # Number of hosts kept in the pool
+POOL_MAXSIZE = CONFIG.get("HTTP_POOL_MAXSIZE", 20)  # Keep-alive connections per host
+VALIDATOR_CACHE_SIZE = CONFIG.get("HTTP_VALIDATOR_CACHE_SIZE", 256)  # URLs remembered for conditional GETs
+
+RETRY_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+SECRET_PARAM_PATTERN = re.compile(r"key|token|secret|signature|password", re.IGNORECASE)  # Left out of cache keys
+
+
+class HttpClient:
+    """Shared HTTP client with keep-alive pools, default timeouts, jittered retries and conditional GETs."""
+
+    def __init__(self, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # One session -> urllib3 keeps one connection pool per host and reuses TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Validators and last good body per (url, params), least recently used dropped first
+        self._validators = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _cache_key(url, params):
+        """(url, params) without credentials such as API keys, so they are not kept in memory."""
+        return url, tuple(sorted((k, v) for k, v in (params or {}).items() if not SECRET_PARAM_PATTERN.search(k)))
+
+    @staticmethod
+    def _cached_response(url, cached):
+        """Rebuild a 200 response from a stored body, for a 304."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = cached["body"]
+        response.encoding = cached["encoding"]
+        response.headers["Content-Type"] = cached["content_type"] or ""
+        return response
+
+    def request(self, method, url, conditional=False, retry=None, **kwargs):
+        """Send a request. Retries connection errors and 5xx for idempotent methods (or when retry=True).
+
+        With conditional=True, the ETag / Last-Modified of the last 200 response is sent back as
+        If-None-Match / If-Modified-Since, and a 304 is answered with a response rebuilt from the
+        cached body. Only the last VALIDATOR_CACHE_SIZE URLs are remembered.
+        """
+        method = method.upper()
+        kwargs.setdefault("timeout", self.timeout)
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+
+        cache_key = None
+        cached = None
+        if conditional:
+            cache_key = self._cache_key(url, kwargs.get("params"))
+            with self._lock:
+                cached = self._validators.get(cache_key)
+                if cached:
+                    self._validators.move_to_end(cache_key)
+            if cached:
+                headers = dict(kwargs.get("headers") or {})
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+                kwargs["headers"] = headers
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectTimeout:
+                # Nothing was sent, so this is safe to retry for any method
+                if attempt >= self.max_retries:
+                    raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
+                if not retry or attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code in RETRY_STATUSES and retry and attempt < self.max_retries:
+                    response.close()
+                else:
+                    break
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            logger.warning(f"[🔁] {method} {url} failed, retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+
+        if conditional:
+            if response.status_code == 304 and cached:
+                return self._cached_response(url, cached)
+            if response.status_code == 200:
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    with self._lock:
+                        self._validators[cache_key] = {
+                            "etag": etag,
+                            "last_modified": last_modified,
+                            "body": response.content,
+                            "encoding": response.encoding,
+                            "content_type": response.headers.get("Content-Type"),
+                        }
+                        self._validators.move_to_end(cache_key)
+                        while len(self._validators) > VALIDATOR_CACHE_SIZE:
+                            self._validators.popitem(last=False)
+
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide HttpClient, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient()
+    return _http_client
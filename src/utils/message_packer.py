@@ -0,0 +1,107 @@
+import re
+from src.utils.config_loader import CONFIG
+from src.utils.logger import setup_logger
+
+logger = setup_logger("MessagePacker")
+
+SEPARATOR = "\n\n"  # News items are separated by a blank line on every platform
+
+X_URL_LENGTH = 23  # Every link counts as a t.co URL on X
+URL_PATTERN = re.compile(r"https?://\S+")
+# Code points X counts as one character; everything else (CJK, emoji, ...) counts as two
+X_LIGHT_RANGES = ((0, 4351), (8192, 8205), (8208, 8223), (8242, 8247))
+
+
+def x_weighted_length(text):
+    """Length of a post as X counts it: links are 23, wide characters are 2."""
+    length = 0
+    for match in URL_PATTERN.finditer(text):
+        length += X_URL_LENGTH
+    for char in URL_PATTERN.sub("", text):
+        code = ord(char)
+        length += 1 if any(low <= code <= high for low, high in X_LIGHT_RANGES) else 2
+    return length
+
+
+def utf16_length(text):
+    """Length in UTF-16 code units, which is how Telegram measures messages."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+# Platform -> (character limit, length function, most messages per post or None)
+PLATFORM_LIMITS = {
+    # The account posts long-form (premium) posts; set X_MAX_POST_LENGTH to 280 for a standard one
+    "x": (CONFIG.get("X_MAX_POST_LENGTH", 25000), x_weighted_length, CONFIG.get("X_MAX_POSTS", 3)),
+    "telegram": (4096, utf16_length, None),
+    "discord": (2000, len, None),
+}
+
+
+def _split_oversized(item, limit, length):
+    """Break an item longer than the limit into pieces that fit, at line breaks, then spaces, then anywhere."""
+    pieces = []
+    current = ""
+    for token in re.split(r"(\n|\s)", item):
+        candidate = current + token
+        if length(candidate) <= limit:
+            current = candidate
+            continue
+        if current.strip():
+            pieces.append(current.strip())
+        current = token.lstrip()
+        while length(current) > limit:
+            cut = limit
+            while cut > 1 and length(current[:cut]) > limit:
+                cut -= 1
+            pieces.append(current[:cut])
+            current = current[cut:]
+    if current.strip():
+        pieces.append(current.strip())
+    return pieces
+
+
+def pack(items, limit, length=len, separator=SEPARATOR):
+    """Pack items, in order, into as few messages as fit the limit, keeping every item whole.
+
+    Next-fit: each item joins the current message if it still fits, otherwise it starts the next
+    one, so the text reads in its original order across messages (a recap's paragraphs stay in
+    sequence). An item that is longer than the limit on its own is split (at line breaks where
+    possible) as a last resort.
+
+    Returns the messages as strings.
+    """
+    sep_length = length(separator)
+    messages = []
+    current, used = [], 0
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        pieces = [item] if length(item) <= limit else _split_oversized(item, limit, length)
+        for piece in pieces:
+            size = length(piece)
+            if current and used + sep_length + size <= limit:
+                current.append(piece)
+                used += sep_length + size
+                continue
+            if current:
+                messages.append(separator.join(current))
+            current, used = [piece], size
+    if current:
+        messages.append(separator.join(current))
+    return messages
+
+
+def pack_for(platform, items):
+    """Pack items for one platform's message limit and post cap (see PLATFORM_LIMITS)."""
+    limit, length, max_messages = PLATFORM_LIMITS[platform]
+    messages = pack(items, limit, length)
+    if max_messages and len(messages) > max_messages:
+        logger.warning(f"[⚠️] {platform} content needs {len(messages)} posts, only the first {max_messages} are sent")
+        messages = messages[:max_messages]
+    return messages
+
+
+def split_items(content, separator=SEPARATOR):
+    """News items of a generated text, one per blank-line-separated block."""
+    return [item.strip() for item in content.strip().split(separator) if item.strip()]
@@ -0,0 +1,41 @@
+def lttb(points, threshold):
+    """Downsample [(x, y)] to at most `threshold` points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each bucket in between, the point forming the
+    largest triangle with the previously kept point and the average of the next bucket, so
+    peaks and troughs survive. Points must be sorted by x; x and y must be numbers.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    kept = 0  # Index of the last kept point
+
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = points[-1]
+        else:
+            span = next_end - next_start
+            avg_x = sum(p[0] for p in points[next_start:next_end]) / span
+            avg_y = sum(p[1] for p in points[next_start:next_end]) / span
+
+        ax, ay = points[kept]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        kept = best
+
+    sampled.append(points[-1])
+    return sampled